@@ -0,0 +1,121 @@
+"""
+Offline benchmarks of the translation service against local fake providers.
+
+Run from the translate directory:
+    python -m benchmarks run --scenario all --minutes 10,60,240 --concurrency 8
+    python -m benchmarks run --scenario v2 --llm-latency 1.5 --llm-tokens-per-second 150
+    python -m benchmarks run --scenario startup --repeat 10
+    python -m benchmarks compare            # the two most recent runs
+    python -m benchmarks compare old.json new.json
+"""
+
+import argparse
+import asyncio
+import sys
+
+SCENARIOS = ("transcript", "translate", "v2")
+
+
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run benchmarks and store the results")
+    run.add_argument(
+        "--scenario", default="all", choices=(*SCENARIOS, "micro", "startup", "all")
+    )
+    run.add_argument("--minutes", default="10,60", help="comma separated transcript lengths")
+    run.add_argument("--concurrency", type=int, default=4)
+    run.add_argument("--jobs", type=int, default=8, help="requests per scenario and length")
+    run.add_argument("--ai-model", default="gemini-2.0-flash-exp")
+    run.add_argument("--glossary-entries", type=int, default=0)
+    run.add_argument("--repeat", type=int, default=5, help="micro-benchmark repetitions")
+    run.add_argument("--assemblyai-latency", type=float, default=0.2)
+    run.add_argument("--llm-latency", type=float, default=0.8)
+    run.add_argument("--llm-tokens-per-second", type=float, default=0)
+    run.add_argument("--drive-latency", type=float, default=0.15)
+    run.add_argument("--error-rate", type=float, default=0.0)
+    run.add_argument("--respect-rate-limits", action="store_true")
+    run.add_argument("--no-save", action="store_true")
+
+    compare = commands.add_parser("compare", help="compare two stored runs")
+    compare.add_argument("baseline", nargs="?")
+    compare.add_argument("current", nargs="?")
+    compare.add_argument("--threshold", type=float, default=0.1)
+    return parser.parse_args(argv)
+
+
+async def _run_end_to_end(args: argparse.Namespace, scenarios: list[str], minutes: list[float]) -> dict:
+    from .fakes import FakeProfile
+    from .harness import Fakes
+    from .scenarios import run_scenarios
+
+    llm = FakeProfile(
+        latency=args.llm_latency,
+        error_rate=args.error_rate,
+        tokens_per_second=args.llm_tokens_per_second,
+    )
+    fakes = Fakes(
+        {
+            "assemblyai": FakeProfile(latency=args.assemblyai_latency, error_rate=args.error_rate),
+            "gemini": llm,
+            "openai": llm,
+            "drive": FakeProfile(latency=args.drive_latency, error_rate=args.error_rate),
+        }
+    )
+    await fakes.install()
+    try:
+        results = await run_scenarios(
+            scenarios,
+            minutes,
+            concurrency=args.concurrency,
+            jobs=args.jobs,
+            ai_model=args.ai_model,
+            glossary_file_id=f"glossary-{args.glossary_entries}" if args.glossary_entries else None,
+        )
+    finally:
+        await fakes.uninstall()
+    results["fakes"] = fakes.stats()
+    return results
+
+
+def main(argv: list[str]) -> None:
+    args = _parse_args(argv)
+
+    if args.command == "compare":
+        from .results import compare_results, load_results
+
+        baseline = load_results(args.baseline, offset=0 if args.baseline else 1)
+        current = load_results(args.current)
+        print("\n".join(compare_results(baseline, current, args.threshold)))
+        return
+
+    from .harness import prepare_environment
+    from .results import save_results
+
+    workdir = prepare_environment(respect_rate_limits=args.respect_rate_limits)
+    print(f"Working directory: {workdir}")
+    minutes = [float(value) for value in args.minutes.split(",")]
+    scenarios = list(SCENARIOS) if args.scenario == "all" else [args.scenario]
+
+    results: dict = {}
+    if args.scenario in ("micro", "all"):
+        from .micro import run_micro
+
+        results["micro"] = run_micro(minutes, args.repeat)
+        scenarios = [scenario for scenario in scenarios if scenario != "micro"]
+    if args.scenario in ("startup", "all"):
+        from .startup import run_startup
+
+        results["startup"] = run_startup(args.repeat)
+        scenarios = [scenario for scenario in scenarios if scenario != "startup"]
+    if scenarios:
+        results.update(asyncio.run(_run_end_to_end(args, scenarios, minutes)))
+
+    if not args.no_save:
+        print(f"Results stored in {save_results(results, vars(args))}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
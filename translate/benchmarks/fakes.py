@@ -0,0 +1,365 @@
+"""
+Local stand-ins for AssemblyAI, Gemini, OpenAI and Google Drive with configurable
+latency, error rate and token throughput.
+
+AssemblyAI is a real aiohttp server so the shared HTTP client, cache and outbound
+layer are exercised. The SDK clients are replaced by objects with the same call
+surface this service uses.
+"""
+
+import ast
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+import uuid
+import zlib
+from functools import lru_cache
+from types import SimpleNamespace
+
+from aiohttp import web
+from pydantic import BaseModel
+
+from .synthetic import parse_transcript_id, synthetic_glossary, synthetic_transcript
+
+ENGLISH_WORDS = (
+    "today we will talk about this subject and see what importance practice has in "
+    "life the teacher said that devotion without knowledge is incomplete and knowledge "
+    "without devotion is dry when the mind is calm we can hear our inner voice"
+).split()
+
+
+class FakeProfile(BaseModel):
+    """
+    Behaviour of one fake provider.
+    """
+
+    latency: float = 0.05
+    # Each call's latency is drawn uniformly from latency * (1 +- jitter)
+    jitter: float = 0.5
+    error_rate: float = 0.0
+    # Output tokens generated per second; 0 returns the whole output at once
+    tokens_per_second: float = 0.0
+
+
+class FakeAPIError(Exception):
+    """
+    A retryable provider error, shaped like the SDK errors the outbound layer inspects.
+    """
+
+    def __init__(self, provider: str, status_code: int = 503):
+        super().__init__(f"fake {provider} error")
+        self.status_code = status_code
+
+
+class FakeProvider:
+    def __init__(self, name: str, profile: FakeProfile, seed: int = 0):
+        self.name = name
+        self.profile = profile
+        self.random = random.Random(seed)
+        self.calls = 0
+        self.errors = 0
+        self.output_tokens = 0
+        self._lock = threading.Lock()
+
+    def _plan(self, output_tokens: int = 0) -> tuple[float, bool]:
+        with self._lock:
+            self.calls += 1
+            failed = self.random.random() < self.profile.error_rate
+            if failed:
+                self.errors += 1
+            else:
+                self.output_tokens += output_tokens
+            jitter = self.random.uniform(-self.profile.jitter, self.profile.jitter)
+        delay = max(0.0, self.profile.latency * (1 + jitter))
+        if self.profile.tokens_per_second and not failed:
+            delay += output_tokens / self.profile.tokens_per_second
+        return delay, failed
+
+    async def wait(self, output_tokens: int = 0) -> None:
+        delay, failed = self._plan(output_tokens)
+        await asyncio.sleep(delay)
+        if failed:
+            raise FakeAPIError(self.name)
+
+    def wait_sync(self, output_tokens: int = 0) -> None:
+        delay, failed = self._plan(output_tokens)
+        time.sleep(delay)
+        if failed:
+            raise FakeAPIError(self.name)
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "output_tokens": self.output_tokens,
+        }
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text.encode("utf-8")) // 4 + 1
+
+
+def _english(text: str, factor: float = 1.0) -> str:
+    rng = random.Random(zlib.crc32(text.encode("utf-8")))
+    count = max(1, int(len(text.split()) * factor))
+    return " ".join(rng.choice(ENGLISH_WORDS) for _ in range(count)).capitalize() + "."
+
+
+_ARRAY_PATTERN = re.compile(r"(?:hindi_sentences|sentences|English:)\s*=?\s*(\[.*?\])\n", re.S)
+
+
+def fake_translation(prompt: str) -> tuple[str, bool]:
+    """
+    Answers a translation prompt of this service.
+
+    Returns:
+        tuple: The response text and whether it is a JSON array of sentences.
+    """
+    match = _ARRAY_PATTERN.search(prompt + "\n")
+    if match:
+        sentences = ast.literal_eval(match.group(1))
+        return json.dumps([_english(sentence) for sentence in sentences]), True
+    return _english(prompt, factor=1.1), False
+
+
+@lru_cache(maxsize=16)
+def transcript_payloads(transcript_id: str) -> tuple[bytes, bytes] | None:
+    parsed = parse_transcript_id(transcript_id)
+    if parsed is None:
+        return None
+    transcript = synthetic_transcript(*parsed)
+    ms_per_word = 60000 / 130
+    # Word timings make the payloads as large as AssemblyAI's
+    sentences = [
+        {
+            **sentence,
+            "confidence": 0.9,
+            "words": [
+                {
+                    "text": word,
+                    "start": sentence["start"] + int(index * ms_per_word),
+                    "end": sentence["start"] + int((index + 1) * ms_per_word),
+                    "confidence": 0.9,
+                }
+                for index, word in enumerate(sentence["text"].split())
+            ],
+        }
+        for sentence in transcript["sentences"]
+    ]
+    body = {
+        "id": transcript_id,
+        "status": "completed",
+        "text": transcript["text"],
+        "words": [word for sentence in sentences for word in sentence["words"]],
+    }
+    return (
+        json.dumps(body, ensure_ascii=False).encode("utf-8"),
+        json.dumps({"sentences": sentences}, ensure_ascii=False).encode("utf-8"),
+    )
+
+
+class FakeAssemblyAI(FakeProvider):
+    """
+    Serves synthetic transcripts for ids like "synthetic-60m-1" on a local port.
+    """
+
+    def __init__(self, profile: FakeProfile, seed: int = 0):
+        super().__init__("assemblyai", profile, seed)
+        self.runner: web.AppRunner | None = None
+        self.base_url = ""
+        # Uploaded audio by upload id
+        self.uploads: dict[str, bytes] = {}
+
+    async def _get(self, request: web.Request) -> web.Response:
+        try:
+            await self.wait()
+        except FakeAPIError:
+            return web.Response(status=503, text="busy", headers={"Retry-After": "0"})
+        payloads = await asyncio.to_thread(
+            transcript_payloads, request.match_info["transcript_id"]
+        )
+        if payloads is None:
+            return web.json_response({"error": "transcript not found"}, status=404)
+        resource = request.match_info["resource"]
+        if resource == "/sentences":
+            return web.Response(body=payloads[1], content_type="application/json")
+        if resource == "/srt":
+            return web.Response(text="1\n00:00:00,000 --> 00:00:01,000\nनमस्ते\n")
+        return web.Response(body=payloads[0], content_type="application/json")
+
+    async def _post(self, request: web.Request) -> web.Response:
+        try:
+            await self.wait()
+        except FakeAPIError:
+            return web.Response(status=503, text="busy", headers={"Retry-After": "0"})
+        return web.json_response({"id": f"synthetic-10m-{random.randint(0, 10**6)}"})
+
+    async def _upload(self, request: web.Request) -> web.Response:
+        try:
+            await self.wait()
+        except FakeAPIError:
+            return web.Response(status=503, text="busy", headers={"Retry-After": "0"})
+        upload_id = uuid.uuid4().hex
+        self.uploads[upload_id] = await request.read()
+        return web.json_response({"upload_url": f"{self.base_url}/uploads/{upload_id}"})
+
+    async def start(self) -> str:
+        app = web.Application(client_max_size=1024**3)
+        app.router.add_post("/v2/upload", self._upload)
+        app.router.add_post("/v2/transcript", self._post)
+        app.router.add_get(
+            "/v2/transcript/{transcript_id:[^/]+}{resource:.*}", self._get
+        )
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}/v2"
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self.runner:
+            await self.runner.cleanup()
+
+
+class FakeGeminiModel:
+    """
+    Stand-in for `genai.GenerativeModel`.
+    """
+
+    def __init__(self, provider: FakeProvider):
+        self.provider = provider
+
+    async def generate_content_async(self, contents: str, **kwargs):
+        text, _ = fake_translation(contents)
+        output_tokens = _estimate_tokens(text)
+        await self.provider.wait(output_tokens)
+        return SimpleNamespace(
+            text=text,
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=_estimate_tokens(contents),
+                candidates_token_count=output_tokens,
+            ),
+        )
+
+
+class FakeAsyncOpenAI:
+    """
+    Stand-in for `openai.AsyncOpenAI`, supporting `chat.completions.create`.
+    """
+
+    def __init__(self, provider: FakeProvider):
+        self.provider = provider
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, model: str, messages: list, **kwargs):
+        prompt = messages[-1]["content"]
+        text, is_array = fake_translation(prompt)
+        if is_array:
+            text = json.dumps({"result": json.loads(text)})
+        output_tokens = _estimate_tokens(text)
+        await self.provider.wait(output_tokens)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=text))],
+            usage=SimpleNamespace(
+                prompt_tokens=sum(_estimate_tokens(m["content"]) for m in messages),
+                completion_tokens=output_tokens,
+            ),
+        )
+
+    async def close(self) -> None:
+        pass
+
+
+class _FakeDriveRequest:
+    resumable = None
+
+    def __init__(self, provider: FakeProvider, action):
+        self.provider = provider
+        self.action = action
+
+    def execute(self):
+        self.provider.wait_sync()
+        return self.action()
+
+
+class _FakeDriveBatch:
+    def __init__(self, callback):
+        self.callback = callback
+        self.requests: list[tuple[str, _FakeDriveRequest]] = []
+
+    def add(self, request: _FakeDriveRequest, request_id: str) -> None:
+        self.requests.append((request_id, request))
+
+    def execute(self) -> None:
+        self.requests[0][1].provider.wait_sync()
+        for request_id, request in self.requests:
+            try:
+                self.callback(request_id, request.action(), None)
+            except KeyError as error:
+                self.callback(request_id, None, error)
+
+
+class FakeDriveService:
+    """
+    Thread-safe in-memory stand-in for the Drive v3 client. Files whose ids start with
+    "glossary-" followed by an entry count, e.g. "glossary-500", are synthetic glossaries.
+    """
+
+    def __init__(self, provider: FakeProvider):
+        self.provider = provider
+        self.files_by_id: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def files(self):
+        return self
+
+    def new_batch_http_request(self, callback):
+        return _FakeDriveBatch(callback)
+
+    def _file(self, file_id: str) -> dict:
+        with self._lock:
+            if file_id not in self.files_by_id and file_id.startswith("glossary-"):
+                content = synthetic_glossary(int(file_id.split("-")[1]))
+                self.files_by_id[file_id] = {"name": f"{file_id}.csv", "content": content.encode("utf-8"), "version": 1}
+            return self.files_by_id[file_id]
+
+    def _store(self, file_id: str, body: dict | None, media_body) -> dict:
+        with self._lock:
+            file = self.files_by_id.setdefault(file_id, {"content": b"", "version": 0})
+            file.update({key: value for key, value in (body or {}).items() if value is not None})
+            if media_body is not None:
+                file["content"] = media_body.getbytes(0, media_body.size())
+            file["version"] += 1
+        return {"id": file_id}
+
+    def create(self, body: dict, media_body=None, fields: str | None = None):
+        return _FakeDriveRequest(
+            self.provider, lambda: self._store(uuid.uuid4().hex, body, media_body)
+        )
+
+    def update(self, fileId: str, body: dict | None = None, media_body=None):
+        return _FakeDriveRequest(
+            self.provider, lambda: self._store(fileId, body, media_body)
+        )
+
+    def get(self, fileId: str, fields: str = ""):
+        def action():
+            file = self._file(fileId)
+            return {
+                "id": fileId,
+                "name": file.get("name"),
+                "properties": file.get("properties"),
+                "size": str(len(file["content"])),
+                "md5Checksum": f"{zlib.crc32(file['content']):08x}",
+                "version": str(file["version"]),
+            }
+
+        return _FakeDriveRequest(self.provider, action)
+
+    def get_media(self, fileId: str):
+        return _FakeDriveRequest(self.provider, lambda: self._file(fileId)["content"])
@@ -0,0 +1,99 @@
+"""
+Sets up an isolated process for benchmarking: a scratch working directory, throwaway
+credentials, outbound limits and the fake providers patched into the service.
+
+`prepare_environment` must run before anything from `src` is imported, because the
+service reads its configuration at import time.
+"""
+
+import os
+import json
+import tempfile
+
+from .fakes import (
+    FakeAssemblyAI,
+    FakeAsyncOpenAI,
+    FakeDriveService,
+    FakeGeminiModel,
+    FakeProfile,
+    FakeProvider,
+)
+
+
+def _throwaway_service_account() -> str:
+    import rsa
+
+    _, private_key = rsa.newkeys(1024)
+    return json.dumps(
+        {
+            "type": "service_account",
+            "project_id": "benchmark",
+            "private_key_id": "benchmark",
+            "private_key": private_key.save_pkcs1().decode(),
+            "client_email": "benchmark@benchmark.iam.gserviceaccount.com",
+            "client_id": "0",
+            "token_uri": "https://oauth2.googleapis.com/token",
+        }
+    )
+
+
+def prepare_environment(respect_rate_limits: bool = False) -> str:
+    """
+    Moves into a scratch directory so caches start cold and debug files stay out of
+    the checkout.
+
+    Returns:
+        str: The scratch directory.
+    """
+    workdir = tempfile.mkdtemp(prefix="translate-benchmark-")
+    os.makedirs(os.path.join(workdir, "data"))
+    os.chdir(workdir)
+    os.environ["DATA_DIR"] = os.path.join(workdir, "data")
+    os.environ.setdefault("GOOGLE_DRIVE_SERVICE_ACCOUNT_CREDENTIALS", _throwaway_service_account())
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    os.environ.setdefault("OUTBOUND_BASE_DELAY", "0.05")
+    # Fake clients have nothing to warm up
+    os.environ.setdefault("TRANSLATOR_WARMUP", "0")
+    if not respect_rate_limits:
+        # Measure the service itself rather than the configured provider quotas
+        for name in ("ASSEMBLYAI", "GEMINI", "OPENAI", "DRIVE"):
+            os.environ[f"{name}_RPM"] = "0"
+        for name in ("GEMINI", "OPENAI"):
+            os.environ[f"{name}_TPM"] = "0"
+    return workdir
+
+
+class Fakes:
+    """
+    The fake providers installed into the service, with their call counters.
+    """
+
+    def __init__(self, profiles: dict[str, FakeProfile], seed: int = 0):
+        self.assemblyai = FakeAssemblyAI(profiles.get("assemblyai", FakeProfile()), seed)
+        self.gemini = FakeProvider("gemini", profiles.get("gemini", FakeProfile()), seed)
+        self.openai = FakeProvider("openai", profiles.get("openai", FakeProfile()), seed)
+        self.drive = FakeProvider("drive", profiles.get("drive", FakeProfile()), seed)
+        self.drive_service = FakeDriveService(self.drive)
+
+    async def install(self) -> None:
+        from src.api import google_drive, transcribe
+        from src.models.translator import clients
+
+        transcribe.ASSEMBLY_AI_BASE_URL = await self.assemblyai.start()
+        clients.llm_clients._create_gemini_model = lambda model_name: FakeGeminiModel(
+            self.gemini
+        )
+        clients.llm_clients._create_openai_client = lambda: (
+            FakeAsyncOpenAI(self.openai),
+            None,
+        )
+        google_drive.get_drive_service = lambda: self.drive_service
+
+    async def uninstall(self) -> None:
+        await self.assemblyai.stop()
+
+    def stats(self) -> dict:
+        return {
+            provider.name: provider.stats()
+            for provider in (self.assemblyai, self.gemini, self.openai, self.drive)
+        }
@@ -0,0 +1,73 @@
+"""
+Micro-benchmarks of the sentence splitting, SRT rendering and transcript parsing
+hot paths on synthetic transcripts.
+"""
+
+import asyncio
+import json
+import timeit
+
+from .fakes import transcript_payloads
+from .synthetic import synthetic_transcript
+
+
+def _best_ms(function, repeat: int, number: int = 1) -> float:
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number * 1000
+
+
+def run_micro(minutes: list[float], repeat: int) -> dict:
+    from src.api.transcribe import compact_resource, get_transcription
+    from src.cache.transcript_cache import transcript_cache
+    from src.models.translator.base_model import AIModel
+    from src.types import SubtitleRecord, TranscriptQuery
+
+    # Splitting and rendering do not depend on the provider
+    split_long_sentences = AIModel._split_long_sentences
+    generate_srt = AIModel._generate_srt
+
+    results: dict = {}
+    for length in minutes:
+        transcript_id = f"synthetic-{length:g}m-0"
+        transcript = synthetic_transcript(length)
+        # Translations run longer than the Hindi, so most cues need splitting
+        records = [
+            SubtitleRecord(**sentence, length=len(sentence["text"]))
+            for sentence in transcript["sentences"]
+        ]
+        transcript_payload, sentences_payload = transcript_payloads(transcript_id)
+
+        def split() -> None:
+            split_long_sentences(None, [record.model_copy() for record in records], 40)
+
+        split_records = split_long_sentences(None, records, 40)
+
+        def compact() -> None:
+            compact_resource("/sentences", json.loads(sentences_payload))
+            compact_resource("", json.loads(transcript_payload))
+
+        transcript_cache.set(transcript_id, "", compact_resource("", json.loads(transcript_payload)))
+        transcript_cache.set(
+            transcript_id, "/sentences", compact_resource("/sentences", json.loads(sentences_payload))
+        )
+        query = TranscriptQuery(
+            transcript_id=transcript_id, include_transcript=True, include_sentences=True
+        )
+        loop = asyncio.new_event_loop()
+
+        def parse_cached() -> None:
+            loop.run_until_complete(get_transcription(query))
+
+        name = f"{length:g}m"
+        results[name] = {
+            "sentences": len(records),
+            "split_long_sentences_ms": _best_ms(split, repeat),
+            "generate_srt_ms": _best_ms(lambda: generate_srt(None, split_records), repeat),
+            "compact_payload_ms": _best_ms(compact, repeat),
+            "get_transcription_cached_ms": _best_ms(parse_cached, repeat),
+        }
+        loop.close()
+        print(
+            f"micro.{name}: "
+            + ", ".join(f"{key} {value:.2f}" for key, value in results[name].items())
+        )
+    return results
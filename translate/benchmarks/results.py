@@ -0,0 +1,98 @@
+"""
+Stores benchmark results per commit and compares two runs.
+"""
+
+import os
+import glob
+import json
+import platform
+import subprocess
+import time
+
+RESULTS_DIR = os.getenv(
+    "BENCHMARK_RESULTS_DIR", os.path.join(os.path.dirname(__file__), "results")
+)
+
+# Metrics judged for regressions; counters such as fake call counts are only listed
+LOWER_IS_BETTER = ("_ms", "_s", "errors")
+HIGHER_IS_BETTER = ("_rps",)
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(__file__),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def save_results(results: dict, options: dict) -> str:
+    """
+    Writes a run to RESULTS_DIR, named after the time and commit it ran at.
+
+    Returns:
+        str: The path of the results file.
+    """
+    commit = _git("rev-parse", "--short", "HEAD") or "unknown"
+    dirty = bool(_git("status", "--porcelain", "--", "."))
+    run = {
+        "commit": commit,
+        "dirty": dirty,
+        "created_at": time.time(),
+        "python": platform.python_version(),
+        "options": options,
+        "results": results,
+    }
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    name = time.strftime("%Y%m%d-%H%M%S") + f"-{commit}{'-dirty' if dirty else ''}.json"
+    path = os.path.join(RESULTS_DIR, name)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(run, file, indent=2)
+    return path
+
+
+def load_results(path: str | None = None, offset: int = 0) -> dict:
+    """
+    Loads a results file, or the `offset`-th most recent one if no path is given.
+    """
+    if path is None:
+        paths = sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")))
+        if len(paths) <= offset:
+            raise FileNotFoundError(f"Fewer than {offset + 1} results in {RESULTS_DIR}")
+        path = paths[-1 - offset]
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _flatten(results: dict, prefix: str = "") -> dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare_results(baseline: dict, current: dict, threshold: float = 0.1) -> list[str]:
+    """
+    Lists every shared metric with its relative change; changes beyond `threshold`
+    in the wrong direction are marked as regressions.
+    """
+    old, new = _flatten(baseline["results"]), _flatten(current["results"])
+    lines = [f"{baseline['commit']} -> {current['commit']}"]
+    for name in sorted(old.keys() & new.keys()):
+        before, after = old[name], new[name]
+        change = (after - before) / before if before else 0.0
+        worse = (name.endswith(LOWER_IS_BETTER) and change > threshold) or (
+            name.endswith(HIGHER_IS_BETTER) and change < -threshold
+        )
+        marker = "  REGRESSION" if worse else ""
+        lines.append(f"{name:70} {before:12.2f} {after:12.2f} {change:+8.1%}{marker}")
+    return lines
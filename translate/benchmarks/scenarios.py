@@ -0,0 +1,177 @@
+"""
+End-to-end load scenarios against the FastAPI app, run in-process over ASGI with the
+fake providers installed.
+"""
+
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable
+
+import httpx
+
+JOB_POLL_INTERVAL = 0.05
+
+
+def summarize(latencies: list[float], errors: int, wall: float) -> dict:
+    ordered = sorted(latencies)
+
+    def percentile(fraction: float) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "mean_ms": statistics.fmean(ordered) * 1000 if ordered else 0.0,
+        "p50_ms": percentile(0.5),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "wall_s": wall,
+        "throughput_rps": len(latencies) / wall if wall else 0.0,
+    }
+
+
+async def run_load(
+    requests: list[Callable[[], Awaitable[None]]], concurrency: int
+) -> dict:
+    """
+    Runs the requests with at most `concurrency` in flight and summarizes latencies.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def run(request: Callable[[], Awaitable[None]]) -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await request()
+            except Exception as error:
+                errors += 1
+                print(f"  request failed: {error}")
+            else:
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run(request) for request in requests))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+def _check(response: httpx.Response) -> httpx.Response:
+    if response.status_code >= 400:
+        raise RuntimeError(f"{response.request.url.path}: {response.status_code} {response.text[:200]}")
+    return response
+
+
+def transcript_requests(client: httpx.AsyncClient, transcript_ids: list[str]):
+    async def request(transcript_id: str) -> None:
+        _check(
+            await client.get(
+                "/transcript",
+                params={
+                    "transcript_id": transcript_id,
+                    "include_transcript": True,
+                    "include_sentences": True,
+                },
+            )
+        )
+
+    return [lambda transcript_id=transcript_id: request(transcript_id) for transcript_id in transcript_ids]
+
+
+def translate_requests(client: httpx.AsyncClient, transcript_ids: list[str], ai_model: str):
+    async def request(transcript_id: str) -> None:
+        _check(
+            await client.get(
+                "/translate",
+                params={
+                    "transcript_id": transcript_id,
+                    "include_transcript": True,
+                    "include_srt": True,
+                    "ai_model": ai_model,
+                },
+            )
+        )
+
+    return [lambda transcript_id=transcript_id: request(transcript_id) for transcript_id in transcript_ids]
+
+
+def translate_v2_requests(
+    client: httpx.AsyncClient,
+    transcript_ids: list[str],
+    ai_model: str,
+    glossary_file_id: str | None,
+):
+    async def request(transcript_id: str) -> None:
+        response = _check(
+            await client.post(
+                "/v2/translate",
+                json={
+                    "transcript_id": transcript_id,
+                    "srt_file_name": f"{transcript_id}.srt",
+                    "ai_model": ai_model,
+                    "glossary_file_id": glossary_file_id,
+                },
+            )
+        )
+        job_id = response.json()["job_id"]
+        # The job runs on the worker pool; its latency is enqueue to completion
+        while True:
+            job = _check(await client.get(f"/jobs/{job_id}")).json()
+            if job["status"] == "completed":
+                return
+            if job["status"] == "error":
+                raise RuntimeError(f"job {job_id} failed: {job['error']}")
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+
+    return [lambda transcript_id=transcript_id: request(transcript_id) for transcript_id in transcript_ids]
+
+
+async def run_scenarios(
+    scenarios: list[str],
+    minutes: list[float],
+    concurrency: int,
+    jobs: int,
+    ai_model: str,
+    glossary_file_id: str | None,
+) -> dict:
+    """
+    Runs each scenario for each transcript length with `jobs` distinct transcripts,
+    so every request starts with cold caches.
+    """
+    from src.server import app
+
+    results: dict = {}
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark", timeout=None
+        ) as client:
+            for scenario in scenarios:
+                for length in minutes:
+                    seed = len(results) * jobs
+                    transcript_ids = [
+                        f"synthetic-{length:g}m-{seed + index}" for index in range(jobs)
+                    ]
+                    match scenario:
+                        case "transcript":
+                            requests = transcript_requests(client, transcript_ids)
+                        case "translate":
+                            requests = translate_requests(client, transcript_ids, ai_model)
+                        case "v2":
+                            requests = translate_v2_requests(
+                                client, transcript_ids, ai_model, glossary_file_id
+                            )
+                        case _:
+                            raise ValueError(f"Unknown scenario {scenario}")
+                    name = f"{scenario}.{length:g}m"
+                    print(f"{name}: {jobs} requests, concurrency {concurrency}")
+                    results[name] = await run_load(requests, concurrency)
+                    print(
+                        f"  p50 {results[name]['p50_ms']:.0f} ms, p95 {results[name]['p95_ms']:.0f} ms,"
+                        f" {results[name]['throughput_rps']:.2f} req/s, {results[name]['errors']} errors"
+                    )
+    return results
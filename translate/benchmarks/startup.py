@@ -0,0 +1,81 @@
+"""
+Startup benchmark: the cost of importing the service in a fresh interpreter, as paid
+by every cold start and autoscaled replica.
+"""
+
+import os
+import json
+import statistics
+import subprocess
+import sys
+
+TRANSLATE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Provider SDKs should only be imported once a provider is actually used
+SDK_MODULES = ("google.generativeai", "openai", "googleapiclient", "google.oauth2", "httpx")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import src.server
+elapsed = time.perf_counter() - start
+print(json.dumps({"import_ms": elapsed * 1000, "sdks": [m for m in %r if m in sys.modules]}))
+""" % (SDK_MODULES,)
+
+
+def _import_once(env: dict) -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        cwd=os.getcwd(),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+
+    # -X importtime lines: "import time: self [us] | cumulative | package"
+    self_times = []
+    for line in completed.stderr.splitlines():
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) == 3 and parts[0].strip().isdigit():
+            self_times.append((int(parts[0]), parts[2].strip()))
+    result["slowest"] = [
+        {"module": module, "self_ms": self_us / 1000}
+        for self_us, module in sorted(self_times, reverse=True)[:10]
+    ]
+    return result
+
+
+def run_startup(repeat: int) -> dict:
+    """
+    Imports the service `repeat` times in fresh interpreters without any provider
+    credentials set, which must succeed.
+    """
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if key
+        not in (
+            "GOOGLE_DRIVE_SERVICE_ACCOUNT_CREDENTIALS",
+            "OPENAI_API_KEY",
+            "GEMINI_API_KEY",
+            "GOOGLE_API_KEY",
+        )
+    }
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, (TRANSLATE_DIR, env.get("PYTHONPATH"))))
+
+    runs = [_import_once(env) for _ in range(repeat)]
+    import_ms = sorted(run["import_ms"] for run in runs)
+    print(f"startup: import {statistics.median(import_ms):.0f} ms (median of {repeat})")
+    if runs[-1]["sdks"]:
+        print(f"  SDKs imported at startup: {', '.join(runs[-1]['sdks'])}")
+    for entry in runs[-1]["slowest"][:5]:
+        print(f"  {entry['self_ms']:8.1f} ms  {entry['module']}")
+
+    return {
+        "import_median_ms": statistics.median(import_ms),
+        "import_min_ms": import_ms[0],
+        "sdk_modules_imported": len(runs[-1]["sdks"]),
+        "slowest_modules": runs[-1]["slowest"],
+    }
@@ -0,0 +1,106 @@
+"""
+Micro-benchmark of subtitle splitting and SRT rendering on a long synthetic lecture:
+per-sentence `SubtitleRecord`s (the previous implementation) against `SubtitleTrack`.
+
+Run from the translate directory:
+    python -m benchmarks.subtitle_track --sentences 20000
+"""
+
+import argparse
+import random
+import timeit
+import tracemalloc
+
+from src.models.subtitle_track import SubtitleTrack, format_timestamp
+from src.types import SubtitleRecord
+
+WORDS = ["the", "teacher", "explains", "that", "knowledge", "is", "realised", "through",
+         "practice", "and", "devotion", "without", "attachment", "to", "results"]
+
+
+def synthetic_sentences(count: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    sentences = []
+    time = 0
+    for _ in range(count):
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 40)))
+        duration = 60 * len(text)
+        sentences.append(
+            {"start": time, "end": time + duration, "text": text, "length": len(text)}
+        )
+        time += duration + rng.randint(50, 500)
+    return sentences
+
+
+def legacy_split(sentences: list[SubtitleRecord], max_length: int) -> list[SubtitleRecord]:
+    new_sentences = []
+    for sentence in sentences:
+        text, start, end = sentence.text, sentence.start, sentence.end
+        if len(text) <= max_length:
+            new_sentences.append(sentence)
+            continue
+        parts, current_part = [], ""
+        for word in text.split(" "):
+            if len(current_part) + len(word) + 1 <= max_length:
+                current_part += (" " if current_part else "") + word
+            else:
+                parts.append(current_part)
+                current_part = word
+        if current_part:
+            parts.append(current_part)
+        time_per_char = (end - start) / len(text)
+        part_start = start
+        for part in parts:
+            part_end = part_start + round(len(part) * time_per_char)
+            new_sentences.append(
+                SubtitleRecord(text=part, start=part_start, end=part_end, length=len(part))
+            )
+            part_start = part_end
+    return new_sentences
+
+
+def legacy_srt(sentences: list[SubtitleRecord]) -> str:
+    return "\n".join(
+        f"{index}\n{format_timestamp(sentence.start)} --> {format_timestamp(sentence.end)}\n{sentence.text}\n"
+        for index, sentence in enumerate(sentences, start=1)
+    )
+
+
+def run_legacy(items: list[dict], max_length: int) -> str:
+    records = [SubtitleRecord(**item) for item in items]
+    return legacy_srt(legacy_split(records, max_length))
+
+
+def run_track(items: list[dict], max_length: int) -> str:
+    return SubtitleTrack.from_dicts(items).split(max_length).to_srt()
+
+
+def peak_memory(function, *args) -> int:
+    tracemalloc.start()
+    result = function(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sentences", type=int, default=20000)
+    parser.add_argument("--split", type=int, default=80)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    items = synthetic_sentences(args.sentences)
+    assert run_legacy(items, args.split) == run_track(items, args.split)
+
+    for name, function in (("records", run_legacy), ("track", run_track)):
+        best = min(
+            timeit.repeat(lambda: function(items, args.split), number=1, repeat=args.repeat)
+        )
+        peak = peak_memory(function, items, args.split)
+        print(f"{name:8} {best * 1000:8.1f} ms  peak {peak / 1024 / 1024:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
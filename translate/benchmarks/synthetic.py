@@ -0,0 +1,78 @@
+"""
+Synthetic Hindi lecture transcripts in the shape AssemblyAI returns them.
+"""
+
+import random
+
+# Spoken Hindi runs at roughly 130 words per minute
+WORDS_PER_MINUTE = 130
+
+HINDI_WORDS = (
+    "हम आज इस विषय पर बात करेंगे और देखेंगे कि जीवन में साधना का क्या महत्व है "
+    "गुरु ने कहा था कि ज्ञान के बिना भक्ति अधूरी है और भक्ति के बिना ज्ञान सूखा है "
+    "जब मन शांत होता है तब हम अपने भीतर की आवाज़ सुन सकते हैं यह बहुत सरल बात है "
+    "लेकिन इसे समझना कठिन है क्योंकि हमारा ध्यान हमेशा बाहर की वस्तु पर रहता है "
+    "सुराही में पानी ठंडा रहता है उसी तरह संयम से मन शीतल रहता है साधन और साध्य"
+).split()
+SANSKRIT_QUOTES = (
+    "कर्मण्येवाधिकारस्ते मा फलेषु कदाचन",
+    "योगः कर्मसु कौशलम्",
+    "असतो मा सद्गमय तमसो मा ज्योतिर्गमय",
+)
+
+
+def synthetic_transcript(minutes: float, seed: int = 0) -> dict:
+    """
+    Builds a completed transcript of about `minutes` of speech with sentence timings.
+
+    Returns:
+        dict: {"id", "status", "text", "sentences": [{"text", "start", "end"}]}
+    """
+    rng = random.Random(seed)
+    total_words = int(minutes * WORDS_PER_MINUTE)
+    ms_per_word = 60000 / WORDS_PER_MINUTE
+
+    sentences = []
+    time = 0
+    words_left = total_words
+    while words_left > 0:
+        count = min(words_left, rng.randint(6, 28))
+        words_left -= count
+        text = " ".join(rng.choice(HINDI_WORDS) for _ in range(count))
+        if rng.random() < 0.05:
+            text += " " + rng.choice(SANSKRIT_QUOTES)
+        duration = int(count * ms_per_word)
+        sentences.append({"text": text + "।", "start": time, "end": time + duration})
+        time += duration + rng.randint(100, 900)
+
+    return {
+        "id": f"synthetic-{minutes:g}m-{seed}",
+        "status": "completed",
+        "text": " ".join(sentence["text"] for sentence in sentences),
+        "sentences": sentences,
+    }
+
+
+def parse_transcript_id(transcript_id: str) -> tuple[float, int] | None:
+    """
+    Reads the length in minutes and the seed from ids like "synthetic-90m-3".
+    """
+    parts = transcript_id.split("-")
+    if len(parts) != 3 or parts[0] != "synthetic" or not parts[1].endswith("m"):
+        return None
+    try:
+        return float(parts[1][:-1]), int(parts[2])
+    except ValueError:
+        return None
+
+
+def synthetic_glossary(entries: int, seed: int = 0) -> str:
+    """
+    Builds a glossary CSV in which a few terms occur in the synthetic transcripts.
+    """
+    rng = random.Random(seed)
+    rows = [f"{word},term {index}" for index, word in enumerate(sorted(set(HINDI_WORDS))[:20])]
+    while len(rows) < entries:
+        term = "".join(rng.choice("कखगघचछजझटठडढतथदधनपफबभमयरलवशसह") for _ in range(6))
+        rows.append(f"{term},glossary term {len(rows)}")
+    return "\n".join(rows[:entries]) + "\n"
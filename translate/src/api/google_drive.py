@@ -1,23 +1,120 @@
+import io
 import os
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+import json
+import threading
+from typing import TYPE_CHECKING, Callable, Iterator, TypeVar
 
 from ..types import FileUploadRequest, FileUpdateRequest
+from .outbound import providers
+from ..telemetry.metrics import drive_request_seconds
+from ..telemetry.tracing import span
+
+if TYPE_CHECKING:
+    from googleapiclient.http import MediaIoBaseUpload
+
+T = TypeVar("T")
 
 SCOPES = ["https://www.googleapis.com/auth/drive"]
 SERVICE_ACCOUNT_FILE = "./service-account.secret.json"
 
-if not os.path.exists(SERVICE_ACCOUNT_FILE):
-    with open(SERVICE_ACCOUNT_FILE, "w") as f:
-        credentials = os.getenv("GOOGLE_DRIVE_SERVICE_ACCOUNT_CREDENTIALS")
-        f.write(os.getenv("GOOGLE_DRIVE_SERVICE_ACCOUNT_CREDENTIALS") or "")
+# Uploads larger than this are sent as resumable uploads in chunks of this size
+DRIVE_UPLOAD_CHUNK_SIZE = int(os.getenv("DRIVE_UPLOAD_CHUNK_SIZE", str(5 * 1024 * 1024)))
+# Audio files are streamed out of Drive in chunks of this size
+DRIVE_DOWNLOAD_CHUNK_SIZE = int(os.getenv("DRIVE_DOWNLOAD_CHUNK_SIZE", str(8 * 1024 * 1024)))
+# The Drive API accepts at most 100 calls per batch request
+DRIVE_BATCH_SIZE = 100
+
+_local = threading.local()
+_credentials = None
+_credentials_lock = threading.Lock()
+
+
+def get_credentials():
+    """
+    Loads the service account credentials on first use, in memory from
+    GOOGLE_DRIVE_SERVICE_ACCOUNT_CREDENTIALS, or from SERVICE_ACCOUNT_FILE if the
+    variable is not set.
+    """
+    global _credentials
+    with _credentials_lock:
+        if _credentials is None:
+            # Imported here so importing the service does not load the Google SDKs
+            from google.oauth2 import service_account
+
+            info = os.getenv("GOOGLE_DRIVE_SERVICE_ACCOUNT_CREDENTIALS")
+            if info:
+                _credentials = service_account.Credentials.from_service_account_info(
+                    json.loads(info), scopes=SCOPES
+                )
+            elif os.path.exists(SERVICE_ACCOUNT_FILE):
+                _credentials = service_account.Credentials.from_service_account_file(
+                    SERVICE_ACCOUNT_FILE, scopes=SCOPES
+                )
+            else:
+                raise RuntimeError(
+                    "GOOGLE_DRIVE_SERVICE_ACCOUNT_CREDENTIALS is not set, Google Drive is unavailable."
+                )
+    return _credentials
+
+
+def build_drive_service():
+    from googleapiclient.discovery import build
+
+    return build("drive", "v3", credentials=get_credentials(), cache_discovery=False)
+
+
+def get_drive_service():
+    """
+    Returns this thread's Drive client, built on first use. The underlying httplib2
+    connection is not thread-safe, so each worker thread gets its own client.
+    """
+    service = getattr(_local, "drive_service", None)
+    if service is None:
+        service = build_drive_service()
+        _local.drive_service = service
+    return service
+
+
+def _text_media(text: str) -> "MediaIoBaseUpload":
+    from googleapiclient.http import MediaIoBaseUpload
+
+    data = text.encode("utf-8")
+    return MediaIoBaseUpload(
+        io.BytesIO(data),
+        mimetype="text/plain",
+        chunksize=DRIVE_UPLOAD_CHUNK_SIZE,
+        resumable=len(data) > DRIVE_UPLOAD_CHUNK_SIZE,
+    )
+
 
-credentials = service_account.Credentials.from_service_account_file(
-    SERVICE_ACCOUNT_FILE, scopes=SCOPES
-)
+def _call(operation: str, request: Callable[[], T], **attributes) -> T:
+    with span(
+        f"drive.{operation}",
+        histogram=drive_request_seconds,
+        operation=operation,
+        **attributes,
+    ):
+        return providers["drive"].call_sync(request)
 
-drive_service = build("drive", "v3", credentials=credentials)
+
+def _execute_upload(request, operation: str, **attributes) -> dict:
+    """
+    Executes a create or update request, sending resumable media chunk by chunk so a
+    retry resumes from the last acknowledged chunk instead of starting over.
+    """
+    with span(
+        f"drive.{operation}",
+        histogram=drive_request_seconds,
+        operation=operation,
+        resumable=request.resumable is not None,
+        **attributes,
+    ):
+        if request.resumable is None:
+            return providers["drive"].call_sync(request.execute)
+        response = None
+        while response is None:
+            _, response = providers["drive"].call_sync(request.next_chunk)
+        return response
 
 
 def update_file_google_drive(params: FileUpdateRequest) -> dict:
@@ -27,28 +124,20 @@ def update_file_google_drive(params: FileUpdateRequest) -> dict:
         params.properties,
         params.file_name,
     )
-    temp_file_path = "./temp.txt"
     try:
-        if text:
-            with open(temp_file_path, "w") as f:
-                f.write(text)
         file_metadata = {"properties": properties}
-        media = MediaFileUpload(temp_file_path, mimetype="text/plain") if text else None
-        file = (
-            drive_service.files()
-            .update(fileId=file_id, body=file_metadata, media_body=media)
-            .execute()
+        media = _text_media(text) if text else None
+        file = _execute_upload(
+            get_drive_service()
+            .files()
+            .update(fileId=file_id, body=file_metadata, media_body=media),
+            "update",
+            file_id=file_id,
         )
         print(f"Updated file on Google Drive: {file.get('id')}")
     except Exception as error:
         print(f"Error updating file on Google Drive: {error}")
         raise error
-    finally:
-        try:
-            if os.path.exists(temp_file_path):
-                os.remove(temp_file_path)
-        except Exception as error:
-            print(f"Error deleting file: {error}")
 
     return {"file_id": file.get("id")}
 
@@ -57,46 +146,66 @@ def upload_to_google_drive(params: FileUploadRequest) -> dict:
 
     text, file_name, properties = params.text, params.file_name, params.properties
 
-    with open(file_name, "w") as f:
-        f.write(text or "")
-
     try:
         file_metadata = {
             "name": file_name,
             "parents": [os.getenv("GOOGLE_DRIVE_SRT_FOLDER_ID")],
             "properties": properties,
         }
-        media = MediaFileUpload(file_name, mimetype="text/plain")
-        file = (
-            drive_service.files()
-            .create(body=file_metadata, media_body=media, fields="id")
-            .execute()
+        file = _execute_upload(
+            get_drive_service()
+            .files()
+            .create(body=file_metadata, media_body=_text_media(text or ""), fields="id"),
+            "upload",
         )
         print(f"Uploaded file to Google Drive: {file.get('id')}")
     except Exception as error:
         print(f"Error uploading file to Google Drive: {error}")
         raise error
-    finally:
-        try:
-            if os.path.exists(file_name):
-                os.remove(file_name)
-        except Exception as error:
-            print(f"Error deleting file: {error}")
 
     return {"file_id": file.get("id")}
 
 
-def get_file_info(file_id: str) -> dict:
-    try:
-        file = (
-            drive_service.files()
-            .get(fileId=file_id, fields="name,webViewLink,properties,size")
-            .execute()
-        )
-    except Exception as error:
-        print(f"Error getting file info from Google Drive: {error}")
-        raise error
+def create_files_batch(files: list[FileUploadRequest]) -> list[str | None]:
+    """
+    Creates empty text files in the SRT folder in batch requests of up to
+    `DRIVE_BATCH_SIZE`, e.g. the SRT placeholders of a batch translation.
 
+    Returns:
+        list: The file ID of each file, None for files that could not be created.
+    """
+    service = get_drive_service()
+    file_ids: list[str | None] = [None] * len(files)
+
+    def on_response(request_id: str, response: dict, exception: Exception | None):
+        if exception is not None:
+            print(f"Error creating file {request_id} on Google Drive: {exception}")
+        else:
+            file_ids[int(request_id)] = response.get("id")
+
+    for start in range(0, len(files), DRIVE_BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=on_response)
+        for index in range(start, min(start + DRIVE_BATCH_SIZE, len(files))):
+            # Batch requests cannot carry media, so placeholders are metadata-only
+            file_metadata = {
+                "name": files[index].file_name,
+                "parents": [os.getenv("GOOGLE_DRIVE_SRT_FOLDER_ID")],
+                "properties": files[index].properties,
+                "mimeType": "text/plain",
+            }
+            batch.add(
+                service.files().create(body=file_metadata, fields="id"),
+                request_id=str(index),
+            )
+        _call("create_batch", batch.execute, files=min(DRIVE_BATCH_SIZE, len(files) - start))
+
+    return file_ids
+
+
+FILE_INFO_FIELDS = "name,webViewLink,properties,size"
+
+
+def _file_info(file: dict) -> dict:
     return {
         "name": file.get("name"),
         "webViewLink": file.get("webViewLink"),
@@ -105,10 +214,114 @@ def get_file_info(file_id: str) -> dict:
     }
 
 
+def get_file_info(file_id: str) -> dict:
+    try:
+        file = _call(
+            "info",
+            get_drive_service()
+            .files()
+            .get(fileId=file_id, fields=FILE_INFO_FIELDS)
+            .execute,
+            file_id=file_id,
+        )
+    except Exception as error:
+        print(f"Error getting file info from Google Drive: {error}")
+        raise error
+
+    return _file_info(file)
+
+
+def get_file_version(file_id: str) -> str:
+    """
+    Gets a cheap revision identifier of a file: its md5Checksum, or its version for
+    Google Docs files that have no checksum.
+    """
+    try:
+        file = _call(
+            "version",
+            get_drive_service()
+            .files()
+            .get(fileId=file_id, fields="md5Checksum,version")
+            .execute,
+            file_id=file_id,
+        )
+    except Exception as error:
+        print(f"Error getting file version from Google Drive: {error}")
+        raise error
+
+    return file.get("md5Checksum") or f"v{file.get('version')}"
+
+
+def get_files_info(file_ids: list[str]) -> dict[str, dict | None]:
+    """
+    Gets the file info of several files in batch requests of up to `DRIVE_BATCH_SIZE`.
+
+    Returns:
+        dict: File info by file ID, None for files that could not be read.
+    """
+    service = get_drive_service()
+    results: dict[str, dict | None] = {}
+
+    def on_response(request_id: str, response: dict, exception: Exception | None):
+        if exception is not None:
+            print(f"Error getting file info of {request_id} from Google Drive: {exception}")
+            results[request_id] = None
+        else:
+            results[request_id] = _file_info(response)
+
+    unique_ids = list(dict.fromkeys(file_ids))
+    for start in range(0, len(unique_ids), DRIVE_BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=on_response)
+        for file_id in unique_ids[start:start + DRIVE_BATCH_SIZE]:
+            batch.add(
+                service.files().get(fileId=file_id, fields=FILE_INFO_FIELDS),
+                request_id=file_id,
+            )
+        _call("info_batch", batch.execute)
+
+    return results
+
+
+# Only the fields needed to submit and deduplicate audio files
+AUDIO_FILE_FIELDS = "id,name,md5Checksum,webViewLink"
+DRIVE_PAGE_SIZE = int(os.getenv("DRIVE_PAGE_SIZE", "1000"))
+
+
+def list_audio_files(folder_id: str) -> list[dict]:
+    """
+    Lists the audio files in a folder, page by page, oldest modification first.
+    """
+    query = f"'{folder_id}' in parents and trashed = false and mimeType contains 'audio/'"
+
+    files: list[dict] = []
+    page_token = None
+    while True:
+        response = _call(
+            "list",
+            get_drive_service()
+            .files()
+            .list(
+                q=query,
+                fields=f"nextPageToken,files({AUDIO_FILE_FIELDS})",
+                orderBy="modifiedTime",
+                pageSize=DRIVE_PAGE_SIZE,
+                pageToken=page_token,
+                supportsAllDrives=True,
+                includeItemsFromAllDrives=True,
+            )
+            .execute,
+            folder_id=folder_id,
+        )
+        files.extend(response.get("files", []))
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            return files
+
+
 def get_file_content(file_id: str) -> str:
     try:
-        request = drive_service.files().get_media(fileId=file_id)
-        file = request.execute()
+        request = get_drive_service().files().get_media(fileId=file_id)
+        file = _call("content", request.execute, file_id=file_id)
     except Exception as error:
         print(f"Error getting file content from Google Drive: {error}")
         raise error
@@ -120,3 +333,25 @@ def get_file_content(file_id: str) -> str:
         raise error
 
     return content or ""
+
+
+def iter_file_chunks(file_id: str, chunk_size: int = DRIVE_DOWNLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Downloads a file through the Drive API chunk by chunk, so it needs no public link
+    and is never held in memory whole.
+
+    The chunks may be requested from different threads, so the download uses a
+    client of its own rather than the calling thread's.
+    """
+    from googleapiclient.http import MediaIoBaseDownload
+
+    buffer = io.BytesIO()
+    request = build_drive_service().files().get_media(fileId=file_id, supportsAllDrives=True)
+    downloader = MediaIoBaseDownload(buffer, request, chunksize=chunk_size)
+    done = False
+    while not done:
+        # A retried chunk resumes from the last byte received
+        _, done = _call("download", downloader.next_chunk, file_id=file_id)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
@@ -0,0 +1,154 @@
+"""
+This module provides the shared, pooled aiohttp client used for outbound HTTP calls.
+"""
+
+import os
+import asyncio
+import weakref
+from types import SimpleNamespace
+from typing import Any, Coroutine, TypeVar
+
+import aiohttp
+
+T = TypeVar("T")
+
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "20"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+HTTP_TIMEOUT_TOTAL = float(os.getenv("HTTP_TIMEOUT_TOTAL", "60"))
+HTTP_TIMEOUT_CONNECT = float(os.getenv("HTTP_TIMEOUT_CONNECT", "10"))
+
+# One session per event loop: aiohttp sessions are bound to the loop they were
+# created on, and the legacy sync entry points still run their own loops.
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = (
+    weakref.WeakKeyDictionary()
+)
+
+_stats = {
+    "requests": 0,
+    "request_errors": 0,
+    "connections_created": 0,
+    "connections_reused": 0,
+    "dns_cache_hits": 0,
+    "dns_cache_misses": 0,
+}
+
+
+async def _on_request_start(session, context, params) -> None:
+    _stats["requests"] += 1
+
+
+async def _on_request_exception(session, context, params) -> None:
+    _stats["request_errors"] += 1
+
+
+async def _on_connection_create_end(session, context, params) -> None:
+    _stats["connections_created"] += 1
+
+
+async def _on_connection_reuseconn(session, context, params) -> None:
+    _stats["connections_reused"] += 1
+
+
+async def _on_dns_cache_hit(session, context, params) -> None:
+    _stats["dns_cache_hits"] += 1
+
+
+async def _on_dns_cache_miss(session, context, params) -> None:
+    _stats["dns_cache_misses"] += 1
+
+
+def _create_trace_config() -> aiohttp.TraceConfig:
+    trace_config = aiohttp.TraceConfig(trace_config_ctx_factory=SimpleNamespace)
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_request_exception.append(_on_request_exception)
+    trace_config.on_connection_create_end.append(_on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(_on_connection_reuseconn)
+    trace_config.on_dns_cache_hit.append(_on_dns_cache_hit)
+    trace_config.on_dns_cache_miss.append(_on_dns_cache_miss)
+    return trace_config
+
+
+def _create_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        use_dns_cache=True,
+        enable_cleanup_closed=True,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=HTTP_TIMEOUT_TOTAL, connect=HTTP_TIMEOUT_CONNECT
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        trace_configs=[_create_trace_config()],
+    )
+
+
+def get_http_client() -> aiohttp.ClientSession:
+    """
+    Returns the pooled client for the running event loop, creating it on first use.
+    """
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        session = _create_session()
+        _sessions[loop] = session
+    return session
+
+
+async def start_http_client() -> None:
+    """
+    Creates the pooled client for the running event loop. Called from the app lifespan.
+    """
+    get_http_client()
+
+
+async def close_http_client() -> None:
+    """
+    Closes the pooled client of the running event loop, if any.
+    """
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session and not session.closed:
+        await session.close()
+
+
+def run_with_http_client(coroutine: Coroutine[Any, Any, T]) -> T:
+    """
+    Runs a coroutine on a fresh event loop and closes that loop's pooled client afterwards.
+
+    Use this instead of a bare `asyncio.run` from sync code that calls AssemblyAI.
+    """
+
+    async def run() -> T:
+        try:
+            return await coroutine
+        finally:
+            await close_http_client()
+
+    return asyncio.run(run())
+
+
+def get_http_client_stats() -> dict:
+    """
+    Returns connection pool statistics across all live pooled clients.
+    """
+    pools = []
+    for session in list(_sessions.values()):
+        connector = session.connector
+        if connector is None or session.closed:
+            continue
+        idle = sum(len(conns) for conns in getattr(connector, "_conns", {}).values())
+        pools.append(
+            {
+                "limit": connector.limit,
+                "limit_per_host": connector.limit_per_host,
+                "acquired": len(getattr(connector, "_acquired", ())),
+                "idle": idle,
+            }
+        )
+    return {**_stats, "pools": pools}
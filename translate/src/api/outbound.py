@@ -0,0 +1,318 @@
+"""
+This module provides the shared outbound-call layer for AssemblyAI, Gemini, OpenAI and Drive.
+
+Every call goes through its provider's token buckets (requests and estimated tokens
+per minute) and circuit breaker, and is retried with exponential backoff and full
+jitter on throttling, server errors and connection failures, honouring Retry-After.
+"""
+
+import os
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+
+OUTBOUND_MAX_ATTEMPTS = int(os.getenv("OUTBOUND_MAX_ATTEMPTS", "5"))
+OUTBOUND_BASE_DELAY = float(os.getenv("OUTBOUND_BASE_DELAY", "1"))
+OUTBOUND_MAX_DELAY = float(os.getenv("OUTBOUND_MAX_DELAY", "60"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+
+# Requests and estimated tokens per minute; 0 disables the limit
+PROVIDER_LIMITS = {
+    "assemblyai": (int(os.getenv("ASSEMBLYAI_RPM", "600")), 0),
+    "gemini": (
+        int(os.getenv("GEMINI_RPM", "60")),
+        int(os.getenv("GEMINI_TPM", "1000000")),
+    ),
+    "openai": (
+        int(os.getenv("OPENAI_RPM", "500")),
+        int(os.getenv("OPENAI_TPM", "30000")),
+    ),
+    "drive": (int(os.getenv("DRIVE_RPM", "600")), 0),
+}
+
+
+class OutboundHTTPError(Exception):
+    """
+    Raised for non-successful responses of calls made with the shared aiohttp client.
+    """
+
+    def __init__(self, status: int, message: str, retry_after: float | None = None):
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised without calling the provider while its circuit breaker is open.
+    """
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `rate_per_minute`. Reservations may run the
+    balance negative; the caller then waits until its tokens would have been refilled.
+    """
+
+    def __init__(self, rate_per_minute: int):
+        self.rate = rate_per_minute / 60
+        self.capacity = float(rate_per_minute)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """
+        Takes `amount` tokens and returns the seconds to wait before using them.
+        """
+        if self.rate <= 0:
+            return 0.0
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated_at) * self.rate
+            )
+            self.updated_at = now
+            self.tokens -= amount
+            return max(0.0, -self.tokens / self.rate)
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and lets a single trial call
+    through once `reset_seconds` have passed.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """
+        Ends a call that neither succeeded nor failed, e.g. one that was cancelled,
+        so the next call can be the trial. The failure count is left unchanged.
+        """
+        with self._lock:
+            self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self.trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+def _status_of(error: BaseException) -> int | None:
+    for attribute in ("status", "status_code", "code"):
+        value = getattr(error, attribute, None)
+        if isinstance(value, int):
+            return int(value)
+    # googleapiclient.errors.HttpError keeps the response in `resp`
+    response = getattr(error, "resp", None)
+    status = getattr(response, "status", None)
+    return int(status) if isinstance(status, int) else None
+
+
+def _retry_after_of(error: BaseException) -> float | None:
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is None:
+        response = getattr(error, "response", None) or getattr(error, "resp", None)
+        headers = getattr(response, "headers", response)
+        try:
+            retry_after = headers.get("retry-after") if headers is not None else None
+        except AttributeError:
+            retry_after = None
+    try:
+        return float(retry_after) if retry_after is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, (CircuitOpenError, asyncio.CancelledError)):
+        return False
+    if isinstance(error, (ConnectionError, TimeoutError, asyncio.TimeoutError)):
+        return True
+    # aiohttp connection errors and SDK connection/timeout errors carry no status
+    name = type(error).__name__
+    if "Connection" in name or "Timeout" in name:
+        return True
+    return _status_of(error) in RETRYABLE_STATUSES
+
+
+class OutboundProvider:
+    """
+    Rate limits, retries and circuit-breaks the calls made to one provider.
+    """
+
+    def __init__(self, name: str, requests_per_minute: int, tokens_per_minute: int):
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.breaker = CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS)
+        self.metrics = {
+            "calls": 0,
+            "failures": 0,
+            "retries": 0,
+            "throttled": 0,
+            "throttled_seconds": 0.0,
+            "rejected_open_circuit": 0,
+        }
+
+    def _throttle_delay(self, tokens: int) -> float:
+        delay = max(self.requests.reserve(1), self.tokens.reserve(tokens))
+        if delay > 0:
+            self.metrics["throttled"] += 1
+            self.metrics["throttled_seconds"] += delay
+        return delay
+
+    def _check_circuit(self) -> None:
+        if not self.breaker.allow():
+            self.metrics["rejected_open_circuit"] += 1
+            raise CircuitOpenError(f"{self.name} is unavailable, circuit breaker is open")
+
+    def _backoff_delay(self, attempt: int, error: BaseException) -> float:
+        retry_after = _retry_after_of(error)
+        if retry_after is not None:
+            return min(retry_after, OUTBOUND_MAX_DELAY)
+        return random.uniform(0, min(OUTBOUND_MAX_DELAY, OUTBOUND_BASE_DELAY * 2**attempt))
+
+    def _record_error(self, error: BaseException) -> bool:
+        """
+        Records a failed call and returns whether it should be retried.
+        """
+        retryable = is_retryable(error)
+        if retryable:
+            self.breaker.record_failure()
+        else:
+            # A client error means the provider itself is up
+            self.breaker.record_success()
+        return retryable
+
+    def _attempt(self, attempt: int) -> "_Attempt":
+        return _Attempt(self, attempt)
+
+    async def call(
+        self, request: Callable[[], Awaitable[T]], tokens: int = 0
+    ) -> T:
+        """
+        Awaits `request()`, a factory so that each attempt creates a fresh coroutine.
+        """
+        for attempt in range(OUTBOUND_MAX_ATTEMPTS):
+            with self._attempt(attempt) as current:
+                delay = current.throttle(tokens)
+                if delay:
+                    await asyncio.sleep(delay)
+                return await request()
+            await asyncio.sleep(current.backoff)
+        raise AssertionError("unreachable")
+
+    def call_sync(self, request: Callable[[], T], tokens: int = 0) -> T:
+        """
+        Blocking variant of `call` for the thread-bound Drive client.
+        """
+        for attempt in range(OUTBOUND_MAX_ATTEMPTS):
+            with self._attempt(attempt) as current:
+                delay = current.throttle(tokens)
+                if delay:
+                    time.sleep(delay)
+                return request()
+            time.sleep(current.backoff)
+        raise AssertionError("unreachable")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self.metrics,
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+        }
+
+
+class _Attempt:
+    """
+    One attempt of an outbound call, shared by `call` and `call_sync`.
+
+    Entering checks the circuit breaker. Exiting records the outcome, and swallows
+    a retryable error after setting `backoff`, the seconds to wait before retrying.
+    """
+
+    def __init__(self, provider: OutboundProvider, attempt: int):
+        self.provider = provider
+        self.attempt = attempt
+        self.backoff = 0.0
+
+    def __enter__(self) -> "_Attempt":
+        self.provider._check_circuit()
+        return self
+
+    def throttle(self, tokens: int) -> float:
+        """
+        Counts the call and returns the seconds to wait for the provider's rate limits.
+        """
+        self.provider.metrics["calls"] += 1
+        return self.provider._throttle_delay(tokens)
+
+    def __exit__(self, error_type, error, traceback) -> bool:
+        provider = self.provider
+        if error_type is None:
+            provider.breaker.record_success()
+            return False
+        if not issubclass(error_type, Exception):
+            # Cancellation (e.g. the losing call of a hedged pair), KeyboardInterrupt
+            # or SystemExit say nothing about the provider
+            provider.breaker.release_trial()
+            return False
+        provider.metrics["failures"] += 1
+        if not provider._record_error(error) or self.attempt + 1 == OUTBOUND_MAX_ATTEMPTS:
+            return False
+        provider.metrics["retries"] += 1
+        self.backoff = provider._backoff_delay(self.attempt, error)
+        print(f"{provider.name} call failed ({error}), retrying in {self.backoff:.1f}s")
+        return True
+
+
+providers = {
+    name: OutboundProvider(name, requests_per_minute, tokens_per_minute)
+    for name, (requests_per_minute, tokens_per_minute) in PROVIDER_LIMITS.items()
+}
+
+
+def get_outbound_stats() -> dict:
+    return {name: provider.stats() for name, provider in providers.items()}
@@ -4,16 +4,62 @@ This module provides functions to fetch and process transcriptions from Assembly
 
 import os
 import asyncio
+from typing import AsyncIterator, Callable
+
 import aiohttp
 from pydantic import BaseModel
 
-from ..types import TranscriptRecord, TranscriptQuery, SubtitleRecord
+from ..types import (
+    TranscriptRecord,
+    TranscriptQuery,
+    SubtitleRecord,
+    TranscriptTranslationOptions,
+)
+from .http_client import get_http_client
+from ..models.subtitle_track import SubtitleTrack
+from .outbound import providers, OutboundHTTPError, RETRYABLE_STATUSES
+from ..cache.transcript_cache import transcript_cache
+from ..telemetry.metrics import assemblyai_request_seconds
+from ..telemetry.tracing import current_span, span
+
+ASSEMBLY_AI_BASE_URL = os.getenv("ASSEMBLYAI_BASE_URL", "https://api.assemblyai.com/v2")
+ASSEMBLY_AI_WEBHOOK_URL = os.getenv("ASSEMBLYAI_WEBHOOK_URL")
+ASSEMBLY_AI_WEBHOOK_SECRET = os.getenv("ASSEMBLYAI_WEBHOOK_SECRET")
+ASSEMBLY_AI_WEBHOOK_HEADER = "X-Webhook-Secret"
+# Uploads of long recordings outlast the shared client's total timeout
+ASSEMBLY_AI_UPLOAD_TIMEOUT = float(os.getenv("ASSEMBLYAI_UPLOAD_TIMEOUT", "3600"))
 
 class PostTranscriptRequest(BaseModel):
     """
     The parameters for the transcription request.
+
+    If `translation` is given, the transcript is translated with these options as
+    soon as AssemblyAI reports it completed through the webhook.
     """
     audio_url: str
+    translation: TranscriptTranslationOptions | None = None
+
+
+class BulkTranscriptItem(PostTranscriptRequest):
+    """
+    An audio file of a bulk transcription request. Files are deduplicated by
+    `md5_checksum` if given, otherwise by `audio_url`.
+    """
+    md5_checksum: str | None = None
+    drive_file_id: str | None = None
+
+
+class BulkTranscriptRequest(BaseModel):
+    items: list[BulkTranscriptItem]
+
+
+def _response_error(response, message: str) -> OutboundHTTPError:
+    retry_after = response.headers.get("Retry-After")
+    return OutboundHTTPError(
+        response.status,
+        message,
+        retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None,
+    )
 
 
 async def create_transcript(params: PostTranscriptRequest) -> str:
@@ -26,19 +72,72 @@ async def create_transcript(params: PostTranscriptRequest) -> str:
     Returns:
         str: The ID of the transcription.
     """
-    url = "https://api.assemblyai.com/v2/transcript"
+    url = f"{ASSEMBLY_AI_BASE_URL}/transcript"
     headers = {
         "authorization": os.getenv("ASSEMBLYAI_API_KEY") or "",
         "content-type": "application/json",
     }
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, json={"language_code": "hi", **vars(params), }, headers=headers) as response:
+    # Bulk items carry dedupe fields that are not part of the AssemblyAI request
+    body = {"language_code": "hi", "audio_url": params.audio_url}
+    if ASSEMBLY_AI_WEBHOOK_URL:
+        body["webhook_url"] = ASSEMBLY_AI_WEBHOOK_URL
+        if ASSEMBLY_AI_WEBHOOK_SECRET:
+            body["webhook_auth_header_name"] = ASSEMBLY_AI_WEBHOOK_HEADER
+            body["webhook_auth_header_value"] = ASSEMBLY_AI_WEBHOOK_SECRET
+
+    async def post_transcript() -> dict:
+        session = get_http_client()
+        async with session.post(url, json=body, headers=headers) as response:
+            if response.status in RETRYABLE_STATUSES:
+                raise _response_error(response, await response.text())
             if response.status != 200:
                 error_message = await response.text()
                 raise Exception(f"Error transcribing audio: {error_message}")
-            result = await response.json()
+            return await response.json()
+
+    with span(
+        "assemblyai.create", histogram=assemblyai_request_seconds, resource="create"
+    ) as current:
+        result = await providers["assemblyai"].call(post_transcript)
+        current.set(transcript_id=result["id"])
     return result["id"]
 
+async def upload_audio(open_chunks: Callable[[], AsyncIterator[bytes]]) -> str:
+    """
+    Streams an audio file to AssemblyAI's upload endpoint.
+
+    Args:
+        open_chunks (Callable): Returns a fresh iterator over the file's bytes, once
+            per attempt.
+
+    Returns:
+        str: The URL to transcribe the uploaded file from.
+    """
+    url = f"{ASSEMBLY_AI_BASE_URL}/upload"
+    headers = {
+        "authorization": os.getenv("ASSEMBLYAI_API_KEY") or "",
+        "content-type": "application/octet-stream",
+    }
+
+    async def post_upload() -> dict:
+        session = get_http_client()
+        async with session.post(
+            url,
+            data=open_chunks(),
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=ASSEMBLY_AI_UPLOAD_TIMEOUT),
+        ) as response:
+            if response.status in RETRYABLE_STATUSES:
+                raise _response_error(response, await response.text())
+            if response.status != 200:
+                error_message = await response.text()
+                raise Exception(f"Error uploading audio: {error_message}")
+            return await response.json()
+
+    with span("assemblyai.upload", histogram=assemblyai_request_seconds, resource="upload"):
+        result = await providers["assemblyai"].call(post_upload)
+    return result["upload_url"]
+
 async def fetch_assembly_ai_transcript(transcript_id: str, resource: str = "") -> dict | str:
     """
     Fetches the transcript from AssemblyAI.
@@ -50,18 +149,99 @@ async def fetch_assembly_ai_transcript(transcript_id: str, resource: str = "") -
     Returns:
         dict: The JSON response from the API.
     """
-    url = f"https://api.assemblyai.com/v2/transcript/{transcript_id}{resource}"
+    url = f"{ASSEMBLY_AI_BASE_URL}/transcript/{transcript_id}{resource}"
     headers = {
         "authorization": os.getenv("ASSEMBLYAI_API_KEY") or "",
     }
-    async with aiohttp.ClientSession() as session:
+
+    async def get_resource() -> dict | str:
+        session = get_http_client()
         async with session.get(url, headers=headers) as response:
+            if response.status in RETRYABLE_STATUSES:
+                raise _response_error(response, await response.text())
             if resource == "/srt":
-                result = await response.text()
-            else:
-                result = await response.json()
+                return await response.text()
+            return await response.json()
+
+    with span(
+        "assemblyai.fetch",
+        histogram=assemblyai_request_seconds,
+        resource=resource or "transcript",
+        transcript_id=transcript_id,
+    ):
+        return await providers["assemblyai"].call(get_resource)
+
+def compact_resource(resource: str, result: dict | str) -> dict | str:
+    """
+    Keeps only the fields this service reads, dropping e.g. word-level timings.
+    """
+    if not isinstance(result, dict):
+        return result
+    if resource == "":
+        return {key: result.get(key) for key in ("id", "status", "text", "error")}
+    if resource == "/sentences":
+        return {
+            "sentences": [
+                {key: sentence[key] for key in ("text", "start", "end")}
+                for sentence in result.get("sentences", [])
+            ]
+        }
     return result
 
+def _get_cached_resources(transcript_id: str, resources: list[str]) -> dict[str, dict | str]:
+    cached = {}
+    for resource in resources:
+        result = transcript_cache.get(transcript_id, resource)
+        if result is not None:
+            cached[resource] = result
+    return cached
+
+def _set_cached_resources(transcript_id: str, results: dict[str, dict | str]) -> None:
+    for resource, result in results.items():
+        transcript_cache.set(transcript_id, resource, result)
+
+async def fetch_assembly_ai_resources(transcript_id: str, resources: list[str]) -> dict[str, dict | str]:
+    """
+    Fetches several resources of a transcript, serving completed transcripts from the cache.
+
+    Args:
+        transcript_id (str): The ID of the transcript.
+        resources (list[str]): The resources to fetch, e.g. "", "/sentences", "/srt".
+
+    Returns:
+        dict: The compacted response of each requested resource.
+    """
+    results = await asyncio.to_thread(_get_cached_resources, transcript_id, resources)
+    missing = [resource for resource in resources if resource not in results]
+    current = current_span()
+    if current is not None:
+        current.set(cache_hits=len(results))
+    if not missing:
+        return results
+
+    # Sub-resources carry no status, so completion is read from the transcript itself
+    status_record = results.get("")
+    if status_record is None and "" not in missing:
+        status_record = (await asyncio.to_thread(_get_cached_resources, transcript_id, [""])).get("")
+        if status_record is None:
+            missing.append("")
+
+    responses = await asyncio.gather(
+        *(fetch_assembly_ai_transcript(transcript_id, resource=resource) for resource in missing)
+    )
+    fetched = {
+        resource: compact_resource(resource, response)
+        for resource, response in zip(missing, responses)
+    }
+    status_record = fetched.get("", status_record)
+
+    # Only completed transcripts are immutable; queued or processing ones must be re-fetched
+    if isinstance(status_record, dict) and status_record.get("status") == "completed":
+        await asyncio.to_thread(_set_cached_resources, transcript_id, fetched)
+
+    results.update(fetched)
+    return {resource: results[resource] for resource in resources}
+
 async def get_transcription(params: TranscriptQuery) -> TranscriptRecord:  
     """
     Gets the transcription, sentences, and SRT from AssemblyAI.
@@ -81,25 +261,19 @@ async def get_transcription(params: TranscriptQuery) -> TranscriptRecord:
     include_sentences = params.include_sentences
     include_srt = params.include_srt
 
-    tasks = []
-    srt_response_index = 0
-    transcript_response_index = 0
-    sentences_response_index = 0
-
+    resources = []
     if include_transcript:
-        tasks.append(fetch_assembly_ai_transcript(transcript_id))
-        srt_response_index += 1
-        sentences_response_index += 1
+        resources.append("")
     if include_sentences:
-        tasks.append(fetch_assembly_ai_transcript(transcript_id, resource="/sentences"))
-        srt_response_index += 1
+        resources.append("/sentences")
     if include_srt:
-        tasks.append(fetch_assembly_ai_transcript(transcript_id, resource="/srt"))
-          
-    results = await asyncio.gather(*tasks)
-    transcript_response = results[transcript_response_index] if include_transcript else None
-    sentences_response = results[sentences_response_index] if include_sentences else None
-    srt_response = results[srt_response_index] if include_srt else None
+        resources.append("/srt")
+
+    with span("get_transcription", transcript_id=transcript_id, resources=resources):
+        results = await fetch_assembly_ai_resources(transcript_id, resources)
+    transcript_response = results.get("")
+    sentences_response = results.get("/sentences")
+    srt_response = results.get("/srt")
 
     transcript_record = TranscriptRecord(
         status=transcript_response.get("status") if transcript_response else None,
@@ -116,3 +290,23 @@ async def get_transcription(params: TranscriptQuery) -> TranscriptRecord:
         srt=srt_response if srt_response else None,
     )
     return transcript_record
+
+async def get_transcript_track(transcript_id: str) -> tuple[TranscriptRecord, SubtitleTrack]:
+    """
+    Gets the transcript text and its sentences as a compact `SubtitleTrack`,
+    without building a pydantic record per sentence.
+
+    Returns:
+        tuple: The record with status and transcript text, and the sentence track.
+    """
+    with span("get_transcription", transcript_id=transcript_id, resources=["", "/sentences"]):
+        results = await fetch_assembly_ai_resources(transcript_id, ["", "/sentences"])
+    transcript_response = results[""]
+    sentences_response = results["/sentences"]
+
+    transcript_record = TranscriptRecord(
+        status=transcript_response.get("status"),
+        transcript=transcript_response.get("text"),
+    )
+    track = SubtitleTrack.from_dicts(sentences_response.get("sentences") or [])
+    return transcript_record, track
@@ -0,0 +1,77 @@
+"""
+This module provides the artifact store that checkpoints the stages of translation
+jobs, so a retried or restarted job resumes after its last completed stage instead of
+repeating the LLM calls.
+
+Stage outputs are stored once per content as zlib-compressed JSON blobs, addressed by
+their hash. A job's stages point at blobs under the job's key, which is derived from
+the job's inputs, so a retry of the same job finds its own checkpoints and concurrent
+jobs never overwrite each other's.
+"""
+
+import os
+import json
+import zlib
+
+from .sqlite_store import SQLiteStore, DATA_DIR
+from .translation_cache import content_hash
+
+ARTIFACT_STORE_PATH = os.getenv(
+    "ARTIFACT_STORE_PATH", os.path.join(DATA_DIR, "artifacts.sqlite3")
+)
+ARTIFACT_STORE_MAX_BYTES = int(
+    os.getenv("ARTIFACT_STORE_MAX_BYTES", str(1024 * 1024 * 1024))
+)
+ARTIFACT_COMPRESSION_LEVEL = int(os.getenv("ARTIFACT_COMPRESSION_LEVEL", "6"))
+
+
+class ArtifactStore:
+    def __init__(self, path: str, max_bytes: int | None = None):
+        self.blobs = SQLiteStore(path, table="blobs", max_bytes=max_bytes)
+        self.stages = SQLiteStore(path, table="stages")
+        self.resumed = 0
+
+    def save(self, job_key: str, stage: str, value) -> str:
+        """
+        Records the output of a job stage.
+
+        Returns:
+            str: The content hash of the stored blob.
+        """
+        data = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        blob_hash = content_hash(data)
+        if self.blobs.get(blob_hash) is None:
+            self.blobs.set(
+                blob_hash,
+                zlib.compress(data.encode("utf-8"), ARTIFACT_COMPRESSION_LEVEL),
+            )
+        self.stages.set(f"{job_key}:{stage}", blob_hash.encode("utf-8"))
+        return blob_hash
+
+    def load(self, job_key: str, stage: str):
+        """
+        Returns the recorded output of a job stage, or None if the stage has not
+        completed or its blob has been evicted.
+        """
+        blob_hash = self.stages.get(f"{job_key}:{stage}")
+        if blob_hash is None:
+            return None
+        data = self.blobs.get(blob_hash.decode("utf-8"))
+        if data is None:
+            return None
+        self.resumed += 1
+        return json.loads(zlib.decompress(data))
+
+    def completed_stages(self, job_key: str) -> list[str]:
+        prefix = f"{job_key}:"
+        return [key[len(prefix):] for key in self.stages.keys(prefix)]
+
+    def stats(self) -> dict:
+        return {
+            "blobs": self.blobs.stats(),
+            "stages": self.stages.stats()["entries"],
+            "resumed_stages": self.resumed,
+        }
+
+
+artifact_store = ArtifactStore(path=ARTIFACT_STORE_PATH, max_bytes=ARTIFACT_STORE_MAX_BYTES or None)
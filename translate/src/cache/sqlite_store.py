@@ -0,0 +1,191 @@
+"""
+This module provides a small persistent key-value store backed by local SQLite.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+DATA_DIR = os.getenv("DATA_DIR", "./data")
+# Reads refresh an entry's access time at most this often, so hot keys are not
+# rewritten on every read
+SQLITE_ACCESS_RESOLUTION = float(os.getenv("SQLITE_ACCESS_RESOLUTION", "60"))
+# Eviction frees space down to this fraction of `max_bytes`, so the next writes do
+# not each trigger another eviction
+SQLITE_EVICT_TO = 0.9
+
+
+def connect(path: str, **kwargs) -> sqlite3.Connection:
+    """
+    Opens a SQLite database in WAL mode, creating its directory if needed.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(path, check_same_thread=False, **kwargs)
+    connection.execute("PRAGMA journal_mode=WAL")
+    # In WAL mode this is still safe against corruption, and commits skip an fsync
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+class SQLiteStore:
+    """
+    Key-value store of byte values in a single SQLite table.
+
+    If `max_bytes` is set, least recently accessed entries are evicted on write
+    once the total stored size exceeds it. The total is tracked as a running upper
+    bound and only recounted once that bound crosses `max_bytes`.
+    """
+
+    def __init__(self, path: str, table: str = "entries", max_bytes: int | None = None):
+        self.path = path
+        self.table = table
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._size: int | None = None
+        self._lock = threading.Lock()
+        self._connect_lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # Opened on first use, so stores can be created at import time without
+        # touching the filesystem
+        if self._connection is None:
+            with self._connect_lock:
+                if self._connection is None:
+                    self._connection = self._connect()
+        return self._connection
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = connect(self.path)
+        with connection:
+            connection.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {self.table} (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            if self.max_bytes:
+                self._size = connection.execute(
+                    f"SELECT COALESCE(SUM(size), 0) FROM {self.table}"
+                ).fetchone()[0]
+        return connection
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock, self.connection:
+            row = self.connection.execute(
+                f"SELECT value, accessed_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if self.max_bytes and now - row[1] >= SQLITE_ACCESS_RESOLUTION:
+                self.connection.execute(
+                    f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?",
+                    (now, key),
+                )
+        return row[0]
+
+    def set(self, key: str, value: bytes) -> None:
+        self.set_many([(key, value)])
+
+    def set_many(self, items: list[tuple[str, bytes]]) -> None:
+        """
+        Stores several entries in a single transaction.
+        """
+        if not items:
+            return
+        now = time.time()
+        with self._lock, self.connection:
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, size, accessed_at) VALUES (?, ?, ?, ?)",
+                [(key, value, len(value), now) for key, value in items],
+            )
+            self._added(sum(len(value) for _, value in items))
+
+    def add(self, key: str, value: bytes) -> bool:
+        """
+        Stores `value` only if `key` is not stored yet, atomically across processes
+        sharing the database. Returns whether it was stored.
+        """
+        with self._lock, self.connection:
+            cursor = self.connection.execute(
+                f"INSERT OR IGNORE INTO {self.table} (key, value, size, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, len(value), time.time()),
+            )
+            if cursor.rowcount:
+                self._added(len(value))
+        return cursor.rowcount > 0
+
+    def delete(self, key: str) -> None:
+        with self._lock, self.connection:
+            self.connection.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def pop(self, key: str) -> bytes | None:
+        with self._lock, self.connection:
+            row = self.connection.execute(
+                f"SELECT value FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.connection.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            if self._size is not None:
+                self._size -= len(row[0])
+        return row[0]
+
+    def keys(self, prefix: str = "") -> list[str]:
+        with self._lock:
+            rows = self.connection.execute(
+                f"SELECT key FROM {self.table} WHERE key LIKE ? ESCAPE '\\'",
+                (prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%",),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def _count_bytes(self) -> int:
+        return self.connection.execute(
+            f"SELECT COALESCE(SUM(size), 0) FROM {self.table}"
+        ).fetchone()[0]
+
+    def _added(self, size: int) -> None:
+        # Replaced and deleted entries are not subtracted, so the running total is an
+        # upper bound that is corrected by recounting before evicting
+        if not self.max_bytes or self._size is None:
+            return
+        self._size += size
+        if self._size > self.max_bytes:
+            self._size = self._count_bytes()
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        target = self.max_bytes * SQLITE_EVICT_TO
+        rows = self.connection.execute(
+            f"SELECT key, size FROM {self.table} ORDER BY accessed_at"
+        ).fetchall()
+        evicted = []
+        for key, size in rows:
+            if self._size <= target:
+                break
+            evicted.append((key,))
+            self._size -= size
+        self.connection.executemany(f"DELETE FROM {self.table} WHERE key = ?", evicted)
+        self.evictions += len(evicted)
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self.connection.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,65 @@
+"""
+This module provides a two-tier JSON cache: an in-process LRU backed by SQLite.
+"""
+
+import json
+
+from .lru import ByteLRUCache
+from .sqlite_store import SQLiteStore
+
+
+class TieredCache:
+    """
+    Cache of JSON-serializable values with a byte-bounded memory tier and a disk tier.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        path: str,
+        table: str,
+        disk_max_bytes: int | None = None,
+    ):
+        self.memory = ByteLRUCache(max_bytes=max_bytes)
+        self.disk = SQLiteStore(path, table=table, max_bytes=disk_max_bytes)
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get_value(self, key: str):
+        value = self.memory.get(key)
+        if value is None:
+            value = self.disk.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self.memory.set(key, value)
+        return json.loads(value)
+
+    def set_value(self, key: str, result) -> None:
+        value = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        self.memory.set(key, value)
+        self.disk.set(key, value)
+
+    def set_values(self, results: dict[str, object]) -> None:
+        """
+        Stores several values, writing the disk tier in a single transaction.
+        """
+        values = [
+            (key, json.dumps(result, ensure_ascii=False).encode("utf-8"))
+            for key, result in results.items()
+        ]
+        for key, value in values:
+            self.memory.set(key, value)
+        self.disk.set_many(values)
+
+    def delete_value(self, key: str) -> None:
+        self.memory.delete(key)
+        self.disk.delete(key)
+
+    def stats(self) -> dict:
+        return {
+            "memory": self.memory.stats(),
+            "disk": {**self.disk.stats(), "hits": self.disk_hits},
+            "misses": self.misses,
+        }
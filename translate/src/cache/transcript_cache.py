@@ -0,0 +1,45 @@
+"""
+This module provides the two-tier cache of completed AssemblyAI transcript resources.
+
+Completed transcripts are immutable, so entries never expire. The first tier is an
+in-process LRU bounded by bytes, the second a SQLite file under the data directory.
+"""
+
+import os
+
+from .tiered import TieredCache
+from .sqlite_store import DATA_DIR
+
+TRANSCRIPT_CACHE_MAX_BYTES = int(
+    os.getenv("TRANSCRIPT_CACHE_MAX_BYTES", str(256 * 1024 * 1024))
+)
+TRANSCRIPT_CACHE_PATH = os.getenv(
+    "TRANSCRIPT_CACHE_PATH", os.path.join(DATA_DIR, "transcript_cache.sqlite3")
+)
+
+
+class TranscriptCache(TieredCache):
+    """
+    Cache of AssemblyAI resources keyed by transcript id and resource path.
+    """
+
+    def __init__(self, max_bytes: int, path: str):
+        super().__init__(max_bytes=max_bytes, path=path, table="transcript_resources")
+
+    @staticmethod
+    def _key(transcript_id: str, resource: str) -> str:
+        return f"{transcript_id}:{resource}"
+
+    def get(self, transcript_id: str, resource: str) -> dict | str | None:
+        return self.get_value(self._key(transcript_id, resource))
+
+    def set(self, transcript_id: str, resource: str, result: dict | str) -> None:
+        """
+        Stores a resource of a transcript. Callers must only pass completed transcripts.
+        """
+        self.set_value(self._key(transcript_id, resource), result)
+
+
+transcript_cache = TranscriptCache(
+    max_bytes=TRANSCRIPT_CACHE_MAX_BYTES, path=TRANSCRIPT_CACHE_PATH
+)
@@ -0,0 +1,59 @@
+"""
+This module provides the content-addressed cache of translation results.
+
+Keys hash the source content together with everything that influences the output:
+the model, the glossary content, the prompt version and, for final records, the
+sentence split length.
+"""
+
+import os
+import hashlib
+import json
+
+from .tiered import TieredCache
+from .sqlite_store import DATA_DIR
+
+TRANSLATION_CACHE_MAX_BYTES = int(
+    os.getenv("TRANSLATION_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+)
+TRANSLATION_CACHE_DISK_MAX_BYTES = int(
+    os.getenv("TRANSLATION_CACHE_DISK_MAX_BYTES", str(2 * 1024 * 1024 * 1024))
+)
+TRANSLATION_CACHE_PATH = os.getenv(
+    "TRANSLATION_CACHE_PATH", os.path.join(DATA_DIR, "translation_cache.sqlite3")
+)
+
+
+def content_hash(content) -> str:
+    """
+    Returns a stable SHA-256 hex digest of a string or JSON-serializable value.
+    """
+    if not isinstance(content, str):
+        content = json.dumps(content, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def translation_key(
+    stage: str,
+    source_hash: str,
+    model_name: str,
+    prompt_version: str,
+    glossary: str | None = None,
+    split_sentences_at: int | None = None,
+) -> str:
+    """
+    Builds the cache key of one translation stage, e.g. "sentences", "transcript" or "v2".
+    """
+    glossary_hash = content_hash(glossary) if glossary else "-"
+    split = str(split_sentences_at) if split_sentences_at else "-"
+    return ":".join(
+        (stage, model_name, prompt_version, source_hash, glossary_hash, split)
+    )
+
+
+translation_cache = TieredCache(
+    max_bytes=TRANSLATION_CACHE_MAX_BYTES,
+    path=TRANSLATION_CACHE_PATH,
+    table="translations",
+    disk_max_bytes=TRANSLATION_CACHE_DISK_MAX_BYTES or None,
+)
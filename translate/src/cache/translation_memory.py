@@ -0,0 +1,133 @@
+"""
+This module provides the translation memory: translated sentences shared across
+transcripts, so recurring quotations, invocations and stock phrases are sent to the
+LLM only once per model, prompt version and applicable glossary entries.
+
+Each sentence is stored under its exact text and under a normalized form that
+ignores case, whitespace and punctuation. Lookups try the exact form first.
+"""
+
+import os
+import re
+import unicodedata
+
+from .tiered import TieredCache
+from .sqlite_store import DATA_DIR
+from .translation_cache import content_hash
+
+TRANSLATION_MEMORY_MAX_BYTES = int(
+    os.getenv("TRANSLATION_MEMORY_MAX_BYTES", str(16 * 1024 * 1024))
+)
+TRANSLATION_MEMORY_DISK_MAX_BYTES = int(
+    os.getenv("TRANSLATION_MEMORY_DISK_MAX_BYTES", str(512 * 1024 * 1024))
+)
+TRANSLATION_MEMORY_PATH = os.getenv(
+    "TRANSLATION_MEMORY_PATH", os.path.join(DATA_DIR, "translation_memory.sqlite3")
+)
+# Very short sentences ("हाँ", "ठीक है") translate differently depending on context
+TRANSLATION_MEMORY_MIN_CHARS = int(os.getenv("TRANSLATION_MEMORY_MIN_CHARS", "12"))
+TRANSLATION_MEMORY_NORMALIZED = os.getenv("TRANSLATION_MEMORY_NORMALIZED", "1") == "1"
+
+# Devanagari danda and double danda are punctuation too
+_PUNCTUATION = re.compile(r"[^\w\s]|[।॥]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sentence(text: str) -> str:
+    text = unicodedata.normalize("NFC", text).casefold()
+    text = _PUNCTUATION.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class TranslationMemory:
+    def __init__(self, cache: TieredCache):
+        self.cache = cache
+        self.exact_hits = 0
+        self.normalized_hits = 0
+        self.misses = 0
+
+    def _key(self, form: str, text: str, model_name: str, prompt_version: str, glossary: str) -> str:
+        return ":".join((form, model_name, prompt_version, content_hash(text), glossary))
+
+    def lookup(
+        self,
+        texts: list[str],
+        model_name: str,
+        prompt_version: str,
+        glossary_hashes: list[str],
+    ) -> dict[int, str]:
+        """
+        Looks up the translations of `texts`. `glossary_hashes` identifies, per text,
+        the glossary entries that apply to it.
+
+        Returns:
+            dict: The remembered translation by index into `texts`.
+        """
+        found: dict[int, str] = {}
+        for index, (text, glossary) in enumerate(zip(texts, glossary_hashes)):
+            if len(text) < TRANSLATION_MEMORY_MIN_CHARS:
+                continue
+            entry = self.cache.get_value(
+                self._key("exact", text, model_name, prompt_version, glossary)
+            )
+            if entry is not None:
+                self.exact_hits += 1
+            elif TRANSLATION_MEMORY_NORMALIZED:
+                entry = self.cache.get_value(
+                    self._key(
+                        "normalized", normalize_sentence(text), model_name, prompt_version, glossary
+                    )
+                )
+                if entry is not None:
+                    self.normalized_hits += 1
+            if entry is None:
+                self.misses += 1
+                continue
+            found[index] = entry["target"]
+        return found
+
+    def remember(
+        self,
+        texts: list[str],
+        translations: list[str],
+        model_name: str,
+        prompt_version: str,
+        glossary_hashes: list[str],
+    ) -> None:
+        entries = {}
+        for text, translation, glossary in zip(texts, translations, glossary_hashes):
+            if len(text) < TRANSLATION_MEMORY_MIN_CHARS or not translation:
+                continue
+            normalized = normalize_sentence(text)
+            entry = {
+                "source": text,
+                "normalized_hash": content_hash(normalized),
+                "model": model_name,
+                "glossary": glossary,
+                "target": translation,
+            }
+            entries[self._key("exact", text, model_name, prompt_version, glossary)] = entry
+            if TRANSLATION_MEMORY_NORMALIZED:
+                entries[
+                    self._key("normalized", normalized, model_name, prompt_version, glossary)
+                ] = entry
+        # One transaction for the whole batch instead of one per sentence
+        self.cache.set_values(entries)
+
+    def stats(self) -> dict:
+        return {
+            **self.cache.stats(),
+            "exact_hits": self.exact_hits,
+            "normalized_hits": self.normalized_hits,
+            "sentence_misses": self.misses,
+        }
+
+
+translation_memory = TranslationMemory(
+    TieredCache(
+        max_bytes=TRANSLATION_MEMORY_MAX_BYTES,
+        path=TRANSLATION_MEMORY_PATH,
+        table="sentences",
+        disk_max_bytes=TRANSLATION_MEMORY_DISK_MAX_BYTES or None,
+    )
+)
@@ -0,0 +1,54 @@
+"""
+This module provides the durable store of the latest v2 translation of each
+transcript, per model, with the glossary revision it was translated with.
+
+Unlike the translation cache it is never evicted, so a translation can later be
+updated incrementally when its glossary changes.
+"""
+
+import os
+import json
+import time
+from pydantic import BaseModel
+
+from .sqlite_store import SQLiteStore, DATA_DIR
+
+TRANSLATION_STORE_PATH = os.getenv(
+    "TRANSLATION_STORE_PATH", os.path.join(DATA_DIR, "translations.sqlite3")
+)
+
+
+class StoredTranslation(BaseModel):
+    transcript_id: str
+    model_name: str
+    prompt_version: str
+    # Hash of the source transcript and sentences the translation was made from
+    source_hash: str
+    glossary_file_id: str | None = None
+    glossary_version: str | None = None
+    glossary_text: str | None = None
+    transcript: str
+    # Unsplit translated sentences as {"start", "end", "text"} dicts
+    sentences: list[dict]
+    updated_at: float = 0.0
+
+
+class TranslationStore:
+    def __init__(self, path: str):
+        self.store = SQLiteStore(path, table="translations")
+
+    def get(self, transcript_id: str, model_name: str) -> StoredTranslation | None:
+        value = self.store.get(f"{transcript_id}:{model_name}")
+        if value is None:
+            return None
+        return StoredTranslation.model_validate(json.loads(value))
+
+    def save(self, translation: StoredTranslation) -> None:
+        translation.updated_at = time.time()
+        self.store.set(
+            f"{translation.transcript_id}:{translation.model_name}",
+            translation.model_dump_json().encode("utf-8"),
+        )
+
+
+translation_store = TranslationStore(path=TRANSLATION_STORE_PATH)
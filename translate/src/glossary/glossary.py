@@ -0,0 +1,57 @@
+"""
+This module provides the parsed form of a glossary CSV file.
+"""
+
+import csv
+import io
+
+from .matcher import TermMatcher, normalize_term
+
+
+class Glossary:
+    """
+    A parsed glossary CSV of "hindi term,english translation" rows.
+    """
+
+    def __init__(self, file_id: str, version: str, text: str):
+        self.file_id = file_id
+        self.version = version
+        self.text = text
+        # Normalized term -> (term as written, translation)
+        self.entries: dict[str, tuple[str, str]] = {}
+        for row in csv.reader(io.StringIO(text)):
+            if len(row) < 2 or not row[0].strip():
+                continue
+            term = row[0].strip()
+            translation = ", ".join(cell.strip() for cell in row[1:] if cell.strip())
+            self.entries[normalize_term(term)] = (term, translation)
+        self.matcher = TermMatcher(list(self.entries))
+        # Input tokens not sent because prompts only carried the matching entries
+        self.prompt_tokens_saved = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def find_entries(self, text: str) -> list[tuple[str, str]]:
+        """
+        Returns the (term, translation) entries whose terms occur in `text`, in the
+        order they are first found.
+        """
+        return [self.entries[key] for key in self.matcher.find(text)]
+
+    def changed_terms(self, previous: "Glossary") -> list[str]:
+        """
+        Returns the terms added, removed or translated differently since `previous`.
+        """
+        return [
+            entry[0]
+            for key, entry in {**previous.entries, **self.entries}.items()
+            if previous.entries.get(key, (None, None))[1]
+            != self.entries.get(key, (None, None))[1]
+        ]
+
+    @staticmethod
+    def to_csv(entries: list[tuple[str, str]]) -> str:
+        output = io.StringIO()
+        csv.writer(output, lineterminator="\n").writerows(entries)
+        return output.getvalue()
@@ -0,0 +1,79 @@
+"""
+This module provides an Aho-Corasick matcher that finds every occurrence of a fixed
+set of terms in a text in a single pass.
+"""
+
+import unicodedata
+from collections import deque
+
+
+def normalize_term(text: str) -> str:
+    # Devanagari can encode the same syllable in several ways, so compare NFC forms
+    return unicodedata.normalize("NFC", text).casefold()
+
+
+def _is_word_char(char: str) -> bool:
+    # Devanagari vowel signs and viramas are combining marks, not alphanumerics
+    return char.isalnum() or unicodedata.category(char).startswith("M")
+
+
+class TermMatcher:
+    """
+    Aho-Corasick automaton over the normalized terms.
+
+    A match must start at a word boundary but may end inside a word, so inflected
+    Hindi forms such as "वस्तुओं" still match the term "वस्तु".
+    """
+
+    __slots__ = ("goto", "fail", "outputs", "terms")
+
+    def __init__(self, terms: list[str]):
+        self.terms = list(dict.fromkeys(normalize_term(term) for term in terms if term))
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.outputs: list[list[int]] = [[]]
+
+        for index, term in enumerate(self.terms):
+            node = 0
+            for char in term:
+                next_node = self.goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self.goto)
+                    self.goto[node][char] = next_node
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.outputs.append([])
+                node = next_node
+            self.outputs[node].append(index)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[child] = target if target != child else 0
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+
+    def find(self, text: str) -> list[str]:
+        """
+        Returns the terms that occur in `text`, in the order they are first found.
+        """
+        text = normalize_term(text)
+        # A dict keeps the match order, unlike a set
+        found: dict[int, None] = {}
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            for index in self.outputs[node]:
+                if index in found:
+                    continue
+                start = position - len(self.terms[index]) + 1
+                if start == 0 or not _is_word_char(text[start - 1]):
+                    found[index] = None
+        return [self.terms[index] for index in found]
@@ -0,0 +1,101 @@
+"""
+This module provides the glossary service that keeps parsed glossaries and their
+term matchers in memory, keyed by Drive file id and revision.
+
+A glossary is revalidated with a metadata-only Drive call at most every
+`GLOSSARY_REVALIDATE_SECONDS`, and downloaded and parsed again only when its
+md5Checksum or version changed.
+"""
+
+import os
+import threading
+import time
+
+from ..api.google_drive import get_file_content, get_file_version
+from ..cache.sqlite_store import DATA_DIR
+from ..cache.tiered import TieredCache
+from .glossary import Glossary
+
+GLOSSARY_REVALIDATE_SECONDS = float(os.getenv("GLOSSARY_REVALIDATE_SECONDS", "60"))
+GLOSSARY_CACHE_MAX_BYTES = int(
+    os.getenv("GLOSSARY_CACHE_MAX_BYTES", str(16 * 1024 * 1024))
+)
+GLOSSARY_CACHE_PATH = os.getenv(
+    "GLOSSARY_CACHE_PATH", os.path.join(DATA_DIR, "glossary_cache.sqlite3")
+)
+
+
+class GlossaryService:
+    """
+    Process-wide store of parsed glossaries. Safe to use from worker threads.
+    """
+
+    def __init__(self, revalidate_seconds: float = GLOSSARY_REVALIDATE_SECONDS):
+        self.revalidate_seconds = revalidate_seconds
+        self.content_cache = TieredCache(
+            max_bytes=GLOSSARY_CACHE_MAX_BYTES,
+            path=GLOSSARY_CACHE_PATH,
+            table="glossaries",
+        )
+        self._glossaries: dict[str, Glossary] = {}
+        self._checked_at: dict[str, float] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        self.metrics = {
+            "hits": 0,
+            "revalidations": 0,
+            "downloads": 0,
+            "parses": 0,
+        }
+
+    def _lock_for(self, file_id: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(file_id, threading.Lock())
+
+    def get(self, file_id: str) -> Glossary:
+        """
+        Returns the current parsed glossary of a Drive file.
+        """
+        # One revalidation per file at a time; concurrent jobs wait for its result
+        with self._lock_for(file_id):
+            glossary = self._glossaries.get(file_id)
+            checked_at = self._checked_at.get(file_id, 0.0)
+            if glossary and time.monotonic() - checked_at < self.revalidate_seconds:
+                self.metrics["hits"] += 1
+                return glossary
+
+            self.metrics["revalidations"] += 1
+            version = get_file_version(file_id)
+            self._checked_at[file_id] = time.monotonic()
+            if glossary and glossary.version == version:
+                self.metrics["hits"] += 1
+                return glossary
+
+            key = f"{file_id}:{version}"
+            text = self.content_cache.get_value(key)
+            if text is None:
+                self.metrics["downloads"] += 1
+                text = get_file_content(file_id=file_id)
+                self.content_cache.set_value(key, text)
+
+            self.metrics["parses"] += 1
+            glossary = Glossary(file_id, version, text)
+            self._glossaries[file_id] = glossary
+            return glossary
+
+    def stats(self) -> dict:
+        return {
+            **self.metrics,
+            "glossaries": {
+                file_id: {
+                    "version": glossary.version,
+                    "entries": len(glossary),
+                    "prompt_tokens_saved": glossary.prompt_tokens_saved,
+                }
+                for file_id, glossary in dict(self._glossaries).items()
+            },
+            "content_cache": self.content_cache.stats(),
+        }
+
+
+glossary_service = GlossaryService()
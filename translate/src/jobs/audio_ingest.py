@@ -0,0 +1,297 @@
+"""
+This module submits audio files to AssemblyAI in bulk, and optionally watches the
+Drive audio folder to submit new recordings as they are uploaded.
+
+Every submitted file is recorded in an index keyed by its Drive md5Checksum, or by its
+URL when no checksum is known, so the same recording is transcribed once no matter how
+often it is submitted or re-uploaded. Each index entry keeps the resulting transcript
+id for translation.
+"""
+
+import os
+import asyncio
+import json
+import time
+from typing import AsyncIterator
+
+from ..cache.sqlite_store import SQLiteStore, DATA_DIR
+from ..api.transcribe import BulkTranscriptItem, create_transcript, upload_audio
+from ..api.google_drive import iter_file_chunks, list_audio_files
+from .pending_translations import save_pending_translation
+from ..telemetry.metrics import audio_ingest_files_total
+from ..types import BulkTranscriptResult, IngestedAudio, TranscriptTranslationOptions
+
+AUDIO_INGEST_PATH = os.getenv("AUDIO_INGEST_PATH", os.path.join(DATA_DIR, "jobs.sqlite3"))
+# Submissions in flight at once; the AssemblyAI request rate is limited by ASSEMBLYAI_RPM
+AUDIO_INGEST_CONCURRENCY = int(os.getenv("AUDIO_INGEST_CONCURRENCY", "8"))
+# Claims older than this are assumed to be left over from a crashed submission
+AUDIO_INGEST_CLAIM_SECONDS = float(os.getenv("AUDIO_INGEST_CLAIM_SECONDS", "600"))
+
+GOOGLE_DRIVE_AUDIO_FOLDER_ID = os.getenv("GOOGLE_DRIVE_AUDIO_FOLDER_ID")
+# Seconds between polls of the audio folder; 0 disables the watcher
+AUDIO_WATCH_INTERVAL = float(os.getenv("AUDIO_WATCH_INTERVAL", "0"))
+# Translates watched recordings to "<file name>.srt" once they are transcribed
+AUDIO_WATCH_TRANSLATE = os.getenv("AUDIO_WATCH_TRANSLATE", "0") == "1"
+# Submits the files already in the folder on the first poll; otherwise the watcher
+# only picks up files added after it first ran
+AUDIO_WATCH_BACKFILL = os.getenv("AUDIO_WATCH_BACKFILL", "0") == "1"
+
+
+def ingest_key(item: BulkTranscriptItem) -> str:
+    if item.md5_checksum:
+        return f"md5:{item.md5_checksum}"
+    return f"url:{item.audio_url}"
+
+
+class AudioIndex:
+    """
+    Index of submitted audio files, shared by replicas through the SQLite file.
+    """
+
+    def __init__(self, path: str):
+        self.entries = SQLiteStore(path, table="ingested_audio")
+        self.state = SQLiteStore(path, table="audio_ingest_state")
+
+    def get(self, key: str) -> IngestedAudio | None:
+        value = self.entries.get(key)
+        if value is None:
+            return None
+        return IngestedAudio(**json.loads(value))
+
+    def claim(self, entry: IngestedAudio) -> bool:
+        """
+        Records `entry` as being submitted unless its file is already in the index.
+        Returns whether the caller should submit the file.
+        """
+        value = entry.model_dump_json().encode("utf-8")
+        if self.entries.add(entry.key, value):
+            return True
+        existing = self.get(entry.key)
+        if (
+            existing is not None
+            and existing.status == "submitting"
+            and time.time() - existing.submitted_at > AUDIO_INGEST_CLAIM_SECONDS
+        ):
+            self.entries.set(entry.key, value)
+            return True
+        return False
+
+    def record(self, entry: IngestedAudio) -> None:
+        self.entries.set(entry.key, entry.model_dump_json().encode("utf-8"))
+
+    def release(self, key: str) -> None:
+        self.entries.delete(key)
+
+    def list(self) -> list[IngestedAudio]:
+        entries = [self.get(key) for key in self.entries.keys()]
+        return sorted(
+            (entry for entry in entries if entry is not None),
+            key=lambda entry: entry.submitted_at,
+        )
+
+    def baseline(self, folder_id: str) -> set[str] | None:
+        """
+        Returns the ids of the files that were in the folder before it was watched,
+        or None if it has not been polled yet.
+        """
+        value = self.state.get(f"baseline:{folder_id}")
+        return set(json.loads(value)) if value is not None else None
+
+    def set_baseline(self, folder_id: str, file_ids: set[str]) -> None:
+        self.state.set(f"baseline:{folder_id}", json.dumps(sorted(file_ids)).encode("utf-8"))
+
+
+audio_index = AudioIndex(path=AUDIO_INGEST_PATH)
+
+
+async def _drive_chunks(file_id: str) -> AsyncIterator[bytes]:
+    chunks = iter_file_chunks(file_id)
+    while True:
+        chunk = await asyncio.to_thread(next, chunks, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+async def _submit_one(
+    item: BulkTranscriptItem,
+    source: str,
+    semaphore: asyncio.Semaphore,
+    name: str | None = None,
+) -> BulkTranscriptResult:
+    entry = IngestedAudio(
+        key=ingest_key(item),
+        source=source,
+        audio_url=item.audio_url,
+        status="submitting",
+        name=name,
+        drive_file_id=item.drive_file_id,
+        submitted_at=time.time(),
+    )
+    if not await asyncio.to_thread(audio_index.claim, entry):
+        existing = await asyncio.to_thread(audio_index.get, entry.key)
+        audio_ingest_files_total.inc(source=source, outcome="duplicate")
+        return BulkTranscriptResult(
+            audio_url=item.audio_url,
+            status="duplicate",
+            transcript_id=existing.transcript_id if existing else None,
+            drive_file_id=item.drive_file_id,
+        )
+
+    try:
+        async with semaphore:
+            if source == "drive":
+                # Drive's download links need sharing and serve large files behind a
+                # virus-scan page, so the file is streamed to AssemblyAI instead
+                upload_url = await upload_audio(lambda: _drive_chunks(item.drive_file_id))
+                transcript_id = await create_transcript(
+                    params=item.model_copy(update={"audio_url": upload_url})
+                )
+            else:
+                transcript_id = await create_transcript(params=item)
+    except Exception as error:
+        print(f"Error submitting {item.audio_url} for transcription: {error}")
+        # Released so the file is retried by the next submission or poll
+        await asyncio.to_thread(audio_index.release, entry.key)
+        audio_ingest_files_total.inc(source=source, outcome="failed")
+        return BulkTranscriptResult(
+            audio_url=item.audio_url,
+            status="failed",
+            drive_file_id=item.drive_file_id,
+            error=str(error),
+        )
+
+    if item.translation:
+        await asyncio.to_thread(save_pending_translation, transcript_id, item.translation)
+    entry = entry.model_copy(update={"status": "submitted", "transcript_id": transcript_id})
+    await asyncio.to_thread(audio_index.record, entry)
+    audio_ingest_files_total.inc(source=source, outcome="submitted")
+    return BulkTranscriptResult(
+        audio_url=item.audio_url,
+        status="submitted",
+        transcript_id=transcript_id,
+        drive_file_id=item.drive_file_id,
+    )
+
+
+async def submit_audio(
+    items: list[BulkTranscriptItem],
+    source: str = "bulk",
+    names: list[str | None] | None = None,
+) -> list[BulkTranscriptResult]:
+    """
+    Submits the audio files that are not in the index yet for transcription,
+    `AUDIO_INGEST_CONCURRENCY` at a time.
+
+    Returns:
+        list: The result of each item, in order.
+    """
+    semaphore = asyncio.Semaphore(AUDIO_INGEST_CONCURRENCY)
+    names = names or [None] * len(items)
+    return list(
+        await asyncio.gather(
+            *(
+                _submit_one(item, source, semaphore, name)
+                for item, name in zip(items, names)
+            )
+        )
+    )
+
+
+class AudioFolderWatcher:
+    """
+    Polls a Drive folder and submits the audio files that are not in the index yet
+    for transcription.
+
+    Every poll lists the whole folder rather than the files modified since the last
+    one: a file moved into the folder keeps its older modification time, and a file
+    whose submission failed must be listed again. The index makes re-listed files
+    cheap to skip.
+    """
+
+    def __init__(self, folder_id: str | None, interval: float):
+        self.folder_id = folder_id
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+        self._stats = {
+            "polls": 0,
+            "listed": 0,
+            "errors": 0,
+            "last_poll_at": None,
+        }
+
+    def _item(self, file: dict) -> BulkTranscriptItem:
+        return BulkTranscriptItem(
+            audio_url=file["webViewLink"],
+            md5_checksum=file.get("md5Checksum"),
+            drive_file_id=file["id"],
+            translation=(
+                TranscriptTranslationOptions(
+                    srt_file_name=f"{os.path.splitext(file['name'])[0]}.srt"
+                )
+                if AUDIO_WATCH_TRANSLATE
+                else None
+            ),
+        )
+
+    def _new_files(self, files: list[dict]) -> list[dict]:
+        baseline = audio_index.baseline(self.folder_id)
+        if baseline is None:
+            # Existing recordings are only submitted when backfill is asked for
+            baseline = set() if AUDIO_WATCH_BACKFILL else {file["id"] for file in files}
+            audio_index.set_baseline(self.folder_id, baseline)
+        return [
+            file
+            for file in files
+            if file["id"] not in baseline
+            and audio_index.get(ingest_key(self._item(file))) is None
+        ]
+
+    async def poll(self) -> list[BulkTranscriptResult]:
+        if not self.folder_id:
+            raise RuntimeError("GOOGLE_DRIVE_AUDIO_FOLDER_ID is not set.")
+        listed = await asyncio.to_thread(list_audio_files, self.folder_id)
+        self._stats["polls"] += 1
+        self._stats["listed"] += len(listed)
+        self._stats["last_poll_at"] = time.time()
+        # Files whose submission failed were released from the index, so they are
+        # submitted again by the next poll
+        files = await asyncio.to_thread(self._new_files, listed)
+        return await submit_audio(
+            [self._item(file) for file in files], "drive", [file["name"] for file in files]
+        )
+
+    async def _watch(self) -> None:
+        while True:
+            try:
+                results = await self.poll()
+                submitted = sum(1 for result in results if result.status == "submitted")
+                if submitted:
+                    print(f"Submitted {submitted} new audio files from Google Drive")
+            except Exception as error:
+                self._stats["errors"] += 1
+                print(f"Error watching Google Drive audio folder: {error}")
+            await asyncio.sleep(self.interval)
+
+    async def start(self) -> None:
+        if self.folder_id and self.interval > 0:
+            self._task = asyncio.create_task(self._watch(), name="audio-folder-watcher")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            **self._stats,
+            "folder_id": self.folder_id,
+            "interval": self.interval,
+            "running": self._task is not None,
+        }
+
+
+audio_folder_watcher = AudioFolderWatcher(
+    folder_id=GOOGLE_DRIVE_AUDIO_FOLDER_ID, interval=AUDIO_WATCH_INTERVAL
+)
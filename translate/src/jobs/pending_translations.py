@@ -0,0 +1,40 @@
+"""
+This module stores translation options of transcripts that are still being transcribed,
+until the AssemblyAI webhook reports them completed.
+"""
+
+import os
+import json
+
+from ..cache.sqlite_store import SQLiteStore, DATA_DIR
+from ..types import TranscriptTranslationOptions
+
+PENDING_TRANSLATIONS_PATH = os.getenv(
+    "PENDING_TRANSLATIONS_PATH", os.path.join(DATA_DIR, "jobs.sqlite3")
+)
+
+_store = SQLiteStore(PENDING_TRANSLATIONS_PATH, table="pending_translations")
+
+
+def save_pending_translation(
+    transcript_id: str, options: TranscriptTranslationOptions
+) -> None:
+    _store.set(transcript_id, options.model_dump_json().encode("utf-8"))
+
+
+def get_pending_translation(transcript_id: str) -> TranscriptTranslationOptions | None:
+    value = _store.get(transcript_id)
+    if value is None:
+        return None
+    return TranscriptTranslationOptions(**json.loads(value))
+
+
+def delete_pending_translation(transcript_id: str) -> None:
+    _store.delete(transcript_id)
+
+
+def pop_pending_translation(transcript_id: str) -> TranscriptTranslationOptions | None:
+    value = _store.pop(transcript_id)
+    if value is None:
+        return None
+    return TranscriptTranslationOptions(**json.loads(value))
@@ -0,0 +1,386 @@
+"""
+This module provides the durable job queue backed by local SQLite.
+
+Running jobs hold a lease that their worker renews. A job whose lease expires, e.g.
+because its process died, is claimed again by the next free worker, so several
+processes can safely share one queue file.
+"""
+
+import os
+import json
+import sqlite3
+import threading
+import time
+import uuid
+
+from ..cache.sqlite_store import DATA_DIR, connect
+from ..types import JobRecord
+
+JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", os.path.join(DATA_DIR, "jobs.sqlite3"))
+JOB_QUEUE_MAX = int(os.getenv("JOB_QUEUE_MAX", "100"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "120"))
+# A failed job waits JOB_RETRY_DELAY * 2^(attempts - 1) seconds, up to JOB_RETRY_MAX_DELAY,
+# before it can be claimed again
+JOB_RETRY_DELAY = float(os.getenv("JOB_RETRY_DELAY", "30"))
+JOB_RETRY_MAX_DELAY = float(os.getenv("JOB_RETRY_MAX_DELAY", "600"))
+
+_JOB_FIELDS = (
+    "job_id",
+    "kind",
+    "provider",
+    "status",
+    "srt_file_id",
+    "attempts",
+    "error",
+    "created_at",
+    "started_at",
+    "finished_at",
+    "batch_id",
+)
+_JOB_COLUMNS = ", ".join(_JOB_FIELDS)
+
+
+class QueueFullError(Exception):
+    """
+    Raised when a job is submitted while the queue is at capacity.
+    """
+
+
+class PermanentJobError(Exception):
+    """
+    Raised by a job handler for a failure that retrying the job cannot fix.
+    """
+
+
+class JobQueue:
+    """
+    SQLite-backed queue of jobs with lease-based claiming.
+    """
+
+    def __init__(self, path: str, max_queued: int):
+        self.path = path
+        self.max_queued = max_queued
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = connect(self.path, isolation_level=None, timeout=30)
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    provider TEXT,
+                    status TEXT NOT NULL,
+                    srt_file_id TEXT,
+                    payload TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    lease_expires_at REAL,
+                    batch_id TEXT,
+                    available_at REAL
+                )
+                """
+            )
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(jobs)")}
+            if "batch_id" not in columns:
+                connection.execute("ALTER TABLE jobs ADD COLUMN batch_id TEXT")
+            if "available_at" not in columns:
+                connection.execute("ALTER TABLE jobs ADD COLUMN available_at REAL")
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_srt_file_id ON jobs (srt_file_id)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_batch_id ON jobs (batch_id)"
+            )
+            self._connection = connection
+        return self._connection
+
+    def _row_to_record(self, row) -> JobRecord:
+        return JobRecord(**dict(zip(_JOB_FIELDS, row)))
+
+    def depth(self) -> int:
+        with self._lock:
+            return self.connection.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued'"
+            ).fetchone()[0]
+
+    def retry_after(self, workers: int) -> int:
+        """
+        Estimates the seconds until a queue slot frees up, from recent job durations.
+        """
+        with self._lock:
+            average = self.connection.execute(
+                """
+                SELECT AVG(finished_at - started_at) FROM (
+                    SELECT finished_at, started_at FROM jobs
+                    WHERE status = 'completed' ORDER BY finished_at DESC LIMIT 50
+                )
+                """
+            ).fetchone()[0]
+        return max(5, int((average or 60) / max(workers, 1)))
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: dict,
+        provider: str | None = None,
+        srt_file_id: str | None = None,
+        check_capacity: bool = True,
+    ) -> JobRecord:
+        return self.enqueue_many(
+            kind, [(payload, provider, srt_file_id)], check_capacity=check_capacity
+        )[0]
+
+    def enqueue_many(
+        self,
+        kind: str,
+        jobs: list[tuple[dict, str | None, str | None]],
+        batch_id: str | None = None,
+        check_capacity: bool = True,
+    ) -> list[JobRecord]:
+        """
+        Enqueues (payload, provider, srt_file_id) jobs in one transaction; either all
+        of them are queued or, if the queue lacks room for all, none.
+        """
+        now = time.time()
+        records = [
+            JobRecord(
+                job_id=uuid.uuid4().hex,
+                kind=kind,
+                provider=provider,
+                status="queued",
+                srt_file_id=srt_file_id,
+                created_at=now,
+                batch_id=batch_id,
+            )
+            for _, provider, srt_file_id in jobs
+        ]
+        with self._lock:
+            connection = self.connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                if check_capacity:
+                    queued = connection.execute(
+                        "SELECT COUNT(*) FROM jobs WHERE status = 'queued'"
+                    ).fetchone()[0]
+                    if queued + len(jobs) > self.max_queued:
+                        raise QueueFullError(f"Job queue is full ({queued} jobs queued)")
+                connection.executemany(
+                    """
+                    INSERT INTO jobs (job_id, kind, provider, status, srt_file_id, payload, created_at, batch_id)
+                    VALUES (?, ?, ?, 'queued', ?, ?, ?, ?)
+                    """,
+                    [
+                        (
+                            record.job_id,
+                            kind,
+                            record.provider,
+                            record.srt_file_id,
+                            json.dumps(payload),
+                            now,
+                            batch_id,
+                        )
+                        for record, (payload, _, _) in zip(records, jobs)
+                    ],
+                )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        return records
+
+    def claim(self, busy_providers: set[str]) -> tuple[JobRecord, dict] | None:
+        """
+        Atomically claims the oldest runnable job whose provider has a free slot and
+        whose retry delay, if any, has passed.
+        """
+        now = time.time()
+        with self._lock:
+            connection = self.connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                # Jobs whose worker died on their last attempt are not retried again
+                connection.execute(
+                    """
+                    UPDATE jobs SET status = 'error', finished_at = ?, lease_expires_at = NULL,
+                        error = 'Job lease expired'
+                    WHERE status = 'running' AND lease_expires_at < ? AND attempts >= ?
+                    """,
+                    (now, now, JOB_MAX_ATTEMPTS),
+                )
+                placeholders = ",".join("?" for _ in busy_providers)
+                provider_filter = (
+                    f"AND (provider IS NULL OR provider NOT IN ({placeholders}))"
+                    if busy_providers
+                    else ""
+                )
+                row = connection.execute(
+                    f"""
+                    SELECT job_id, payload FROM jobs
+                    WHERE (
+                        (status = 'queued' AND (available_at IS NULL OR available_at <= ?))
+                        OR (status = 'running' AND lease_expires_at < ?)
+                    )
+                    {provider_filter}
+                    ORDER BY created_at LIMIT 1
+                    """,
+                    (now, now, *busy_providers),
+                ).fetchone()
+                if row is None:
+                    connection.execute("COMMIT")
+                    return None
+                job_id, payload = row
+                connection.execute(
+                    """
+                    UPDATE jobs SET status = 'running', attempts = attempts + 1,
+                        started_at = ?, lease_expires_at = ?, error = NULL
+                    WHERE job_id = ?
+                    """,
+                    (now, now + JOB_LEASE_SECONDS, job_id),
+                )
+                record = connection.execute(
+                    f"SELECT {_JOB_COLUMNS} FROM jobs WHERE job_id = ?", (job_id,)
+                ).fetchone()
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        return self._row_to_record(record), json.loads(payload)
+
+    def renew_lease(self, job_id: str) -> None:
+        with self._lock:
+            self.connection.execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE job_id = ? AND status = 'running'",
+                (time.time() + JOB_LEASE_SECONDS, job_id),
+            )
+
+    def complete(self, job_id: str) -> None:
+        with self._lock:
+            self.connection.execute(
+                """
+                UPDATE jobs SET status = 'completed', finished_at = ?, lease_expires_at = NULL
+                WHERE job_id = ?
+                """,
+                (time.time(), job_id),
+            )
+
+    def fail(self, job_id: str, error: str, permanent: bool = False) -> None:
+        """
+        Records a failed attempt. The job is queued again after an exponential delay
+        until it runs out of attempts, or fails right away if the error is `permanent`.
+        """
+        now = time.time()
+        with self._lock:
+            connection = self.connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    "SELECT attempts FROM jobs WHERE job_id = ?", (job_id,)
+                ).fetchone()
+                attempts = row[0] if row else 0
+                if permanent or attempts >= JOB_MAX_ATTEMPTS:
+                    connection.execute(
+                        """
+                        UPDATE jobs SET status = 'error', finished_at = ?, error = ?,
+                            lease_expires_at = NULL, available_at = NULL
+                        WHERE job_id = ?
+                        """,
+                        (now, error, job_id),
+                    )
+                else:
+                    delay = min(JOB_RETRY_DELAY * 2 ** max(attempts - 1, 0), JOB_RETRY_MAX_DELAY)
+                    connection.execute(
+                        """
+                        UPDATE jobs SET status = 'queued', finished_at = NULL, error = ?,
+                            lease_expires_at = NULL, available_at = ?
+                        WHERE job_id = ?
+                        """,
+                        (error, now + delay, job_id),
+                    )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def release(self, job_id: str) -> None:
+        """
+        Puts a running job back in the queue without counting the attempt, e.g. on shutdown.
+        """
+        with self._lock:
+            self.connection.execute(
+                """
+                UPDATE jobs SET status = 'queued', attempts = MAX(attempts - 1, 0),
+                    lease_expires_at = NULL
+                WHERE job_id = ? AND status = 'running'
+                """,
+                (job_id,),
+            )
+
+    def get(self, job_id: str) -> JobRecord | None:
+        """
+        Returns the job with the given job id, or the latest job for that SRT file id.
+        """
+        with self._lock:
+            row = self.connection.execute(
+                f"""
+                SELECT {_JOB_COLUMNS} FROM jobs
+                WHERE job_id = ? OR srt_file_id = ?
+                ORDER BY (job_id = ?) DESC, created_at DESC LIMIT 1
+                """,
+                (job_id, job_id, job_id),
+            ).fetchone()
+        return self._row_to_record(row) if row else None
+
+    def record_rejected(
+        self, kind: str, jobs: list[tuple[dict, str]], batch_id: str | None = None
+    ) -> None:
+        """
+        Stores (payload, error) jobs that were rejected before queueing as failed, so
+        they show up in their batch.
+        """
+        now = time.time()
+        with self._lock:
+            self.connection.executemany(
+                """
+                INSERT INTO jobs (job_id, kind, status, payload, error, created_at, finished_at, batch_id)
+                VALUES (?, ?, 'error', ?, ?, ?, ?, ?)
+                """,
+                [
+                    (uuid.uuid4().hex, kind, json.dumps(payload), error, now, now, batch_id)
+                    for payload, error in jobs
+                ],
+            )
+
+    def get_batch(self, batch_id: str) -> list[tuple[JobRecord, dict]]:
+        """
+        Returns the jobs of a batch with their payloads, in submission order.
+        """
+        with self._lock:
+            rows = self.connection.execute(
+                f"""
+                SELECT {_JOB_COLUMNS}, payload FROM jobs
+                WHERE batch_id = ? ORDER BY created_at, rowid
+                """,
+                (batch_id,),
+            ).fetchall()
+        return [(self._row_to_record(row[:-1]), json.loads(row[-1])) for row in rows]
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall()
+        return {"max_queued": self.max_queued, **{status: count for status, count in rows}}
+
+
+job_queue = JobQueue(path=JOB_QUEUE_PATH, max_queued=JOB_QUEUE_MAX)
@@ -0,0 +1,150 @@
+"""
+This module provides the fixed-size asyncio worker pool that drains the job queue.
+"""
+
+import os
+import asyncio
+import time
+import traceback
+from typing import Any, Awaitable, Callable
+
+from .queue import (
+    JobQueue,
+    PermanentJobError,
+    JOB_LEASE_SECONDS,
+    JOB_MAX_ATTEMPTS,
+    job_queue,
+)
+from ..telemetry.metrics import job_duration_seconds, job_queue_wait_seconds
+from ..telemetry.tracing import span, trace
+from ..types import JobRecord, AIModelName
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "2"))
+
+JOB_PROVIDER_CONCURRENCY = {
+    AIModelName.GEMINI.value: int(os.getenv("GEMINI_MAX_JOBS", "2")),
+    AIModelName.OPENAI.value: int(os.getenv("OPENAI_MAX_JOBS", "2")),
+}
+
+JobHandler = Callable[[dict, JobRecord], Awaitable[Any]]
+
+
+class WorkerPool:
+    """
+    Runs queued jobs on a fixed number of asyncio workers, at most
+    `JOB_PROVIDER_CONCURRENCY[provider]` at a time per provider.
+    """
+
+    def __init__(self, queue: JobQueue, workers: int = JOB_WORKERS):
+        self.queue = queue
+        self.workers = workers
+        self.handlers: dict[str, JobHandler] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._running: dict[str, int] = {}
+        self._wakeup: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._claim_lock: asyncio.Lock | None = None
+
+    def register_handler(self, kind: str, handler: JobHandler) -> None:
+        self.handlers[kind] = handler
+
+    def busy_providers(self) -> set[str]:
+        return {
+            provider
+            for provider, count in self._running.items()
+            if count >= JOB_PROVIDER_CONCURRENCY.get(provider, self.workers)
+        }
+
+    def notify(self) -> None:
+        """
+        Wakes idle workers after a job was enqueued in this process. Safe to call
+        from any thread.
+        """
+        if self._wakeup and self._loop:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def start(self) -> None:
+        self._wakeup = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        self._claim_lock = asyncio.Lock()
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"job-worker-{index}")
+            for index in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self) -> None:
+        assert self._wakeup is not None and self._claim_lock is not None
+        while True:
+            # Claims are serialized so provider slots are counted before the next claim
+            async with self._claim_lock:
+                claimed = await asyncio.to_thread(self.queue.claim, self.busy_providers())
+                if claimed is not None:
+                    provider = claimed[0].provider or ""
+                    self._running[provider] = self._running.get(provider, 0) + 1
+            if claimed is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=JOB_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            job, payload = claimed
+            await self._run(job, payload)
+
+    async def _renew_lease(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(JOB_LEASE_SECONDS / 3)
+            await asyncio.to_thread(self.queue.renew_lease, job_id)
+
+    async def _run(self, job: JobRecord, payload: dict) -> None:
+        provider = job.provider or ""
+        lease = asyncio.create_task(self._renew_lease(job.job_id))
+        if job.started_at:
+            job_queue_wait_seconds.observe(job.started_at - job.created_at, kind=job.kind)
+        try:
+            handler = self.handlers[job.kind]
+            # Every span of the job, across tasks and threads, shares the job id as trace id
+            with trace(job.job_id), span(
+                "job", kind=job.kind, provider=provider, attempt=job.attempts
+            ):
+                await handler(payload, job)
+        except asyncio.CancelledError:
+            await asyncio.to_thread(self.queue.release, job.job_id)
+            raise
+        except Exception as error:
+            print(f"Job {job.job_id} failed on attempt {job.attempts}: {error}")
+            traceback.print_exc()
+            permanent = isinstance(error, PermanentJobError)
+            await asyncio.to_thread(self.queue.fail, job.job_id, str(error), permanent)
+            if permanent or job.attempts >= JOB_MAX_ATTEMPTS:
+                job_duration_seconds.observe(
+                    time.time() - job.created_at, kind=job.kind, status="error"
+                )
+        else:
+            await asyncio.to_thread(self.queue.complete, job.job_id)
+            job_duration_seconds.observe(
+                time.time() - job.created_at, kind=job.kind, status="completed"
+            )
+        finally:
+            lease.cancel()
+            self._running[provider] -= 1
+            # A provider slot freed up, so a worker may now claim a job it had to skip
+            self.notify()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "running": dict(self._running),
+            "provider_concurrency": JOB_PROVIDER_CONCURRENCY,
+        }
+
+
+worker_pool = WorkerPool(queue=job_queue)
@@ -0,0 +1,256 @@
+"""
+This module provides a compact, column-oriented representation of subtitle cues.
+
+Start and end times live in typed arrays and all cue texts are slices of one string
+buffer, so splitting, re-timing and rendering run as single passes without creating
+a pydantic object per cue. Convert to `SubtitleRecord`s only at the API boundary.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable
+
+from ..types import SubtitleRecord
+
+
+def format_timestamp(ms: int, separator: str = ",") -> str:
+    hours, ms = divmod(ms, 3600000)
+    minutes, ms = divmod(ms, 60000)
+    seconds, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{ms:03d}"
+
+
+def parse_timestamp(timestamp: str) -> int:
+    """
+    Parses an SRT or VTT timestamp, e.g. "01:02:03,456", into milliseconds.
+    """
+    clock, _, ms = timestamp.strip().replace(".", ",").partition(",")
+    hours, minutes, seconds = (int(part) for part in clock.split(":"))
+    return ((hours * 60 + minutes) * 60 + seconds) * 1000 + int(ms or 0)
+
+
+class SubtitleTrack:
+    """
+    Subtitle cues stored as parallel columns: start, end, and the offset and length of
+    each cue's text within `buffer`.
+    """
+
+    __slots__ = ("starts", "ends", "offsets", "lengths", "buffer")
+
+    def __init__(
+        self,
+        starts: array,
+        ends: array,
+        offsets: array,
+        lengths: array,
+        buffer: str,
+    ):
+        self.starts = starts
+        self.ends = ends
+        self.offsets = offsets
+        self.lengths = lengths
+        self.buffer = buffer
+
+    @classmethod
+    def from_columns(
+        cls, starts: Iterable[int], ends: Iterable[int], texts: Iterable[str]
+    ) -> "SubtitleTrack":
+        texts = list(texts)
+        offsets = array("q")
+        lengths = array("q")
+        position = 0
+        for text in texts:
+            offsets.append(position)
+            lengths.append(len(text))
+            position += len(text)
+        return cls(array("q", starts), array("q", ends), offsets, lengths, "".join(texts))
+
+    @classmethod
+    def from_dicts(cls, items: list[dict]) -> "SubtitleTrack":
+        """
+        Builds a track from dicts with "start", "end" and "text", e.g. AssemblyAI sentences.
+        """
+        return cls.from_columns(
+            (item["start"] for item in items),
+            (item["end"] for item in items),
+            (item["text"] for item in items),
+        )
+
+    @classmethod
+    def from_records(cls, records: list[SubtitleRecord]) -> "SubtitleTrack":
+        return cls.from_columns(
+            (record.start for record in records),
+            (record.end for record in records),
+            (record.text for record in records),
+        )
+
+    @classmethod
+    def from_srt(cls, srt: str) -> "SubtitleTrack":
+        starts, ends, texts = [], [], []
+        for block in srt.replace("\r\n", "\n").strip().split("\n\n"):
+            lines = block.strip().split("\n")
+            if len(lines) < 2 or "-->" not in lines[1]:
+                continue
+            start, _, end = lines[1].partition("-->")
+            starts.append(parse_timestamp(start))
+            ends.append(parse_timestamp(end))
+            texts.append("\n".join(lines[2:]))
+        return cls.from_columns(starts, ends, texts)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def text(self, index: int) -> str:
+        offset = self.offsets[index]
+        return self.buffer[offset:offset + self.lengths[index]]
+
+    def texts(self) -> list[str]:
+        buffer = self.buffer
+        return [
+            buffer[offset:offset + length]
+            for offset, length in zip(self.offsets, self.lengths)
+        ]
+
+    def with_texts(self, texts: list[str]) -> "SubtitleTrack":
+        """
+        Returns a track with the same timings and new texts, e.g. translations.
+        """
+        if len(texts) != len(self):
+            raise ValueError(f"Expected {len(self)} texts, got {len(texts)}")
+        track = SubtitleTrack.from_columns((), (), texts)
+        track.starts = array("q", self.starts)
+        track.ends = array("q", self.ends)
+        return track
+
+    def slice(self, start: int, stop: int) -> "SubtitleTrack":
+        # Columns are sliced; the text buffer is shared
+        return SubtitleTrack(
+            self.starts[start:stop],
+            self.ends[start:stop],
+            self.offsets[start:stop],
+            self.lengths[start:stop],
+            self.buffer,
+        )
+
+    def time_range(self, from_ms: int | None, to_ms: int | None) -> tuple[int, int]:
+        """
+        Returns the index range of the cues overlapping [from_ms, to_ms), found by
+        binary search over the start and end columns, which are in time order.
+        """
+        first = bisect_right(self.ends, from_ms) if from_ms is not None else 0
+        last = bisect_left(self.starts, to_ms) if to_ms is not None else len(self)
+        return first, max(first, last)
+
+    def shifted(self, ms: int) -> "SubtitleTrack":
+        """
+        Returns the track with every cue moved by `ms` milliseconds.
+        """
+        return SubtitleTrack(
+            array("q", (start + ms for start in self.starts)),
+            array("q", (end + ms for end in self.ends)),
+            self.offsets,
+            self.lengths,
+            self.buffer,
+        )
+
+    def split(self, max_length: int | None) -> "SubtitleTrack":
+        """
+        Splits cues longer than `max_length` characters at word boundaries, dividing
+        each cue's duration in proportion to the characters of its parts.
+
+        Parts are slices of the original text, so the text buffer is shared.
+        """
+        if not max_length:
+            return self
+
+        starts, ends, offsets, lengths = array("q"), array("q"), array("q"), array("q")
+        buffer = self.buffer
+
+        for start, end, offset, length in zip(
+            self.starts, self.ends, self.offsets, self.lengths
+        ):
+            if length <= max_length:
+                starts.append(start)
+                ends.append(end)
+                offsets.append(offset)
+                lengths.append(length)
+                continue
+
+            # Part boundaries as [part_start, part_end) within the buffer
+            parts: list[tuple[int, int]] = []
+            part_start = part_end = offset
+            word_start = offset
+            text_end = offset + length
+            while word_start <= text_end:
+                word_end = buffer.find(" ", word_start, text_end)
+                if word_end == -1:
+                    word_end = text_end
+                part_length = part_end - part_start
+                if part_length + (word_end - word_start) + 1 <= max_length:
+                    if part_length:
+                        part_end = word_end
+                    else:
+                        part_start, part_end = word_start, word_end
+                else:
+                    parts.append((part_start, part_end))
+                    part_start, part_end = word_start, word_end
+                word_start = word_end + 1
+            if part_end > part_start:
+                parts.append((part_start, part_end))
+
+            time_per_char = (end - start) / length
+            part_time = start
+            for part_start, part_end in parts:
+                char_count = part_end - part_start
+                next_time = part_time + round(char_count * time_per_char)
+                starts.append(part_time)
+                ends.append(next_time)
+                offsets.append(part_start)
+                lengths.append(char_count)
+                part_time = next_time
+
+        return SubtitleTrack(starts, ends, offsets, lengths, buffer)
+
+    def to_srt(self, first_index: int = 1) -> str:
+        buffer = self.buffer
+        return "\n".join(
+            f"{index}\n{format_timestamp(start)} --> {format_timestamp(end)}\n{buffer[offset:offset + length]}\n"
+            for index, start, end, offset, length in zip(
+                range(first_index, first_index + len(self)),
+                self.starts,
+                self.ends,
+                self.offsets,
+                self.lengths,
+            )
+        )
+
+    def to_vtt(self) -> str:
+        buffer = self.buffer
+        cues = "\n".join(
+            f"{format_timestamp(start, '.')} --> {format_timestamp(end, '.')}\n{buffer[offset:offset + length]}\n"
+            for start, end, offset, length in zip(
+                self.starts, self.ends, self.offsets, self.lengths
+            )
+        )
+        return "WEBVTT\n\n" + cues
+
+    def to_dicts(self) -> list[dict]:
+        buffer = self.buffer
+        return [
+            {"start": start, "end": end, "text": buffer[offset:offset + length]}
+            for start, end, offset, length in zip(
+                self.starts, self.ends, self.offsets, self.lengths
+            )
+        ]
+
+    def to_records(self) -> list[SubtitleRecord]:
+        buffer = self.buffer
+        # model_construct skips validation; the columns are already well-typed
+        return [
+            SubtitleRecord.model_construct(
+                start=start, end=end, text=buffer[offset:offset + length], length=length
+            )
+            for start, end, offset, length in zip(
+                self.starts, self.ends, self.offsets, self.lengths
+            )
+        ]
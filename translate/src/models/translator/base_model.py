@@ -1,31 +1,71 @@
 from abc import ABC, abstractmethod
 import asyncio
-from typing import Optional
+from typing import AsyncIterator, Optional
 from fastapi import HTTPException
 
-from ...api.transcribe import get_transcription
+from ...api.transcribe import get_transcription, get_transcript_track
+from ...api.http_client import run_with_http_client
+from ...cache.translation_cache import translation_cache, translation_key, content_hash
+from ..subtitle_track import SubtitleTrack, format_timestamp
+from ...glossary.glossary import Glossary
+from ...glossary.matcher import TermMatcher
+from ...cache.translation_store import StoredTranslation, translation_store
+from ...cache.translation_memory import translation_memory
+from ...cache.artifact_store import artifact_store
+from ...telemetry.metrics import (
+    llm_input_tokens_total,
+    llm_output_tokens_total,
+    translation_memory_sentences_total,
+)
+from ...telemetry.tracing import Span, span
+from .clients import llm_clients
+from .chunking import (
+    SentenceWindow,
+    estimate_tokens,
+    iter_translated_windows,
+    translate_segments,
+    translate_selected,
+    ReferenceSlicer,
+)
 
 from ...types import (
     AIModelName,
+    TranscriptRecord,
     TranslatedTranscriptRecord,
     TranslationQuery,
     SubtitleRecord,
 )
 
 
+class UnusableTranscriptError(ValueError):
+    """
+    Raised when a transcript lacks what a translation needs, so retrying cannot help.
+    """
+
+
+async def _none() -> None:
+    return None
+
+
 class AIModel(ABC):
 
     DEFAULT_SPLIT_LENGTH = 80
+    # Bump whenever a prompt changes so cached translations are not reused
+    PROMPT_VERSION = "5"
 
     def __init__(self, ai_model: AIModelName):
         self.model_name = ai_model.value
+        self.glossary_tokens_saved = 0
+        # Per job, since a translator is created for each job
+        self.memory_hits = 0
+        self.memory_lookups = 0
 
-    def translate(self, params: TranslationQuery) -> TranslatedTranscriptRecord:
+    async def translate(self, params: TranslationQuery) -> TranslatedTranscriptRecord:
         transcript_query = params.transcript_query()
         # Need to  translate sentences to generate SRT
         if params.include_srt:
             transcript_query.include_sentences = True
-        transcript_record = asyncio.run(get_transcription(transcript_query))
+        transcript_record = await get_transcription(transcript_query)
 
         if transcript_record.status == "error":
             raise HTTPException(
@@ -38,13 +78,27 @@ class AIModel(ABC):
                 detail="Transcript not available, please try again later.",
             )
 
-        split_sentences = None
-        if (
+        translate_sentences = (
             params.include_sentences or params.include_srt
-        ) and transcript_record.sentences:
-            translated_sentences = self._translate_sentences(
-                transcript_record.sentences
+        ) and transcript_record.sentences
+        translate_transcript = params.include_transcript and transcript_record.transcript
+
+        # Sentences and transcript are independent, so translate them concurrently
+        translated_sentences, translated_transcript = await asyncio.gather(
+            self._cached_translate_sentences(transcript_record.sentences or [])
+            if translate_sentences
+            else _none(),
+            self._cached_translate_transcript(
+                transcript_record.transcript or "",
+                [sentence.text for sentence in transcript_record.sentences or []],
             )
+            if translate_transcript
+            else _none(),
+        )
+        self._report_memory_hits()
+
+        split_sentences = None
+        if translated_sentences is not None:
             split_sentences = self._split_long_sentences(
                 translated_sentences,
                 max_length=params.split_sentences_at or AIModel.DEFAULT_SPLIT_LENGTH,
@@ -55,45 +109,548 @@ class AIModel(ABC):
         )
         if params.include_sentences:
             translated_record.sentences = split_sentences
-        if params.include_transcript and transcript_record.transcript:
-            translated_transcript = self._translate_transcript(
-                transcript_record.transcript
-            )
+        if translated_transcript is not None:
             translated_record.transcript = translated_transcript
         if params.include_srt:
             translated_record.srt = self._generate_srt(split_sentences or [])
 
         return translated_record
 
+    def translate_sync(self, params: TranslationQuery) -> TranslatedTranscriptRecord:
+        """
+        Blocking wrapper around `translate` for callers without an event loop.
+        """
+        async def run() -> TranslatedTranscriptRecord:
+            try:
+                return await self.translate(params)
+            finally:
+                # The shared LLM clients of this short-lived loop go with it
+                await llm_clients.close()
+
+        return run_with_http_client(run())
+
     async def translate_v2(
-        self, transcript_id: str, split_sentences_at: int | None, glossary: str | None
+        self,
+        transcript_id: str,
+        split_sentences_at: int | None,
+        glossary: Glossary | None = None,
     ) -> TranslatedTranscriptRecord:
-        raise NotImplementedError
 
-    @abstractmethod
-    def _translate_sentences(
+        transcript_record, track = await get_transcript_track(transcript_id)
+
+        if not len(track):
+            raise UnusableTranscriptError(
+                "Transcript does not contain sentence information. Please use a different model."
+            )
+        if not transcript_record.transcript:
+            raise UnusableTranscriptError("Transcript not found. Please use a different model.")
+
+        split_sentences_at = split_sentences_at or self.DEFAULT_SPLIT_LENGTH
+        glossary_text = glossary.text if glossary else None
+        source_hash = self._v2_source_hash(transcript_record.transcript, track)
+        record_key = translation_key(
+            "v2",
+            source_hash,
+            self.model_name,
+            self.PROMPT_VERSION,
+            glossary=glossary_text,
+            split_sentences_at=split_sentences_at,
+        )
+        cached_record = await asyncio.to_thread(translation_cache.get_value, record_key)
+        if cached_record is not None:
+            return TranslatedTranscriptRecord.model_validate(cached_record)
+
+        # The unsplit translation is shared by every split length
+        translation_key_v2 = translation_key(
+            "v2", source_hash, self.model_name, self.PROMPT_VERSION, glossary=glossary_text
+        )
+        cached_translation = await asyncio.to_thread(
+            translation_cache.get_value, translation_key_v2
+        )
+        if cached_translation is not None:
+            translated_transcript = cached_translation["transcript"]
+            translated_track = SubtitleTrack.from_dicts(cached_translation["sentences"])
+        else:
+            translated_transcript, translated_track = await self._translate_v2_texts(
+                transcript=transcript_record.transcript,
+                track=track,
+                glossary=glossary,
+                # Keyed by the job's inputs, so a retry of the same job resumes
+                artifact_key=translation_key_v2,
+            )
+            self._report_glossary_savings(glossary)
+            self._report_memory_hits()
+            await asyncio.to_thread(
+                translation_cache.set_value,
+                translation_key_v2,
+                {
+                    "transcript": translated_transcript,
+                    "sentences": translated_track.to_dicts(),
+                },
+            )
+
+        await self._store_translation(
+            transcript_id, source_hash, translated_transcript, translated_track, glossary
+        )
+        return await self._v2_record(
+            translated_transcript, translated_track, split_sentences_at, record_key
+        )
+
+    async def retranslate_v2(
+        self, transcript_id: str, split_sentences_at: int | None, glossary: Glossary | None
+    ) -> TranslatedTranscriptRecord:
+        """
+        Updates the stored translation of a transcript for a changed glossary.
+
+        Only sentences containing a term whose entry was added, removed or changed
+        are translated again, with their neighbouring sentences as context and the
+        stored full-text translation as reference, and merged into the stored
+        translation. Falls back to a full `translate_v2` if no usable translation
+        of the same source is stored.
+        """
+        stored = await asyncio.to_thread(translation_store.get, transcript_id, self.model_name)
+        transcript_record, track = await get_transcript_track(transcript_id)
+        source_hash = self._v2_source_hash(transcript_record.transcript, track)
+        if (
+            glossary is None
+            or stored is None
+            or stored.prompt_version != self.PROMPT_VERSION
+            or stored.source_hash != source_hash
+            or stored.glossary_file_id not in (None, glossary.file_id)
+            or len(stored.sentences) != len(track)
+        ):
+            return await self.translate_v2(transcript_id, split_sentences_at, glossary)
+
+        previous = Glossary(
+            glossary.file_id, stored.glossary_version or "", stored.glossary_text or ""
+        )
+        changed_terms = glossary.changed_terms(previous)
+        texts = track.texts()
+        matcher = TermMatcher(changed_terms)
+        affected = [index for index, text in enumerate(texts) if changed_terms and matcher.find(text)]
+
+        translated_texts = [sentence["text"] for sentence in stored.sentences]
+        with span(
+            "retranslate_v2",
+            transcript_id=transcript_id,
+            changed_terms=len(changed_terms),
+            affected_sentences=len(affected),
+        ):
+            if affected:
+                retranslated = await self._translate_selected(
+                    texts, affected, reference=stored.transcript, glossary=glossary
+                )
+                for index, text in retranslated.items():
+                    translated_texts[index] = text
+        print(
+            f"Glossary {glossary.file_id} changed {len(changed_terms)} terms,"
+            f" re-translated {len(affected)} of {len(texts)} sentences"
+        )
+        self._report_glossary_savings(glossary)
+
+        translated_track = track.with_texts(translated_texts)
+        split_sentences_at = split_sentences_at or self.DEFAULT_SPLIT_LENGTH
+        await asyncio.to_thread(
+            translation_cache.set_value,
+            translation_key(
+                "v2", source_hash, self.model_name, self.PROMPT_VERSION, glossary=glossary.text
+            ),
+            {"transcript": stored.transcript, "sentences": translated_track.to_dicts()},
+        )
+        await self._store_translation(
+            transcript_id, source_hash, stored.transcript, translated_track, glossary
+        )
+        record_key = translation_key(
+            "v2",
+            source_hash,
+            self.model_name,
+            self.PROMPT_VERSION,
+            glossary=glossary.text,
+            split_sentences_at=split_sentences_at,
+        )
+        return await self._v2_record(
+            stored.transcript, translated_track, split_sentences_at, record_key
+        )
+
+    async def _store_translation(
+        self,
+        transcript_id: str,
+        source_hash: str,
+        translated_transcript: str,
+        translated_track: SubtitleTrack,
+        glossary: Glossary | None,
+    ) -> None:
+        # Kept so a later glossary change can be applied with `retranslate_v2`
+        await asyncio.to_thread(
+            translation_store.save,
+            StoredTranslation(
+                transcript_id=transcript_id,
+                model_name=self.model_name,
+                prompt_version=self.PROMPT_VERSION,
+                source_hash=source_hash,
+                glossary_file_id=glossary.file_id if glossary else None,
+                glossary_version=glossary.version if glossary else None,
+                glossary_text=glossary.text if glossary else None,
+                transcript=translated_transcript,
+                sentences=translated_track.to_dicts(),
+            ),
+        )
+
+    async def _v2_record(
+        self,
+        translated_transcript: str,
+        translated_track: SubtitleTrack,
+        split_sentences_at: int,
+        record_key: str,
+    ) -> TranslatedTranscriptRecord:
+        split_track = translated_track.split(split_sentences_at)
+        translated_transcript_record = TranslatedTranscriptRecord(
+            transcript=translated_transcript,
+            sentences=split_track.to_records(),
+            srt=split_track.to_srt(),
+            ai_model=AIModelName(self.model_name),
+        )
+        await asyncio.to_thread(
+            translation_cache.set_value,
+            record_key,
+            translated_transcript_record.model_dump(mode="json"),
+        )
+        return translated_transcript_record
+
+    async def translate_stream(
+        self,
+        transcript_record: TranscriptRecord,
+        split_sentences_at: int | None,
+        glossary: Glossary | None = None,
+    ) -> AsyncIterator[list[SubtitleRecord]]:
+        """
+        Yields split, translated sentences in timestamp order as each window completes.
+
+        A stored v2 translation is streamed as is. Otherwise windows are translated
+        without the full-transcript reference pass, so the first cues arrive after a
+        single window's latency.
+        """
+        track = SubtitleTrack.from_records(transcript_record.sentences or [])
+        max_length = split_sentences_at or self.DEFAULT_SPLIT_LENGTH
+
+        cached_translation = await asyncio.to_thread(
+            translation_cache.get_value,
+            translation_key(
+                "v2",
+                self._v2_source_hash(transcript_record.transcript, track),
+                self.model_name,
+                self.PROMPT_VERSION,
+                glossary=glossary.text if glossary else None,
+            ),
+        )
+        if cached_translation is not None:
+            translated_track = SubtitleTrack.from_dicts(cached_translation["sentences"])
+            yield translated_track.split(max_length).to_records()
+            return
+
+        async def translate_window(window: SentenceWindow) -> list[str]:
+            return await self._translate_window(
+                window, None, self._window_glossary(window, glossary)
+            )
+
+        async for offset, translated_texts in iter_translated_windows(
+            track.texts(),
+            translate_window,
+            provider=AIModelName(self.model_name),
+        ):
+            window_track = track.slice(offset, offset + len(translated_texts))
+            yield window_track.with_texts(translated_texts).split(max_length).to_records()
+        self._report_glossary_savings(glossary)
+
+    async def translate_stream_srt(
+        self,
+        transcript_record: TranscriptRecord,
+        split_sentences_at: int | None,
+        glossary: Glossary | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        Yields consecutively numbered SRT cues; the concatenated chunks form one SRT file.
+        """
+        next_index = 1
+        async for sentences in self.translate_stream(
+            transcript_record, split_sentences_at, glossary
+        ):
+            if not sentences:
+                continue
+            separator = "\n" if next_index > 1 else ""
+            yield separator + self._generate_srt(sentences, first_index=next_index)
+            next_index += len(sentences)
+
+    def _v2_source_hash(self, transcript: str | None, track: SubtitleTrack) -> str:
+        return content_hash(
+            {
+                "transcript": transcript,
+                "sentences": [
+                    [start, end, text]
+                    for start, end, text in zip(track.starts, track.ends, track.texts())
+                ],
+            }
+        )
+
+    async def _cached_translate_sentences(
+        self, sentences: list[SubtitleRecord]
+    ) -> list[SubtitleRecord]:
+        key = translation_key(
+            "sentences",
+            content_hash([[sentence.start, sentence.end, sentence.text] for sentence in sentences]),
+            self.model_name,
+            self.PROMPT_VERSION,
+        )
+        cached = await asyncio.to_thread(translation_cache.get_value, key)
+        if cached is not None:
+            return [SubtitleRecord(**sentence) for sentence in cached]
+
+        translated_sentences = await self._translate_sentences(sentences)
+        await asyncio.to_thread(
+            translation_cache.set_value,
+            key,
+            [sentence.model_dump() for sentence in translated_sentences],
+        )
+        return translated_sentences
+
+    async def _cached_translate_transcript(
+        self, transcript: str, sentence_texts: list[str] | None = None
+    ) -> str:
+        """
+        Translates the transcript, in segments if its sentences are known.
+        """
+        key = translation_key(
+            "transcript",
+            content_hash([transcript, sentence_texts] if sentence_texts else transcript),
+            self.model_name,
+            self.PROMPT_VERSION,
+        )
+        cached = await asyncio.to_thread(translation_cache.get_value, key)
+        if cached is not None:
+            return cached
+
+        if sentence_texts:
+            translated_transcript = await self._translate_full_transcript(sentence_texts)
+        else:
+            translated_transcript = await self._translate_transcript(transcript)
+        await asyncio.to_thread(translation_cache.set_value, key, translated_transcript)
+        return translated_transcript
+
+    async def _translate_sentences(
         self, sentences: list[SubtitleRecord]
     ) -> list[SubtitleRecord]:
+        translated_texts = await self._translate_texts(
+            [sentence.text for sentence in sentences]
+        )
+        return [
+            SubtitleRecord(
+                start=sentence.start,
+                end=sentence.end,
+                text=translated_text,
+                length=len(translated_text),
+            )
+            for sentence, translated_text in zip(sentences, translated_texts)
+        ]
+
+    async def _translate_texts(
+        self,
+        texts: list[str],
+        reference: str | None = None,
+        glossary: Glossary | None = None,
+    ) -> list[str]:
+        """
+        Translates sentence texts in concurrent windows, one output per input text.
+
+        Sentences found in the translation memory are not sent to the LLM; they still
+        serve as context for the neighbouring sentences that are.
+        """
+        with span(
+            "translation_memory", model=self.model_name, sentences=len(texts)
+        ) as memory_span:
+            # Matching the glossary against every sentence stays off the event loop
+            glossary_hashes, remembered = await asyncio.to_thread(
+                self._lookup_memory, texts, glossary
+            )
+            memory_span.set(hits=len(remembered))
+        self.memory_hits += len(remembered)
+        self.memory_lookups += len(texts)
+        translation_memory_sentences_total.inc(len(remembered), model=self.model_name, outcome="hit")
+        translation_memory_sentences_total.inc(
+            len(texts) - len(remembered), model=self.model_name, outcome="miss"
+        )
+
+        misses = [index for index in range(len(texts)) if index not in remembered]
+        if not misses:
+            return [remembered[index] for index in range(len(texts))]
+
+        translated = await self._translate_selected(texts, misses, reference, glossary)
+        await asyncio.to_thread(
+            translation_memory.remember,
+            [texts[index] for index in misses],
+            [translated[index] for index in misses],
+            self.model_name,
+            self.PROMPT_VERSION,
+            [glossary_hashes[index] for index in misses],
+        )
+        return [
+            remembered[index] if index in remembered else translated[index]
+            for index in range(len(texts))
+        ]
+
+    def _lookup_memory(
+        self, texts: list[str], glossary: Glossary | None
+    ) -> tuple[list[str], dict[int, str]]:
+        glossary_hashes = [self._sentence_glossary_hash(text, glossary) for text in texts]
+        remembered = translation_memory.lookup(
+            texts, self.model_name, self.PROMPT_VERSION, glossary_hashes
+        )
+        return glossary_hashes, remembered
+
+    def _sentence_glossary_hash(self, text: str, glossary: Glossary | None) -> str:
+        # Only the entries that occur in a sentence can change its translation; they
+        # are sorted so the key does not depend on where in the sentence they occur
+        entries = glossary.find_entries(text) if glossary else None
+        return content_hash(Glossary.to_csv(sorted(entries))) if entries else "-"
+
+    def _record_llm_usage(self, current: Span, input_tokens: int, output_tokens: int) -> None:
+        current.set(outcome="ok", input_tokens=input_tokens, output_tokens=output_tokens)
+        llm_input_tokens_total.inc(input_tokens, model=self.model_name)
+        llm_output_tokens_total.inc(output_tokens, model=self.model_name)
+
+    def _report_memory_hits(self) -> None:
+        if self.memory_lookups:
+            print(
+                f"Translation memory served {self.memory_hits} of {self.memory_lookups}"
+                f" sentences ({self.memory_hits / self.memory_lookups:.0%})"
+            )
+
+    def _report_glossary_savings(self, glossary: Glossary | None) -> None:
+        if glossary is not None:
+            print(
+                f"Glossary filtering saved ~{self.glossary_tokens_saved} prompt tokens"
+                f" ({len(glossary)} entries in glossary {glossary.file_id})"
+            )
+
+    def _window_glossary(
+        self, window: SentenceWindow, glossary: Glossary | None
+    ) -> str | None:
+        """
+        Returns the glossary entries whose terms occur in the window's sentences as CSV,
+        so prompts do not pay for the rest of the glossary.
+        """
+        if glossary is None:
+            return None
+        entries = glossary.find_entries(" ".join(window.texts))
+        subset = Glossary.to_csv(entries) if entries else None
+        saved = estimate_tokens(glossary.text) - (estimate_tokens(subset) if subset else 0)
+        self.glossary_tokens_saved += saved
+        glossary.prompt_tokens_saved += saved
+        return subset
+
+    async def _translate_v2_texts(
+        self,
+        transcript: str,
+        track: SubtitleTrack,
+        glossary: Glossary | None,
+        artifact_key: str,
+    ) -> tuple[str, SubtitleTrack]:
+        """
+        Runs the two LLM stages of v2, checkpointing each stage's output under
+        `artifact_key` so a retried job resumes after the last completed stage.
+        """
+        hindi_sentences = track.texts()
+        await asyncio.to_thread(artifact_store.save, artifact_key, "source", track.to_dicts())
+
+        translated_transcript = await asyncio.to_thread(
+            artifact_store.load, artifact_key, "transcript"
+        )
+        with span(
+            "translate_v2.transcript",
+            model=self.model_name,
+            resumed=translated_transcript is not None,
+        ):
+            if translated_transcript is None:
+                translated_transcript = await self._translate_full_transcript(hindi_sentences)
+                await asyncio.to_thread(
+                    artifact_store.save, artifact_key, "transcript", translated_transcript
+                )
+
+        translated_texts = await asyncio.to_thread(
+            artifact_store.load, artifact_key, "sentences"
+        )
+        if translated_texts is not None and len(translated_texts) != len(track):
+            translated_texts = None
+        with span(
+            "translate_v2.sentences",
+            model=self.model_name,
+            sentences=len(track),
+            resumed=translated_texts is not None,
+        ):
+            if translated_texts is None:
+                translated_texts = await self._translate_texts(
+                    hindi_sentences, reference=translated_transcript, glossary=glossary
+                )
+                await asyncio.to_thread(
+                    artifact_store.save, artifact_key, "sentences", translated_texts
+                )
+
+        return translated_transcript, track.with_texts(translated_texts)
+
+    async def _translate_selected(
+        self,
+        texts: list[str],
+        indices: list[int],
+        reference: str | None = None,
+        glossary: Glossary | None = None,
+    ) -> dict[int, str]:
+        """
+        Translates only the sentences at `indices`, with their neighbours as context.
+        """
+
+        slicer = ReferenceSlicer(texts, reference) if reference else None
+
+        async def translate_window(window: SentenceWindow) -> list[str]:
+            window_reference = slicer.slice(window) if slicer else None
+            return await self._translate_window(
+                window, window_reference, self._window_glossary(window, glossary)
+            )
+
+        return await translate_selected(
+            texts, indices, translate_window, provider=AIModelName(self.model_name)
+        )
+
+    @abstractmethod
+    async def _translate_window(
+        self,
+        window: SentenceWindow,
+        reference: str | None = None,
+        glossary: str | None = None,
+    ) -> list[str]:
         raise NotImplementedError
 
     @abstractmethod
-    def _translate_transcript(self, transcript: str) -> str:
+    async def _translate_transcript(self, transcript: str) -> str:
         raise NotImplementedError
 
-    def _generate_srt(self, sentences: list[SubtitleRecord]) -> str:
-        return "\n".join(
-            f"{index + 1}\n{self._format_srt_timestamp(start)} --> {self._format_srt_timestamp(end)}\n{text}\n"
-            for index, (start, end, text) in enumerate(
-                (sentence.start, sentence.end, sentence.text) for sentence in sentences
-            )
+    async def _translate_segment(self, segment: SentenceWindow) -> str:
+        """
+        Translates one paragraph-sized segment of a transcript as flowing text.
+        """
+        return await self._translate_transcript(" ".join(segment.texts))
+
+    async def _translate_full_transcript(self, texts: list[str]) -> str:
+        """
+        Translates a transcript given as its sentences, segment by segment.
+        """
+        return await translate_segments(
+            texts, self._translate_segment, provider=AIModelName(self.model_name)
         )
 
+    def _generate_srt(self, sentences: list[SubtitleRecord], first_index: int = 1) -> str:
+        return SubtitleTrack.from_records(sentences).to_srt(first_index)
+
     def _format_srt_timestamp(self, ms: int) -> str:
-        hours = str(ms // 3600000).zfill(2)
-        minutes = str((ms % 3600000) // 60000).zfill(2)
-        seconds = str((ms % 60000) // 1000).zfill(2)
-        milliseconds = str(ms % 1000).zfill(3)
-        return f"{hours}:{minutes}:{seconds},{milliseconds}"
+        return format_timestamp(ms)
 
     def _split_long_sentences(
         self, sentences: list[SubtitleRecord], max_length: Optional[int]
@@ -103,45 +660,4 @@ class AIModel(ABC):
                 sentence.length = len(sentence.text)
             return sentences
 
-        new_sentences: list[SubtitleRecord] = []
-
-        for sentence in sentences:
-            text, start, end = sentence.text, sentence.start, sentence.end
-
-            # If the sentence is within the max length, keep it as is
-            if len(text) <= max_length:
-                new_sentences.append(sentence)
-            else:
-                # Split sentence into smaller parts
-                words = text.split(" ")
-                parts: list[str] = []
-                current_part = ""
-
-                for word in words:
-                    if len(current_part) + len(word) + 1 <= max_length:
-                        current_part += (" " if current_part else "") + word
-                    else:
-                        parts.append(current_part)
-                        current_part = word
-
-                if current_part:
-                    parts.append(current_part)
-
-                # Calculate time for each part
-                total_time = end - start
-                time_per_char = total_time / len(text)
-                char_counts = [len(part) for part in parts]
-                time_splits = [round(count * time_per_char) for count in char_counts]
-
-                part_start = start
-                for part, time_split, char_count in zip(
-                    parts, time_splits, char_counts
-                ):
-                    part_end = part_start + time_split
-                    new_record = SubtitleRecord(
-                        text=part, start=part_start, end=part_end, length=char_count
-                    )
-                    new_sentences.append(new_record)
-                    part_start = part_end
-
-        return new_sentences
+        return SubtitleTrack.from_records(sentences).split(max_length).to_records()
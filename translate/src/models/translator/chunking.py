@@ -0,0 +1,354 @@
+"""
+This module splits sentence lists into token-bounded windows and translates them concurrently.
+
+Each window carries a few neighbouring sentences as read-only context. Windows are
+translated under a per-provider concurrency cap and reassembled in source order, with
+exactly one translated text per source sentence.
+"""
+
+import os
+import asyncio
+import weakref
+from typing import AsyncIterator, Awaitable, Callable
+from pydantic import BaseModel
+
+from ...types import AIModelName
+
+CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "2000"))
+CHUNK_CONTEXT_SENTENCES = int(os.getenv("CHUNK_CONTEXT_SENTENCES", "2"))
+CHUNK_MAX_ATTEMPTS = int(os.getenv("CHUNK_MAX_ATTEMPTS", "2"))
+# Paragraph-sized segments of the full-text translation pass
+SEGMENT_MAX_TOKENS = int(os.getenv("SEGMENT_MAX_TOKENS", "1500"))
+SEGMENT_CONTEXT_SENTENCES = int(os.getenv("SEGMENT_CONTEXT_SENTENCES", "3"))
+# Characters of the reference translation sent beyond a window's estimated position,
+# when the reference cannot be cut at its segments
+REFERENCE_MARGIN_CHARS = int(os.getenv("REFERENCE_MARGIN_CHARS", "400"))
+# Separates the translated segments in a full-text translation
+SEGMENT_SEPARATOR = "\n\n"
+
+PROVIDER_CONCURRENCY = {
+    AIModelName.GEMINI: int(os.getenv("GEMINI_MAX_CONCURRENCY", "4")),
+    AIModelName.OPENAI: int(os.getenv("OPENAI_MAX_CONCURRENCY", "4")),
+}
+
+# asyncio semaphores are bound to one event loop, so keep one set per loop
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[AIModelName, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class SentenceWindow(BaseModel):
+    offset: int
+    texts: list[str]
+    context_before: list[str] = []
+    context_after: list[str] = []
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate. Devanagari takes three UTF-8 bytes per character and
+    tokenizes poorly, so bytes / 4 errs on the side of smaller windows.
+    """
+    return len(text.encode("utf-8")) // 4 + 1
+
+
+def build_windows(
+    texts: list[str],
+    max_tokens: int = CHUNK_MAX_TOKENS,
+    context_sentences: int = CHUNK_CONTEXT_SENTENCES,
+) -> list[SentenceWindow]:
+    """
+    Groups consecutive sentences into windows of at most `max_tokens` estimated tokens.
+    A single sentence larger than the budget gets a window of its own.
+    """
+    windows: list[SentenceWindow] = []
+    window_start = 0
+    window_tokens = 0
+
+    def close_window(end: int) -> None:
+        windows.append(
+            SentenceWindow(
+                offset=window_start,
+                texts=texts[window_start:end],
+                context_before=texts[max(0, window_start - context_sentences):window_start],
+                context_after=texts[end:end + context_sentences],
+            )
+        )
+
+    for index, text in enumerate(texts):
+        tokens = estimate_tokens(text)
+        if index > window_start and window_tokens + tokens > max_tokens:
+            close_window(index)
+            window_start = index
+            window_tokens = 0
+        window_tokens += tokens
+
+    if window_start < len(texts):
+        close_window(len(texts))
+
+    return windows
+
+
+def build_selected_windows(
+    texts: list[str],
+    indices: list[int],
+    max_tokens: int = CHUNK_MAX_TOKENS,
+    context_sentences: int = CHUNK_CONTEXT_SENTENCES,
+) -> list[SentenceWindow]:
+    """
+    Builds windows over the sentences at `indices`, with context taken from the
+    neighbouring sentences of the full text.
+
+    Runs of selected sentences separated by at most `context_sentences` others share
+    a window: those sentences would be sent as context anyway, and translating them
+    too saves a call per gap.
+    """
+    runs: list[tuple[int, int]] = []
+    for index in sorted(set(indices)):
+        if runs and index - runs[-1][1] <= context_sentences:
+            runs[-1] = (runs[-1][0], index + 1)
+        else:
+            runs.append((index, index + 1))
+
+    windows: list[SentenceWindow] = []
+    for start, end in runs:
+        for window in build_windows(texts[start:end], max_tokens, context_sentences):
+            offset = start + window.offset
+            window_end = offset + len(window.texts)
+            windows.append(
+                SentenceWindow(
+                    offset=offset,
+                    texts=window.texts,
+                    context_before=texts[max(0, offset - context_sentences):offset],
+                    context_after=texts[window_end:window_end + context_sentences],
+                )
+            )
+    return windows
+
+
+def split_window(window: SentenceWindow) -> tuple[SentenceWindow, SentenceWindow]:
+    middle = len(window.texts) // 2
+    left = SentenceWindow(
+        offset=window.offset,
+        texts=window.texts[:middle],
+        context_before=window.context_before,
+        context_after=window.texts[middle:middle + CHUNK_CONTEXT_SENTENCES],
+    )
+    right = SentenceWindow(
+        offset=window.offset + middle,
+        texts=window.texts[middle:],
+        context_before=window.texts[max(0, middle - CHUNK_CONTEXT_SENTENCES):middle],
+        context_after=window.context_after,
+    )
+    return left, right
+
+
+def get_provider_semaphore(provider: AIModelName) -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphores = _semaphores.setdefault(loop, {})
+    if provider not in semaphores:
+        semaphores[provider] = asyncio.Semaphore(PROVIDER_CONCURRENCY.get(provider, 1))
+    return semaphores[provider]
+
+
+async def _translate_window_checked(
+    window: SentenceWindow,
+    translate_window: Callable[[SentenceWindow], Awaitable[list[str]]],
+    semaphore: asyncio.Semaphore,
+) -> list[str]:
+    translated: list[str] = []
+    for _ in range(CHUNK_MAX_ATTEMPTS):
+        async with semaphore:
+            translated = await translate_window(window)
+        if len(translated) == len(window.texts):
+            return translated
+
+    print(
+        f"Window at sentence {window.offset} returned {len(translated)} of {len(window.texts)} sentences"
+    )
+    # A single sentence that came back split or empty is joined back into one cue
+    if len(window.texts) == 1:
+        return [" ".join(translated)]
+
+    # Smaller windows are much less likely to merge or drop sentences
+    left, right = split_window(window)
+    left_result, right_result = await asyncio.gather(
+        _translate_window_checked(left, translate_window, semaphore),
+        _translate_window_checked(right, translate_window, semaphore),
+    )
+    return left_result + right_result
+
+
+async def iter_translated_windows(
+    texts: list[str],
+    translate_window: Callable[[SentenceWindow], Awaitable[list[str]]],
+    provider: AIModelName,
+    max_tokens: int = CHUNK_MAX_TOKENS,
+) -> AsyncIterator[tuple[int, list[str]]]:
+    """
+    Translates `texts` window by window, concurrently up to the provider's cap, and
+    yields `(offset, translated_texts)` in source order as soon as each window and
+    all windows before it are done.
+    """
+    windows = build_windows(texts, max_tokens=max_tokens)
+    semaphore = get_provider_semaphore(provider)
+    tasks = [
+        asyncio.create_task(_translate_window_checked(window, translate_window, semaphore))
+        for window in windows
+    ]
+    try:
+        for window, task in zip(windows, tasks):
+            yield window.offset, await task
+    finally:
+        # The consumer may stop early, e.g. when a streaming client disconnects
+        for task in tasks:
+            task.cancel()
+
+
+async def translate_in_windows(
+    texts: list[str],
+    translate_window: Callable[[SentenceWindow], Awaitable[list[str]]],
+    provider: AIModelName,
+    max_tokens: int = CHUNK_MAX_TOKENS,
+) -> list[str]:
+    """
+    Translates `texts` window by window, concurrently up to the provider's cap.
+
+    Returns:
+        list[str]: One translated text per input text, in input order.
+    """
+    translated: list[str] = []
+    async for _, window_texts in iter_translated_windows(
+        texts, translate_window, provider, max_tokens=max_tokens
+    ):
+        translated.extend(window_texts)
+    return translated
+
+
+async def translate_selected(
+    texts: list[str],
+    indices: list[int],
+    translate_window: Callable[[SentenceWindow], Awaitable[list[str]]],
+    provider: AIModelName,
+    max_tokens: int = CHUNK_MAX_TOKENS,
+) -> dict[int, str]:
+    """
+    Translates only the sentences at `indices`, concurrently up to the provider's cap.
+
+    Returns:
+        dict: The translated text by sentence index, for the indices in `indices`.
+    """
+    selected = set(indices)
+    windows = build_selected_windows(texts, indices, max_tokens=max_tokens)
+    semaphore = get_provider_semaphore(provider)
+    results = await asyncio.gather(
+        *(
+            _translate_window_checked(window, translate_window, semaphore)
+            for window in windows
+        )
+    )
+    return {
+        window.offset + position: text
+        for window, translated in zip(windows, results)
+        for position, text in enumerate(translated)
+        if window.offset + position in selected
+    }
+
+
+async def translate_segments(
+    texts: list[str],
+    translate_segment: Callable[[SentenceWindow], Awaitable[str]],
+    provider: AIModelName,
+    max_tokens: int = SEGMENT_MAX_TOKENS,
+    context_sentences: int = SEGMENT_CONTEXT_SENTENCES,
+) -> str:
+    """
+    Translates a transcript as paragraph-sized segments of whole sentences,
+    concurrently up to the provider's cap, each with its neighbouring sentences as
+    context, and joins the translated segments in order as paragraphs.
+
+    A single generation for a long lecture is slow and can be cut off at the output
+    token limit; segments are neither.
+    """
+    segments = build_windows(texts, max_tokens=max_tokens, context_sentences=context_sentences)
+    semaphore = get_provider_semaphore(provider)
+
+    async def translate(segment: SentenceWindow) -> str:
+        async with semaphore:
+            translated = (await translate_segment(segment)).strip()
+        # Blank lines only separate segments, which `ReferenceSlicer` relies on
+        return translated.replace(SEGMENT_SEPARATOR, "\n")
+
+    translated = await asyncio.gather(*(translate(segment) for segment in segments))
+    return SEGMENT_SEPARATOR.join(translated)
+
+
+class ReferenceSlicer:
+    """
+    Cuts the part of a full-text reference translation that lines up with a window,
+    so each window is sent a reference of about its own size.
+
+    A reference made by `translate_segments` from the same texts is cut at the
+    translated segments that overlap the window. Any other reference is cut by the
+    window's relative character position in the source, widened by `margin`
+    characters on each side.
+    """
+
+    def __init__(
+        self,
+        texts: list[str],
+        reference: str,
+        margin: int = REFERENCE_MARGIN_CHARS,
+        segment_max_tokens: int = SEGMENT_MAX_TOKENS,
+    ):
+        self.reference = reference
+        self.margin = margin
+        self.char_offsets = [0]
+        for text in texts:
+            self.char_offsets.append(self.char_offsets[-1] + len(text))
+
+        paragraphs = reference.split(SEGMENT_SEPARATOR)
+        segments = build_windows(texts, max_tokens=segment_max_tokens, context_sentences=0)
+        self.segments: list[tuple[int, int, str]] | None = None
+        if len(paragraphs) == len(segments) > 1:
+            self.segments = [
+                (segment.offset, segment.offset + len(segment.texts), paragraph)
+                for segment, paragraph in zip(segments, paragraphs)
+            ]
+
+    def slice(self, window: SentenceWindow) -> str:
+        start = window.offset
+        end = window.offset + len(window.texts)
+        if self.segments is not None:
+            return SEGMENT_SEPARATOR.join(
+                paragraph
+                for segment_start, segment_end, paragraph in self.segments
+                if segment_start < end and segment_end > start
+            )
+
+        ratio = len(self.reference) / (self.char_offsets[-1] or 1)
+        reference_start = max(0, int(self.char_offsets[start] * ratio) - self.margin)
+        reference_end = int(self.char_offsets[end] * ratio) + self.margin
+        return self.reference[reference_start:reference_end]
+
+
+def format_window_context(window: SentenceWindow) -> str:
+    """
+    Returns the prompt section describing the neighbouring, not-to-be-translated sentences.
+    """
+    if not window.context_before and not window.context_after:
+        return ""
+    return (
+        """
+            The following neighbouring sentences are given only as context.
+            Do not translate them and do not include them in the response.
+
+            preceding_sentences = """
+        + str(window.context_before)
+        + """
+
+            following_sentences = """
+        + str(window.context_after)
+        + """
+            """
+    )
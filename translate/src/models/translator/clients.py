@@ -0,0 +1,172 @@
+"""
+This module provides the process-wide registry of LLM SDK clients.
+
+Translators are cheap and created per job, since they carry per-job counters, but
+the Gemini and OpenAI clients behind them are created once per event loop and shared,
+so requests and jobs reuse warm connections instead of building a client, and a
+connection pool, per call. Like the aiohttp session, SDK clients are bound to the
+event loop they first ran on, so each loop gets its own.
+"""
+
+import os
+import asyncio
+import importlib
+import threading
+import weakref
+from typing import TYPE_CHECKING
+
+from ...types import AIModelName
+
+if TYPE_CHECKING:
+    import google.generativeai as genai
+    import httpx
+    from openai import AsyncOpenAI
+
+OPENAI_POOL_LIMIT = int(os.getenv("OPENAI_POOL_LIMIT", "20"))
+OPENAI_POOL_KEEPALIVE = int(os.getenv("OPENAI_POOL_KEEPALIVE", "10"))
+OPENAI_KEEPALIVE_TIMEOUT = float(os.getenv("OPENAI_KEEPALIVE_TIMEOUT", "60"))
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "300"))
+OPENAI_TIMEOUT_CONNECT = float(os.getenv("OPENAI_TIMEOUT_CONNECT", "10"))
+# Opens provider connections at startup for providers with credentials configured
+TRANSLATOR_WARMUP = os.getenv("TRANSLATOR_WARMUP", "1") == "1"
+
+
+class LLMClients:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._gemini: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, genai.GenerativeModel]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._openai: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple[AsyncOpenAI, httpx.AsyncClient]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._warm_up_task: asyncio.Task | None = None
+        self._stats = {
+            "gemini_models_created": 0,
+            "openai_clients_created": 0,
+            "lookups": 0,
+            "warm_up": {},
+        }
+
+    def gemini_model(self, model_name: str) -> "genai.GenerativeModel":
+        """
+        Returns the shared Gemini model client of the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._stats["lookups"] += 1
+            models = self._gemini.setdefault(loop, {})
+            if model_name not in models:
+                models[model_name] = self._create_gemini_model(model_name)
+                self._stats["gemini_models_created"] += 1
+            return models[model_name]
+
+    def openai(self) -> "AsyncOpenAI":
+        """
+        Returns the shared OpenAI client of the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._stats["lookups"] += 1
+            if loop not in self._openai:
+                self._openai[loop] = self._create_openai_client()
+                self._stats["openai_clients_created"] += 1
+            return self._openai[loop][0]
+
+    # The SDKs are imported on first use, so importing the service stays cheap
+
+    def _create_gemini_model(self, model_name: str) -> "genai.GenerativeModel":
+        import google.generativeai as genai
+
+        return genai.GenerativeModel(model_name)
+
+    def _create_openai_client(self) -> "tuple[AsyncOpenAI, httpx.AsyncClient]":
+        import httpx
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+        http_client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=OPENAI_POOL_LIMIT,
+                max_keepalive_connections=OPENAI_POOL_KEEPALIVE,
+                keepalive_expiry=OPENAI_KEEPALIVE_TIMEOUT,
+            ),
+            timeout=httpx.Timeout(OPENAI_TIMEOUT, connect=OPENAI_TIMEOUT_CONNECT),
+        )
+        # Retries are handled by the shared outbound layer
+        return AsyncOpenAI(max_retries=0, http_client=http_client), http_client
+
+    async def _warm_up(self, provider: AIModelName) -> None:
+        # Calls that cost no tokens but open the connection, TLS session and channel
+        try:
+            # Importing an SDK takes long enough to stall the event loop, so the
+            # client is only created once its SDK has been imported in a thread
+            await asyncio.to_thread(
+                importlib.import_module,
+                "google.generativeai" if provider == AIModelName.GEMINI else "openai",
+            )
+            if provider == AIModelName.GEMINI:
+                await self.gemini_model(provider.value).count_tokens_async("warm-up")
+            else:
+                await self.openai().models.list()
+            self._stats["warm_up"][provider.value] = "ok"
+        except Exception as error:
+            print(f"Could not warm up {provider.value} client: {error}")
+            self._stats["warm_up"][provider.value] = f"error: {error}"
+
+    async def _warm_up_all(self, providers: list[AIModelName]) -> None:
+        await asyncio.gather(*(self._warm_up(provider) for provider in providers))
+
+    def start_warm_up(self) -> None:
+        """
+        Warms up the clients of the providers with credentials in the background, so
+        startup does not wait on provider round trips. Called from the app lifespan.
+        """
+        if not TRANSLATOR_WARMUP:
+            return
+        providers = [
+            provider
+            for provider, variables in (
+                # The Gemini SDK reads either variable
+                (AIModelName.GEMINI, ("GEMINI_API_KEY", "GOOGLE_API_KEY")),
+                (AIModelName.OPENAI, ("OPENAI_API_KEY",)),
+            )
+            if any(os.getenv(variable) for variable in variables)
+        ]
+        if providers:
+            self._warm_up_task = asyncio.create_task(self._warm_up_all(providers))
+
+    async def close(self) -> None:
+        """
+        Closes the clients of the running event loop, if any.
+        """
+        loop = asyncio.get_running_loop()
+        if self._warm_up_task is not None and self._warm_up_task.get_loop() is loop:
+            self._warm_up_task.cancel()
+            self._warm_up_task = None
+        with self._lock:
+            self._gemini.pop(loop, None)
+            clients = self._openai.pop(loop, None)
+        if clients is not None:
+            await clients[0].close()
+
+    def stats(self) -> dict:
+        pools = []
+        with self._lock:
+            openai_clients = list(self._openai.values())
+        for _, http_client in openai_clients:
+            # httpx exposes no public pool statistics
+            pool = getattr(getattr(http_client, "_transport", None), "_pool", None)
+            connections = list(getattr(pool, "connections", []))
+            pools.append(
+                {
+                    "provider": AIModelName.OPENAI.value,
+                    "limit": OPENAI_POOL_LIMIT,
+                    "keepalive_limit": OPENAI_POOL_KEEPALIVE,
+                    "connections": len(connections),
+                    "idle": sum(1 for connection in connections if connection.is_idle()),
+                }
+            )
+        return {**self._stats, "pools": pools}
+
+
+llm_clients = LLMClients()
@@ -1,196 +1,149 @@
-import google.generativeai as genai
 import json
+from typing import TYPE_CHECKING
 
-from ...types import (
-    AIModelName,
-    SubtitleRecord,
-    TranscriptQuery,
-    TranslatedTranscriptRecord,
-)
-from ...api.transcribe import get_transcription
+from ...api.outbound import providers
+from ...telemetry.metrics import llm_request_seconds
+from ...telemetry.tracing import span
 
 from .base_model import AIModel
-import time
+from .clients import llm_clients
+from .chunking import SentenceWindow, format_window_context, estimate_tokens
+
+if TYPE_CHECKING:
+    import google.generativeai as genai
 
 
 class GeminiTranslator(AIModel):
 
-    def __init__(self, ai_model: AIModelName):
-        super().__init__(ai_model)
-        self.model = genai.GenerativeModel(
-            ai_model.value,
-            # generation_config=genai.GenerationConfig(max_output_tokens=8192),
-        )
+    @property
+    def model(self) -> "genai.GenerativeModel":
+        # Shared across translators; see clients.py
+        return llm_clients.gemini_model(self.model_name)
+
+    async def _generate(self, prompt: str, **kwargs):
+        """
+        Calls Gemini through the shared rate limiter, retry and circuit breaker layer.
+        """
+        # Translations are roughly as long as their input
+        tokens = 2 * estimate_tokens(prompt)
+        with span(
+            "llm.call",
+            histogram=llm_request_seconds,
+            model=self.model_name,
+            outcome="error",
+        ) as current:
+            response = await providers["gemini"].call(
+                lambda: self.model.generate_content_async(contents=prompt, **kwargs),
+                tokens=tokens,
+            )
+            usage = getattr(response, "usage_metadata", None)
+            self._record_llm_usage(
+                current,
+                getattr(usage, "prompt_token_count", None) or tokens // 2,
+                getattr(usage, "candidates_token_count", None)
+                or estimate_tokens(response.text),
+            )
+        return response
 
-    def _translate_sentences(
-        self, sentences: list[SubtitleRecord]
-    ) -> list[SubtitleRecord]:
+    async def _translate_window(
+        self,
+        window: SentenceWindow,
+        reference: str | None = None,
+        glossary: str | None = None,
+    ) -> list[str]:
 
-        hindi_sentences = [sentence.text for sentence in sentences]
+        hindi_sentences = window.texts
 
-        prompt = (
-            """
+        if reference is None:
+            prompt = (
+                """
             You are given a stringified array of sentences from a Hindi transcript, mixed with some quotations in Sanskrit.
             Translate the text from Hindi to English, ignoring any quotations in Sanskrit, and return the modified array.
+            The returned array must have exactly one entry per input sentence.
+            If a glossary is given, use its custom translations for the Hindi words it contains.
 
             Use this as input:
             sentences = """
-            + str(hindi_sentences)
-            + """
+                + str(hindi_sentences)
+                + """
+
+            glossary = """
+                + (glossary or '""')
+                + """
             """
-        )
-        response = self.model.generate_content(
-            contents=prompt,
-            generation_config=genai.GenerationConfig(
-                response_mime_type="application/json", response_schema=list[str]
-            ),
-        )
-        translated_texts = json.loads(response.text)
-        result = [
-            SubtitleRecord(
-                **sentence.model_dump(include={"start", "end"}),
-                text=translated_text,
-                length=len(translated_text),
+                + format_window_context(window)
             )
-            for sentence, translated_text in zip(sentences, translated_texts)
-        ]
-
-        return result
+        else:
+            prompt = (
+                """
+            You are given an array of sentences from a Hindi transcript, 
+            the matching part of an English translation of that transcript, 
+            and a glossary containing custom translations for specific Hindi words.
 
-    def _translate_transcript(self, transcript: str) -> str:
+            Read over the English transcript to get an idea of how the sentences should be translated.
 
-        prompt = (
-            """
-            Translate the given Hindi transcript into English.
-            Return only the translated transcript in the response.
+            Consulting the English transcript and the glossary, translate each Hindi sentence into contemporary English.
 
-            Use this as input:
-            hindi_transcript = """
-            + transcript
-            + """
-            """
-        )
-        result = self.model.generate_content(prompt)
+            Return only the translated sentences as an array in the response, with exactly one entry per Hindi sentence.
 
-        return result.text
+            Use the following as input:
+            
+            translated_transcript = """
+                + reference
+                + """ 
 
-    async def translate_v2(
-        self,
-        transcript_id: str,
-        split_sentences_at: int | None,
-        glossary: str | None = None,
-    ) -> TranslatedTranscriptRecord:
+            hindi_sentences = """
+                + str(hindi_sentences)
+                + """
 
-        transcript_query = TranscriptQuery(
-            transcript_id=transcript_id,
-            include_sentences=True,
-            include_transcript=True,
-            include_srt=False,
-        )
-        transcript_record = await get_transcription(transcript_query)
+            glossary = """
+                + (glossary or '""')
+                + """
 
-        if not transcript_record.sentences:
-            raise ValueError(
-                "Transcript does not contain sentence information. Please use a different model."
+            """
+                + format_window_context(window)
             )
-        if not transcript_record.transcript:
-            raise ValueError("Transcript not found. Please use a different model.")
-
-        with open("./data/hindi_sentences.json", "w", encoding="utf-8") as file:
-            sentences_json = [
-                json.loads(sentence.model_dump_json())
-                for sentence in transcript_record.sentences
-            ]
 
-            json.dump(sentences_json, file, ensure_ascii=False, indent=4)
-
-        hindi_sentences = [sentence.text for sentence in transcript_record.sentences]
+        response = await self._generate(
+            prompt,
+            # A plain dict, so the SDK is only imported by the shared client
+            generation_config={
+                "response_mime_type": "application/json",
+                "response_schema": list[str],
+            },
+        )
+        return json.loads(response.text)
 
-        start_time = time.time()
+    async def _translate_transcript(self, transcript: str) -> str:
 
         prompt = (
             """
-            Read over the given Hindi transcript and create an English translation that sounds natural and flowing to native English speakers.
+            Translate the given Hindi transcript into English.
             Return only the translated transcript in the response.
 
             Use this as input:
             hindi_transcript = """
-            + transcript_record.transcript
+            + transcript
             + """
             """
         )
-        translated_transcript = self.model.generate_content(prompt).text
-        end_time = time.time()
-        execution_time = end_time - start_time
-        print(f"Translation execution time: {execution_time:.2f} seconds")
+        result = await self._generate(prompt)
 
-        with open("./data/translated_transcript.txt", "w") as file:
-            file.write(translated_transcript)
+        return result.text
 
-        start_time = time.time()
+    async def _translate_segment(self, segment: SentenceWindow) -> str:
 
         prompt = (
             """
-            You are given an array of sentences from a Hindi transcript, 
-            an English translation of that transcript, 
-            and a glossary containing custom translations for specific Hindi words.
-
-            Read over the English transcript to get an idea of how the sentences should be translated.
-
-            Consulting the English transcript and the glossary, translate each Hindi sentence into contemporary English.
+            Read over the given part of a Hindi transcript and create an English translation that sounds natural and flowing to native English speakers.
+            Return only the translated text in the response.
 
-            Return only the translated sentences as an array in the response.
-
-            Use the following as input:
-            
-            translated_transcript = """
-            + translated_transcript
-            + """ 
-
-            hindi_sentences = """
-            + str(hindi_sentences)
-            + """
-
-            glossary = """
-            + (glossary or '""')
+            Use this as input:
+            hindi_transcript = """
+            + " ".join(segment.texts)
             + """
 
             """
+            + format_window_context(segment)
         )
-        translated_texts = self.model.generate_content(
-            prompt,
-            generation_config=genai.GenerationConfig(
-                response_mime_type="application/json", response_schema=list[str]
-            ),
-        ).text
-        end_time = time.time()
-        execution_time = end_time - start_time
-        print(f"Sentence translation execution time: {execution_time:.2f} seconds")
-
-        with open("./data/translated_sentences.json", "w") as file:
-            file.write(translated_texts)
-
-        translated_texts_json = json.loads(translated_texts)
-        translated_sentences = [
-            SubtitleRecord(
-                **sentence.model_dump(include={"start", "end"}),
-                text=translated_text,
-                length=len(translated_text),
-            )
-            for sentence, translated_text in zip(
-                transcript_record.sentences, translated_texts_json
-            )
-        ]
-        split_sentences = self._split_long_sentences(
-            sentences=translated_sentences,
-            max_length=split_sentences_at or self.DEFAULT_SPLIT_LENGTH,
-        )
-        srt = self._generate_srt(split_sentences)
-        translated_transcript_record = TranslatedTranscriptRecord(
-            transcript=translated_transcript,
-            sentences=split_sentences,
-            srt=srt,
-            ai_model=AIModelName.GEMINI,
-        )
-
-        return translated_transcript_record
+        return (await self._generate(prompt)).text
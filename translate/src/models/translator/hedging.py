@@ -0,0 +1,166 @@
+"""
+This module provides the hedging translator, which spreads each LLM call over a
+primary and a secondary provider.
+
+Every call goes to the primary first. If it has not answered by a deadline taken
+from a percentile of the primary's recent latencies, the same call is also sent to
+the secondary; the first valid result wins and the other call is cancelled. If the
+primary fails, the call fails over to the secondary.
+"""
+
+import os
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+
+from ...types import AIModelName
+from .base_model import AIModel
+from .chunking import SentenceWindow, estimate_tokens
+from ...telemetry.metrics import llm_hedge_overhead_tokens_total, llm_hedged_calls_total
+
+T = TypeVar("T")
+
+LLM_HEDGING = os.getenv("LLM_HEDGING", "0") == "1"
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "0.95"))
+# Used until enough latencies have been seen to estimate the percentile
+HEDGE_DEFAULT_DEADLINE = float(os.getenv("HEDGE_DEFAULT_DEADLINE", "60"))
+HEDGE_MIN_DEADLINE = float(os.getenv("HEDGE_MIN_DEADLINE", "2"))
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+HEDGE_SAMPLES = int(os.getenv("HEDGE_SAMPLES", "200"))
+
+
+class LatencyTracker:
+    """
+    Recent latencies of successful calls per model, as seconds per estimated prompt
+    token, so one percentile serves both sentence windows and full transcripts.
+    """
+
+    def __init__(self, samples: int = HEDGE_SAMPLES):
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque[float]] = {}
+        self.size = samples
+
+    def observe(self, model_name: str, seconds: float, tokens: int) -> None:
+        with self._lock:
+            samples = self._samples.setdefault(model_name, deque(maxlen=self.size))
+            samples.append(seconds / max(tokens, 1))
+
+    def deadline(self, model_name: str, tokens: int) -> float:
+        with self._lock:
+            samples = sorted(self._samples.get(model_name, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_DEADLINE
+        per_token = samples[min(len(samples) - 1, int(HEDGE_PERCENTILE * len(samples)))]
+        return max(HEDGE_MIN_DEADLINE, per_token * max(tokens, 1))
+
+
+latency_tracker = LatencyTracker()
+
+
+class HedgedTranslator(AIModel):
+    """
+    Translates with `primary`, hedging slow calls and failing over to `secondary`.
+
+    Results are cached and reported under the primary's model name.
+    """
+
+    def __init__(self, primary: AIModel, secondary: AIModel):
+        super().__init__(AIModelName(primary.model_name))
+        self.primary = primary
+        self.secondary = secondary
+
+    async def _timed(
+        self, translator: AIModel, call: Callable[[AIModel], Awaitable[T]], tokens: int
+    ) -> T:
+        start = time.perf_counter()
+        result = await call(translator)
+        latency_tracker.observe(translator.model_name, time.perf_counter() - start, tokens)
+        return result
+
+    def _count(self, outcome: str) -> None:
+        llm_hedged_calls_total.inc(
+            primary=self.primary.model_name,
+            secondary=self.secondary.model_name,
+            outcome=outcome,
+        )
+
+    async def _hedged(
+        self,
+        call: Callable[[AIModel], Awaitable[T]],
+        tokens: int,
+        is_valid: Callable[[T], bool],
+    ) -> T:
+        primary = asyncio.create_task(self._timed(self.primary, call, tokens))
+        tasks = [primary]
+        try:
+            deadline = latency_tracker.deadline(self.primary.model_name, tokens)
+            done, _ = await asyncio.wait({primary}, timeout=deadline)
+
+            if done and primary.exception() is None:
+                self._count("primary")
+                return primary.result()
+
+            if done:
+                print(
+                    f"{self.primary.model_name} failed, failing over to"
+                    f" {self.secondary.model_name}: {primary.exception()}"
+                )
+                self._count("failover")
+                return await self._timed(self.secondary, call, tokens)
+
+            # The primary is slower than usual, race it against the secondary
+            llm_hedge_overhead_tokens_total.inc(tokens, model=self.secondary.model_name)
+            secondary = asyncio.create_task(self._timed(self.secondary, call, tokens))
+            tasks.append(secondary)
+            pending = {primary, secondary}
+            fallback: asyncio.Task | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        continue
+                    if is_valid(task.result()):
+                        self._count("hedge_primary" if task is primary else "hedge_secondary")
+                        return task.result()
+                    fallback = fallback or task
+
+            if fallback is not None:
+                # Neither result is valid; the caller retries or splits the window
+                self._count("hedge_primary" if fallback is primary else "hedge_secondary")
+                return fallback.result()
+            self._count("hedge_failed")
+            raise primary.exception()
+        finally:
+            # The loser, or both calls if the caller was cancelled
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _translate_window(
+        self,
+        window: SentenceWindow,
+        reference: str | None = None,
+        glossary: str | None = None,
+    ) -> list[str]:
+        tokens = sum(estimate_tokens(text) for text in window.texts)
+        return await self._hedged(
+            lambda translator: translator._translate_window(window, reference, glossary),
+            tokens,
+            lambda translated: len(translated) == len(window.texts),
+        )
+
+    async def _translate_transcript(self, transcript: str) -> str:
+        return await self._hedged(
+            lambda translator: translator._translate_transcript(transcript),
+            estimate_tokens(transcript),
+            bool,
+        )
+
+    async def _translate_segment(self, segment: SentenceWindow) -> str:
+        return await self._hedged(
+            lambda translator: translator._translate_segment(segment),
+            sum(estimate_tokens(text) for text in segment.texts),
+            bool,
+        )
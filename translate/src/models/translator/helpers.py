@@ -1,15 +1,47 @@
+import os
 import asyncio
+import uuid
 
 from .openai import OpenAITranslator
 from .gemini_ai import GeminiTranslator
-from .base_model import AIModel
+from .base_model import AIModel, UnusableTranscriptError
+from .hedging import LLM_HEDGING, HedgedTranslator
 
-from ...types import AIModelName, CreateTranslationRequest, FileUpdateRequest
-from ...api.google_drive import update_file_google_drive, get_file_content
-from ...utils import run_in_thread
+from ...types import (
+    AIModelName,
+    BatchTranslationItem,
+    BatchTranslationRecord,
+    CreateBatchTranslationRequest,
+    CreateTranslationRequest,
+    FileUpdateRequest,
+    FileUploadRequest,
+    JobRecord,
+    TranscriptWebhookEvent,
+)
+from ...api.google_drive import (
+    create_files_batch,
+    update_file_google_drive,
+    upload_to_google_drive,
+)
+from ...glossary.service import glossary_service
+from ...telemetry.tracing import span
+from ...api.transcribe import fetch_assembly_ai_resources
+from ...jobs.queue import PermanentJobError, job_queue
+from ...jobs.worker import worker_pool
+from ...jobs.pending_translations import (
+    delete_pending_translation,
+    get_pending_translation,
+    pop_pending_translation,
+)
 
+TRANSLATION_JOB = "translation"
 
-def get_translator(ai_model: AIModelName | None) -> AIModel:
+
+async def _none() -> None:
+    return None
+
+
+def _get_single_translator(ai_model: AIModelName | None) -> AIModel:
     match ai_model:
         case AIModelName.OPENAI:
             return OpenAITranslator(ai_model=ai_model)
@@ -20,6 +52,22 @@ def get_translator(ai_model: AIModelName | None) -> AIModel:
             return GeminiTranslator(ai_model=AIModelName.GEMINI)
 
 
+def get_translator(ai_model: AIModelName | None) -> AIModel:
+    """
+    Returns a translator for `ai_model`. With LLM_HEDGING=1, slow or failing calls
+    are hedged or failed over to the other provider.
+    """
+    translator = _get_single_translator(ai_model)
+    if not LLM_HEDGING:
+        return translator
+    secondary = (
+        AIModelName.GEMINI
+        if translator.model_name == AIModelName.OPENAI.value
+        else AIModelName.OPENAI
+    )
+    return HedgedTranslator(translator, _get_single_translator(secondary))
+
+
 async def create_translation_task(params: CreateTranslationRequest) -> None:
 
     transcript_id = params.transcript_id
@@ -32,23 +80,236 @@ async def create_translation_task(params: CreateTranslationRequest) -> None:
         ai_model=AIModelName(params.ai_model) if params.ai_model else AIModelName.GEMINI
     )
 
-    glossary_text = None
-    if glossary_file_id:
-        glossary_text = get_file_content(file_id=glossary_file_id)
-
-    translated_transcript = await translator.translate_v2(
+    with span(
+        "create_translation_task",
         transcript_id=transcript_id,
-        split_sentences_at=split_sentences_at,
-        glossary=glossary_text,
+        model=translator.model_name,
+        srt_file_id=srt_file_id,
+    ):
+        glossary = None
+        if glossary_file_id:
+            glossary = await asyncio.to_thread(glossary_service.get, glossary_file_id)
+
+        translate = translator.retranslate_v2 if params.incremental else translator.translate_v2
+        translated_transcript = await translate(
+            transcript_id=transcript_id,
+            split_sentences_at=split_sentences_at,
+            glossary=glossary,
+        )
+
+        srt = translated_transcript.srt
+        if srt_file_id and srt:
+            await asyncio.to_thread(
+                update_file_google_drive,
+                FileUpdateRequest(file_name=srt_file_name, text=srt, file_id=srt_file_id),
+            )
+
+
+async def run_translation_job(payload: dict, job: JobRecord) -> None:
+    try:
+        await create_translation_task(CreateTranslationRequest.model_validate(payload))
+    except UnusableTranscriptError as error:
+        raise PermanentJobError(str(error)) from error
+
+
+def enqueue_translation_task(params: CreateTranslationRequest) -> JobRecord:
+    """
+    Persists a translation job and wakes the worker pool.
+    """
+    job = job_queue.enqueue(
+        TRANSLATION_JOB,
+        params.model_dump(mode="json"),
+        provider=(params.ai_model or AIModelName.GEMINI).value,
+        srt_file_id=params.srt_file_id,
+        # Admission is checked before the SRT placeholder is created on Drive
+        check_capacity=False,
+    )
+    worker_pool.notify()
+    return job
+
+
+BATCH_PREFETCH_CONCURRENCY = int(os.getenv("BATCH_PREFETCH_CONCURRENCY", "8"))
+
+
+async def _prefetch_transcript(transcript_id: str, semaphore: asyncio.Semaphore) -> str | None:
+    """
+    Warms the transcript cache for a batch job.
+
+    Returns:
+        str | None: Why the transcript cannot be translated, or None if it can.
+    """
+    async with semaphore:
+        try:
+            results = await fetch_assembly_ai_resources(transcript_id, ["", "/sentences"])
+        except Exception as error:
+            return f"Could not fetch transcript: {error}"
+    status = results[""].get("status") if isinstance(results[""], dict) else None
+    if status != "completed":
+        return f"Transcript is {status or 'unavailable'}, not completed."
+    return None
+
+
+async def create_batch_translation(
+    params: CreateBatchTranslationRequest,
+) -> BatchTranslationRecord:
+    """
+    Queues one translation job per distinct transcript with shared options.
+
+    The glossary and all transcripts are fetched once, concurrently, so the jobs start
+    from warm caches, and the SRT placeholders are created in batched Drive calls.
+    Jobs then share the worker pool's per-provider limits.
+    """
+    batch_id = uuid.uuid4().hex
+    transcript_ids = list(dict.fromkeys(params.transcript_ids))
+    ai_model = params.ai_model or AIModelName.GEMINI
+    srt_file_names = params.srt_file_names or {}
+
+    semaphore = asyncio.Semaphore(BATCH_PREFETCH_CONCURRENCY)
+    glossary_task = (
+        asyncio.to_thread(glossary_service.get, params.glossary_file_id)
+        if params.glossary_file_id
+        else _none()
+    )
+    _, *problems = await asyncio.gather(
+        glossary_task,
+        *(_prefetch_transcript(transcript_id, semaphore) for transcript_id in transcript_ids),
     )
 
-    srt = translated_transcript.srt
-    if srt_file_id and srt:
-        update_file_google_drive(
-            FileUpdateRequest(file_name=srt_file_name, text=srt, file_id=srt_file_id)
+    accepted = [
+        transcript_id
+        for transcript_id, problem in zip(transcript_ids, problems)
+        if problem is None
+    ]
+    placeholder_requests = [
+        FileUploadRequest(
+            file_name=srt_file_names.get(transcript_id, f"{transcript_id}.srt"),
+            properties={"transcript_id": transcript_id, "batch_id": batch_id},
         )
+        for transcript_id in accepted
+    ]
+    srt_file_ids = (
+        await asyncio.to_thread(create_files_batch, placeholder_requests)
+        if placeholder_requests
+        else []
+    )
+
+    jobs = []
+    rejected = [
+        ({"transcript_id": transcript_id}, problem)
+        for transcript_id, problem in zip(transcript_ids, problems)
+        if problem is not None
+    ]
+    for transcript_id, placeholder, srt_file_id in zip(accepted, placeholder_requests, srt_file_ids):
+        translation_request = CreateTranslationRequest(
+            transcript_id=transcript_id,
+            srt_file_name=placeholder.file_name,
+            srt_file_id=srt_file_id,
+            glossary_file_id=params.glossary_file_id,
+            split_sentences_at=params.split_sentences_at,
+            ai_model=ai_model,
+            incremental=params.incremental,
+        )
+        if srt_file_id is None:
+            rejected.append(
+                (translation_request.model_dump(mode="json"), "Could not create the SRT file.")
+            )
+            continue
+        jobs.append((translation_request.model_dump(mode="json"), ai_model.value, srt_file_id))
+
+    # Admission was checked for the whole batch before any Drive file was created
+    await asyncio.to_thread(
+        job_queue.enqueue_many, TRANSLATION_JOB, jobs, batch_id, False
+    )
+    if rejected:
+        await asyncio.to_thread(job_queue.record_rejected, TRANSLATION_JOB, rejected, batch_id)
+    worker_pool.notify()
+
+    return get_batch_translation(batch_id)
+
+
+def get_batch_translation(batch_id: str) -> BatchTranslationRecord | None:
+    """
+    Aggregates the status of the jobs of a batch translation.
+    """
+    jobs = job_queue.get_batch(batch_id)
+    if not jobs:
+        return None
+
+    items = [
+        BatchTranslationItem(
+            transcript_id=payload["transcript_id"],
+            status=job.status,
+            job_id=job.job_id if job.provider else None,
+            srt_file_id=job.srt_file_id,
+            error=job.error,
+        )
+        for job, payload in jobs
+    ]
+    counts = {status: 0 for status in ("queued", "running", "completed", "error")}
+    for item in items:
+        counts[item.status] += 1
+
+    if counts["queued"] or counts["running"]:
+        status = "processing"
+    elif counts["completed"]:
+        status = "completed"
+    else:
+        status = "error"
+
+    return BatchTranslationRecord(
+        batch_id=batch_id, status=status, total=len(items), counts=counts, items=items
+    )
+
+
+def create_srt_placeholder(transcript_id: str, srt_file_name: str) -> str:
+    """
+    Creates the empty SRT file on Google Drive that a translation job fills in.
+
+    Returns:
+        str: The Drive file ID of the SRT file.
+    """
+    file_upload_request = FileUploadRequest(
+        file_name=srt_file_name,
+        properties={"transcript_id": transcript_id},
+    )
+    upload_response = upload_to_google_drive(params=file_upload_request)
+    return upload_response["file_id"]
+
+
+async def handle_transcript_webhook(event: TranscriptWebhookEvent) -> JobRecord | None:
+    """
+    Prefetches a completed transcript into the cache and enqueues its pending translation.
+
+    Returns:
+        JobRecord | None: The enqueued job, if a translation was requested for the transcript.
+    """
+    transcript_id = event.transcript_id
+    if event.status != "completed":
+        if event.status == "error":
+            options = await asyncio.to_thread(pop_pending_translation, transcript_id)
+            if options:
+                print(f"Transcript {transcript_id} failed, dropping pending translation")
+        return None
+
+    # The translation job reads both resources, so warm the cache while it is queued
+    await fetch_assembly_ai_resources(transcript_id, ["", "/sentences"])
+
+    options = await asyncio.to_thread(get_pending_translation, transcript_id)
+    if options is None:
+        return None
+
+    srt_file_id = await asyncio.to_thread(
+        create_srt_placeholder, transcript_id, options.srt_file_name
+    )
+    translation_request = CreateTranslationRequest(
+        transcript_id=transcript_id,
+        srt_file_id=srt_file_id,
+        **options.model_dump(),
+    )
+    job = await asyncio.to_thread(enqueue_translation_task, translation_request)
+    # Only dropped once the job is queued, so a failed delivery is retried in full
+    await asyncio.to_thread(delete_pending_translation, transcript_id)
+    return job
 
 
-@run_in_thread
-def create_translation_task_sync(params: CreateTranslationRequest) -> None:
-    asyncio.run(create_translation_task(params))
+worker_pool.register_handler(TRANSLATION_JOB, run_translation_job)
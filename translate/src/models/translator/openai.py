@@ -1,44 +1,92 @@
-from openai import OpenAI
 import json
-
-from ...types import AIModelName, SubtitleRecord
+from typing import TYPE_CHECKING
 
 from .base_model import AIModel
+from .clients import llm_clients
+from .chunking import SentenceWindow, estimate_tokens
+from ...api.outbound import providers
+from ...telemetry.metrics import llm_request_seconds
+from ...telemetry.tracing import span
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
 
 class OpenAITranslator(AIModel):
 
-  def __init__(self, ai_model: AIModelName):
-    super().__init__(ai_model)
-    self.model = OpenAI()
+  @property
+  def model(self) -> "AsyncOpenAI":
+    # Shared across translators; see clients.py
+    return llm_clients.openai()
 
-  def _translate_sentences(self, sentences: list[SubtitleRecord]) -> list[SubtitleRecord]:
-    
-    hindi_sentences = [sentence.model_dump_json() for sentence in sentences]
+  async def _create_completion(self, messages: list, **kwargs):
+    tokens = 2 * sum(estimate_tokens(message["content"]) for message in messages)
+    with span("llm.call", histogram=llm_request_seconds, model=self.model_name, outcome="error") as current:
+      response = await providers["openai"].call(
+        lambda: self.model.chat.completions.create(model=self.model_name, messages=messages, **kwargs),
+        tokens=tokens,
+      )
+      usage = getattr(response, "usage", None)
+      self._record_llm_usage(
+        current,
+        getattr(usage, "prompt_tokens", None) or tokens // 2,
+        getattr(usage, "completion_tokens", None) or estimate_tokens(response.choices[0].message.content or ""),
+      )
+    return response
+
+  async def _translate_window(self, window: SentenceWindow, reference: str | None = None, glossary: str | None = None) -> list[str]:
 
-    translation_response = self.model.chat.completions.create(
-      model=self.model_name,
+    content = "Translate each of the following Hindi sentences to English:\n" + str(window.texts)
+    if window.context_before or window.context_after:
+      content += (
+        "\n\nThese neighbouring sentences are context only, do not translate or return them:\n"
+        + str(window.context_before + ["..."] + window.context_after)
+      )
+    if reference:
+      content += "\n\nReference English translation of this part of the transcript:\n" + reference
+    if glossary:
+      content += "\n\nGlossary of custom translations for specific Hindi words:\n" + glossary
+
+    translation_response = await self._create_completion(
       messages=[
         {
           "role": "developer",
-          "content": "Given an array that represents a timestamped Hindi transcript, return a modified array with the text translated to English. Return the modified array as json object under the field result.",
+          "content": "Given an array of sentences from a Hindi transcript, return an array with each sentence translated to English, exactly one entry per input sentence. Return the array as json object under the field result.",
         },
-        {"role": "user", "content": str(hindi_sentences)},
+        {"role": "user", "content": content},
       ],
       response_format={"type": "json_object"}
     )
 
     translated_sentences_str = (translation_response.choices[0].message.content or "").strip()
 
-    translated_sentences = json.loads(translated_sentences_str).get('result')
-
-    result = [SubtitleRecord(**sentence,length=len(sentence['text'])) for sentence in translated_sentences]
+    result = json.loads(translated_sentences_str).get('result') or []
 
-    return result
+    return [str(text) for text in result]
     
-  def _translate_transcript(self, transcript: str) -> str:
+  async def _translate_segment(self, segment: SentenceWindow) -> str:
+
+    content = " ".join(segment.texts)
+    if segment.context_before or segment.context_after:
+      content += (
+        "\n\nThese neighbouring sentences are context only, do not translate or return them:\n"
+        + str(segment.context_before + ["..."] + segment.context_after)
+      )
+
+    translation_response = await self._create_completion(
+      messages=[
+        {
+          "role": "developer",
+          "content": "Translate the given part of a Hindi transcript into natural, flowing English, skipping any quotations in Sanskrit. Return only the translated text.",
+        },
+        {"role": "user", "content": content},
+      ],
+    )
+
+    return (translation_response.choices[0].message.content or "").strip()
+
+  async def _translate_transcript(self, transcript: str) -> str:
 
-    translation_response = self.model.chat.completions.create(
-      model=self.model_name,
+    translation_response = await self._create_completion(
       messages=[
         {
           "role": "developer",
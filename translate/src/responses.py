@@ -0,0 +1,139 @@
+"""
+This module shapes transcript and translation records into HTTP responses.
+
+Clients can project the record to a few fields and window the sentences and SRT to a
+time range. Bodies get a strong ETag over their content, so unchanged records are
+answered with 304 Not Modified, and are gzip or brotli compressed when accepted.
+"""
+
+import os
+import gzip
+import json
+import hashlib
+from bisect import bisect_left, bisect_right
+from fastapi import HTTPException, Request, Response
+from pydantic import BaseModel
+
+from .models.subtitle_track import SubtitleTrack
+from .types import ResponseOptions, SubtitleRecord
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+RESPONSE_GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "6"))
+RESPONSE_BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", "5"))
+
+
+def _window_sentences(
+    sentences: list[SubtitleRecord], from_ms: int | None, to_ms: int | None
+) -> list[SubtitleRecord]:
+    # Sentences are in time order, so both ends are found by binary search
+    first = 0
+    last = len(sentences)
+    if from_ms is not None:
+        first = bisect_right(sentences, from_ms, key=lambda sentence: sentence.end)
+    if to_ms is not None:
+        last = bisect_left(sentences, to_ms, key=lambda sentence: sentence.start)
+    return sentences[first:max(first, last)]
+
+
+def _window_srt(srt: str, from_ms: int | None, to_ms: int | None) -> str:
+    track = SubtitleTrack.from_srt(srt)
+    first, last = track.time_range(from_ms, to_ms)
+    # Cues keep their numbers from the full SRT
+    return track.slice(first, last).to_srt(first_index=first + 1)
+
+
+def shape_record(record: BaseModel, options: ResponseOptions) -> dict:
+    """
+    Applies the field projection and time window of `options` to a record.
+    """
+    if options.fields:
+        fields = {field.strip() for field in options.fields.split(",") if field.strip()}
+        unknown = fields - set(type(record).model_fields)
+        if unknown:
+            raise HTTPException(
+                status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+    else:
+        fields = None
+
+    if options.from_ms is not None or options.to_ms is not None:
+        updates = {}
+        if getattr(record, "sentences", None):
+            updates["sentences"] = _window_sentences(
+                record.sentences, options.from_ms, options.to_ms
+            )
+        if getattr(record, "srt", None):
+            updates["srt"] = _window_srt(record.srt, options.from_ms, options.to_ms)
+        record = record.model_copy(update=updates)
+
+    return record.model_dump(mode="json", include=fields)
+
+
+def _accepted_encoding(accept_encoding: str) -> str | None:
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    for coding in ("br", "gzip"):
+        if coding == "br" and brotli is None:
+            continue
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+def _etag_matches(if_none_match: str, tag: str) -> bool:
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        # Any content coding of the same body matches
+        opaque = candidate.removeprefix("W/").strip('"')
+        if opaque.split("-")[0] == tag:
+            return True
+    return False
+
+
+def json_response(request: Request, content) -> Response:
+    """
+    Serializes `content` to JSON with a strong ETag, answering 304 if the client's
+    copy is current, and compressing the body if the client accepts it.
+    """
+    body = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    tag = hashlib.sha256(body).hexdigest()[:32]
+    encoding = None
+    if len(body) >= RESPONSE_COMPRESSION_MIN_BYTES:
+        encoding = _accepted_encoding(request.headers.get("accept-encoding", ""))
+
+    # A strong ETag identifies the exact bytes, so each content coding gets its own
+    headers = {
+        "ETag": f'"{tag}-{encoding}"' if encoding else f'"{tag}"',
+        "Vary": "Accept-Encoding",
+        "Cache-Control": "no-cache",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, tag):
+        return Response(status_code=304, headers=headers)
+
+    if encoding == "br":
+        body = brotli.compress(body, quality=RESPONSE_BROTLI_QUALITY)
+    elif encoding == "gzip":
+        body = gzip.compress(body, compresslevel=RESPONSE_GZIP_LEVEL)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def record_response(request: Request, record: BaseModel, options: ResponseOptions) -> Response:
+    return json_response(request, shape_record(record, options))
@@ -1,70 +1,211 @@
-from fastapi import FastAPI, APIRouter, BackgroundTasks, Query
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, APIRouter, Header, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
-from typing import Annotated
+import asyncio
+import hmac
+from typing import Annotated, Literal
 
-from .models.translator.helpers import create_translation_task_sync, get_translator
-from .models.translator.gemini_ai import GeminiTranslator
+from .models.translator.helpers import (
+    create_batch_translation,
+    create_srt_placeholder,
+    enqueue_translation_task,
+    get_batch_translation,
+    get_translator,
+    handle_transcript_webhook,
+)
+from .models.translator.clients import llm_clients
 
 from .types import (
     AIModelName,
+    BatchTranslationRecord,
+    BulkTranscriptResult,
+    CreateBatchTranslationRequest,
     CreateTranslationRequest,
     CreateTranslationResponse,
+    IngestedAudio,
+    JobRecord,
+    ResponseOptions,
     TranscriptRecord,
+    TranscriptResponseQuery,
     TranslatedTranscriptRecord,
-    TranslationQuery,
+    TranslationResponseQuery,
     TranscriptQuery,
+    TranscriptWebhookEvent,
     FileUploadRequest,
     FileUpdateRequest,
 )
 
-from .api.transcribe import get_transcription, create_transcript, PostTranscriptRequest
+from .api.transcribe import (
+    ASSEMBLY_AI_WEBHOOK_SECRET,
+    ASSEMBLY_AI_WEBHOOK_URL,
+    get_transcription,
+    create_transcript,
+    PostTranscriptRequest,
+    BulkTranscriptRequest,
+)
+from .responses import record_response
+from .cache.transcript_cache import transcript_cache
+from .cache.translation_cache import translation_cache
+from .cache.translation_memory import translation_memory
+from .cache.artifact_store import artifact_store
+from .glossary.service import glossary_service
+from .jobs.queue import job_queue
+from .jobs.worker import worker_pool
+from .jobs.pending_translations import save_pending_translation
+from .jobs.audio_ingest import audio_index, audio_folder_watcher, submit_audio
+from .api.http_client import (
+    start_http_client,
+    close_http_client,
+    get_http_client_stats,
+)
+from .api.outbound import get_outbound_stats
+from .telemetry.metrics import render_metrics
+from .telemetry.tracing import get_recent_traces, get_trace
 from .api.google_drive import (
     upload_to_google_drive,
     get_file_info,
+    get_files_info,
     update_file_google_drive,
 )
 
-app = FastAPI()
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    await start_http_client()
+    llm_clients.start_warm_up()
+    await worker_pool.start()
+    await audio_folder_watcher.start()
+    yield
+    await audio_folder_watcher.stop()
+    await worker_pool.stop()
+    await llm_clients.close()
+    await close_http_client()
+
+
+app = FastAPI(lifespan=lifespan)
 router = APIRouter(redirect_slashes=False)
 
 
+def check_job_capacity() -> None:
+    """
+    Rejects new jobs with 429 and a Retry-After estimate while the queue is full.
+    """
+    if job_queue.depth() >= job_queue.max_queued:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many translation jobs queued, please try again later.",
+            headers={"Retry-After": str(job_queue.retry_after(worker_pool.workers))},
+        )
+
+
 @router.post("/transcribe")
 async def transcribe(request_body: PostTranscriptRequest):
     """
     Post a new transcript and return the transcript ID.
     """
     transcript_id = await create_transcript(params=request_body)
+    if request_body.translation:
+        if not ASSEMBLY_AI_WEBHOOK_URL:
+            print("ASSEMBLYAI_WEBHOOK_URL is not set, the translation will not start automatically")
+        await asyncio.to_thread(
+            save_pending_translation, transcript_id, request_body.translation
+        )
     return {"transcript_id": transcript_id}
 
 
-@router.get("/transcript")
-async def transcript(query: Annotated[TranscriptQuery, Query()]) -> TranscriptRecord:
+@router.post("/transcribe/bulk")
+async def transcribe_bulk(request_body: BulkTranscriptRequest) -> list[BulkTranscriptResult]:
+    """
+    Post many audio files for transcription, skipping files that were submitted
+    before, and return the transcript ID of each.
+
+    Params: items: audio files, deduplicated by md5_checksum if given, else by audio_url
+    """
+    if any(item.translation for item in request_body.items) and not ASSEMBLY_AI_WEBHOOK_URL:
+        print("ASSEMBLYAI_WEBHOOK_URL is not set, the translation will not start automatically")
+    return await submit_audio(request_body.items)
+
+
+@router.get("/transcribe/ingested")
+async def ingested_audio() -> list[IngestedAudio]:
+    """
+    Get the audio files submitted in bulk or by the Drive folder watcher, with their
+    transcript IDs.
+    """
+    return await asyncio.to_thread(audio_index.list)
+
+
+@router.post("/transcribe/watch")
+async def watch_audio_folder() -> list[BulkTranscriptResult]:
+    """
+    Poll the Drive audio folder now and submit new audio files for transcription.
+    """
+    if not audio_folder_watcher.folder_id:
+        raise HTTPException(status_code=400, detail="GOOGLE_DRIVE_AUDIO_FOLDER_ID is not set.")
+    return await audio_folder_watcher.poll()
+
+
+@router.get("/transcribe/watch")
+def audio_folder_watcher_stats():
+    """
+    Get the status of the Drive audio folder watcher.
+    """
+    return audio_folder_watcher.stats()
+
+
+@router.post("/webhooks/assemblyai")
+async def assemblyai_webhook(
+    event: TranscriptWebhookEvent,
+    x_webhook_secret: Annotated[str | None, Header()] = None,
+):
+    """
+    Receive AssemblyAI transcript status updates and start pending translations.
+    """
+    if not ASSEMBLY_AI_WEBHOOK_SECRET or not hmac.compare_digest(
+        x_webhook_secret or "", ASSEMBLY_AI_WEBHOOK_SECRET
+    ):
+        raise HTTPException(status_code=403, detail="Invalid webhook secret.")
+
+    job = await handle_transcript_webhook(event)
+    return {"job_id": job.job_id if job else None}
+
+
+@router.get("/transcript", response_model=TranscriptRecord)
+async def transcript(
+    request: Request, query: Annotated[TranscriptResponseQuery, Query()]
+) -> Response:
     """
     Take a transcript ID and return the transcript, sentences, and SRT file.
+
+    Params: fields: comma-separated fields to return
+            from_ms, to_ms: only return sentences and SRT cues in this time range
     """
     transcript_details = await get_transcription(query)
-    return transcript_details
+    return await asyncio.to_thread(record_response, request, transcript_details, query)
 
 
-@router.get("/translate")
-def translate(
-    query: Annotated[TranslationQuery, Query()]
-) -> TranslatedTranscriptRecord:
+@router.get("/translate", response_model=TranslatedTranscriptRecord)
+async def translate(
+    request: Request, query: Annotated[TranslationResponseQuery, Query()]
+) -> Response:
     """
     Take a transcript ID and return the translated transcript, sentences, and SRT file.
+
+    Params: fields: comma-separated fields to return
+            from_ms, to_ms: only return sentences and SRT cues in this time range
     """
     translator = get_translator(
         ai_model=AIModelName(query.ai_model) if query.ai_model else None
     )
-    translated_transcript = translator.translate(query)
-    return translated_transcript
+    translated_transcript = await translator.translate(query)
+    return await asyncio.to_thread(record_response, request, translated_transcript, query)
 
 
 @router.post("/v2/translate")
-def create_translation(
-    body: CreateTranslationRequest, background_tasks: BackgroundTasks
-) -> CreateTranslationResponse:
+def create_translation(body: CreateTranslationRequest) -> CreateTranslationResponse:
     """
     Initiate a translation job for a transcript and create a temporary SRT file resource on Goggle Drive.
 
@@ -73,15 +214,12 @@ def create_translation(
     Returns: File ID of the SRT file.
     """
 
+    check_job_capacity()
+
     transcript_id = body.transcript_id
     srt_file_name = body.srt_file_name
 
-    file_upload_request = FileUploadRequest(
-        file_name=srt_file_name,
-        properties={"transcript_id": transcript_id},
-    )
-    upload_response = upload_to_google_drive(params=file_upload_request)
-    srt_file_id = upload_response["file_id"]
+    srt_file_id = create_srt_placeholder(transcript_id, srt_file_name)
 
     translation_request = CreateTranslationRequest(
         transcript_id=transcript_id,
@@ -90,29 +228,148 @@ def create_translation(
         split_sentences_at=body.split_sentences_at,
         ai_model=body.ai_model,
         glossary_file_id=body.glossary_file_id,
+        incremental=body.incremental,
     )
 
+    job = enqueue_translation_task(translation_request)
+
     create_translation_response = CreateTranslationResponse(
-        srt_file_id=srt_file_id, status="processing"
+        srt_file_id=srt_file_id, status="processing", job_id=job.job_id
     )
 
-    background_tasks.add_task(create_translation_task_sync, translation_request)
-
     return create_translation_response
 
 
-@router.get("/v2/translate")
+@router.post("/v2/translate/batch")
+async def create_batch_translation_endpoint(
+    body: CreateBatchTranslationRequest,
+) -> BatchTranslationRecord:
+    """
+    Initiate translation jobs for many transcripts with shared options.
+
+    Params: transcript_ids: AssemblyAI transcript ids, duplicates are translated once
+            srt_file_names: optional SRT file name per transcript id
+    Returns: The batch status, with the SRT file ID and job ID of each transcript.
+    """
+    transcript_count = len(set(body.transcript_ids))
+    if job_queue.depth() + transcript_count > job_queue.max_queued:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many translation jobs queued for this batch, please try again later.",
+            headers={"Retry-After": str(job_queue.retry_after(worker_pool.workers))},
+        )
+    return await create_batch_translation(body)
+
+
+@router.get("/v2/translate/batch/{batch_id}")
+def batch_translation_status(batch_id: str) -> BatchTranslationRecord:
+    """
+    Get the aggregate progress of a batch translation.
+    """
+    batch = get_batch_translation(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Batch not found.")
+    return batch
+
+
+@router.get("/jobs/{job_id}")
+def job_status(job_id: str) -> JobRecord:
+    """
+    Get the status of a job by job ID or by the SRT file ID it writes to.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job
+
+
+@router.get("/jobs")
+def jobs_stats():
+    """
+    Get queue depth per job status and worker pool usage.
+    """
+    return {"queue": job_queue.stats(), "workers": worker_pool.stats()}
+
+
+@router.get("/v2/translate", response_model=TranslatedTranscriptRecord)
 async def get_translation_details(
-    transcript_id: str, split_sentences_at: int | None = None
-) -> TranslatedTranscriptRecord:
+    request: Request,
+    transcript_id: str,
+    split_sentences_at: int | None = None,
+    fields: str | None = None,
+    from_ms: int | None = None,
+    to_ms: int | None = None,
+) -> Response:
     """
     Take a transcript ID and return the translated transcript, sentences, and SRT file.
+
+    Params: fields: comma-separated fields to return
+            from_ms, to_ms: only return sentences and SRT cues in this time range
     """
-    gemini_ai = GeminiTranslator(ai_model=AIModelName.GEMINI)
-    translated_transcript = await gemini_ai.translate_v2(
+    translator = get_translator(ai_model=AIModelName.GEMINI)
+    translated_transcript = await translator.translate_v2(
         transcript_id=transcript_id, split_sentences_at=split_sentences_at
     )
-    return translated_transcript
+    return await asyncio.to_thread(
+        record_response,
+        request,
+        translated_transcript,
+        ResponseOptions(fields=fields, from_ms=from_ms, to_ms=to_ms),
+    )
+
+
+@router.get("/v2/translate/stream")
+async def stream_translation(
+    transcript_id: str,
+    split_sentences_at: int | None = None,
+    ai_model: AIModelName | None = None,
+    glossary_file_id: str | None = None,
+    format: Literal["srt", "jsonl"] = "srt",
+) -> StreamingResponse:
+    """
+    Stream translated subtitles in timestamp order as each sentence chunk completes.
+
+    Params: format: "srt" streams numbered SRT cues as text/plain,
+            "jsonl" streams one SubtitleRecord JSON object per line.
+    """
+    transcript_record = await get_transcription(
+        TranscriptQuery(
+            transcript_id=transcript_id,
+            include_transcript=True,
+            include_sentences=True,
+        )
+    )
+    if transcript_record.status and transcript_record.status != "completed":
+        raise HTTPException(
+            status_code=400,
+            detail="Transcript not available, please try again later.",
+        )
+    if not transcript_record.sentences:
+        raise HTTPException(
+            status_code=400,
+            detail="Transcript does not contain sentence information.",
+        )
+
+    glossary = None
+    if glossary_file_id:
+        glossary = await asyncio.to_thread(glossary_service.get, glossary_file_id)
+
+    translator = get_translator(ai_model=ai_model or AIModelName.GEMINI)
+
+    if format == "jsonl":
+
+        async def stream_jsonl():
+            async for sentences in translator.translate_stream(
+                transcript_record, split_sentences_at, glossary
+            ):
+                yield "".join(sentence.model_dump_json() + "\n" for sentence in sentences)
+
+        return StreamingResponse(stream_jsonl(), media_type="application/x-ndjson")
+
+    return StreamingResponse(
+        translator.translate_stream_srt(transcript_record, split_sentences_at, glossary),
+        media_type="text/plain; charset=utf-8",
+    )
 
 
 @router.post("/drive/upload")
@@ -142,6 +399,81 @@ def info(file_id: str):
     return info_response
 
 
+@router.get("/drive/info/batch")
+def info_batch(file_ids: Annotated[list[str], Query()]):
+    """
+    Get file info of several files with batched Drive requests.
+    """
+    return get_files_info(file_ids=file_ids)
+
+
+@router.get("/http/stats")
+def http_stats():
+    """
+    Get connection pool statistics of the shared outbound HTTP client.
+    """
+    return get_http_client_stats()
+
+
+@router.get("/llm/stats")
+def llm_client_stats():
+    """
+    Get creation counters, warm-up results and connection pool usage of the shared LLM clients.
+    """
+    return llm_clients.stats()
+
+
+@router.get("/outbound/stats")
+def outbound_stats():
+    """
+    Get throttling, retry and circuit breaker state of each outbound provider.
+    """
+    return get_outbound_stats()
+
+
+@router.get("/cache/stats")
+def cache_stats():
+    """
+    Get hit, miss and eviction counters of the service caches.
+    """
+    return {
+        "transcripts": transcript_cache.stats(),
+        "translations": translation_cache.stats(),
+        "glossaries": glossary_service.stats(),
+        "translation_memory": translation_memory.stats(),
+        "artifacts": artifact_store.stats(),
+    }
+
+
+@router.get("/metrics")
+def metrics() -> PlainTextResponse:
+    """
+    Get latency histograms and token counters in the Prometheus text format.
+    """
+    return PlainTextResponse(
+        render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@router.get("/traces")
+def recent_traces(limit: int = 20):
+    """
+    Get the most recently finished root spans, e.g. translation jobs.
+    """
+    return get_recent_traces(limit=limit)
+
+
+@router.get("/traces/{trace_id}")
+def trace_spans(trace_id: str):
+    """
+    Get the spans of a trace. Spans of a translation job are traced under its job ID.
+    """
+    spans = get_trace(trace_id)
+    if not spans:
+        raise HTTPException(status_code=404, detail="Trace not found.")
+    return spans
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -0,0 +1,170 @@
+"""
+This module provides labelled counters and histograms rendered in the Prometheus
+text exposition format for GET /metrics.
+
+Recording is a dict lookup and a few additions under a lock, so it is cheap enough
+to leave on for every outbound call.
+"""
+
+import bisect
+import threading
+
+# Seconds, from a cached AssemblyAI read to a multi-minute full-transcript LLM call
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+# Job wait and run times span seconds to hours
+JOB_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600, 7200, 14400)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self._values)
+        for key, value in values.items():
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # Per label set: non-cumulative bucket counts (last is +Inf), sum and count
+        self._values: dict[tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            values = {key: (list(counts), total, count) for key, (counts, total, count) in self._values.items()}
+        for key, (counts, total, count) in values.items():
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket_count
+                le = f'le="{bound}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}"
+                )
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+
+assemblyai_request_seconds = Histogram(
+    "assemblyai_request_seconds",
+    "Latency of AssemblyAI transcript requests, including retries.",
+    labels=("resource",),
+)
+llm_request_seconds = Histogram(
+    "llm_request_seconds",
+    "Latency of LLM calls, including throttling and retries.",
+    labels=("model", "outcome"),
+)
+llm_input_tokens_total = Counter(
+    "llm_input_tokens_total", "Prompt tokens sent to LLMs.", labels=("model",)
+)
+llm_output_tokens_total = Counter(
+    "llm_output_tokens_total", "Completion tokens received from LLMs.", labels=("model",)
+)
+llm_hedged_calls_total = Counter(
+    "llm_hedged_calls_total",
+    "Calls of the hedging translator by outcome: primary, hedge_primary,"
+    " hedge_secondary, hedge_failed or failover.",
+    labels=("primary", "secondary", "outcome"),
+)
+llm_hedge_overhead_tokens_total = Counter(
+    "llm_hedge_overhead_tokens_total",
+    "Estimated prompt tokens sent in duplicate by hedge requests.",
+    labels=("model",),
+)
+drive_request_seconds = Histogram(
+    "drive_request_seconds",
+    "Latency of Google Drive calls, including retries.",
+    labels=("operation",),
+)
+translation_memory_sentences_total = Counter(
+    "translation_memory_sentences_total",
+    "Sentences looked up in the translation memory.",
+    labels=("model", "outcome"),
+)
+audio_ingest_files_total = Counter(
+    "audio_ingest_files_total",
+    "Audio files submitted for transcription in bulk or by the Drive folder watcher,"
+    " by outcome: submitted, duplicate or failed.",
+    labels=("source", "outcome"),
+)
+job_queue_wait_seconds = Histogram(
+    "job_queue_wait_seconds",
+    "Time jobs spent queued before a worker claimed them.",
+    labels=("kind",),
+    buckets=JOB_BUCKETS,
+)
+job_duration_seconds = Histogram(
+    "job_duration_seconds",
+    "End-to-end time from enqueueing a job to its completion or failure.",
+    labels=("kind", "status"),
+    buckets=JOB_BUCKETS,
+)
+
+METRICS = (
+    assemblyai_request_seconds,
+    llm_request_seconds,
+    llm_input_tokens_total,
+    llm_output_tokens_total,
+    llm_hedged_calls_total,
+    llm_hedge_overhead_tokens_total,
+    drive_request_seconds,
+    translation_memory_sentences_total,
+    audio_ingest_files_total,
+    job_queue_wait_seconds,
+    job_duration_seconds,
+)
+
+
+def render_metrics() -> str:
+    lines: list[str] = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,136 @@
+"""
+This module provides lightweight span tracing correlated by job id.
+
+Spans nest through context variables, which asyncio tasks and `asyncio.to_thread`
+inherit, so a span opened in a worker thread or a gathered task has the right
+parent. Finished spans are kept in a bounded in-memory buffer for GET /traces and,
+if TRACE_LOG is set, printed as JSON lines.
+"""
+
+import os
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from .metrics import Histogram
+
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", "5000"))
+TRACE_LOG = os.getenv("TRACE_LOG", "").lower() in ("1", "true", "yes")
+
+_trace_id: ContextVar[str | None] = ContextVar("trace_id", default=None)
+_current_span: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+
+_finished: deque = deque(maxlen=TRACE_BUFFER_SIZE)
+_finished_lock = threading.Lock()
+
+
+class Span:
+    __slots__ = (
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "name",
+        "attributes",
+        "started_at",
+        "duration",
+        "error",
+        "_start",
+    )
+
+    def __init__(self, name: str, trace_id: str, parent_id: str | None, attributes: dict):
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.started_at = time.time()
+        self.duration = 0.0
+        self.error: str | None = None
+        self._start = time.perf_counter()
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+@contextmanager
+def trace(trace_id: str) -> Iterator[None]:
+    """
+    Correlates every span opened inside the block under `trace_id`, e.g. a job id.
+    """
+    token = _trace_id.set(trace_id)
+    parent_token = _current_span.set(None)
+    try:
+        yield
+    finally:
+        _current_span.reset(parent_token)
+        _trace_id.reset(token)
+
+
+@contextmanager
+def span(name: str, histogram: Histogram | None = None, **attributes) -> Iterator[Span]:
+    """
+    Times the block as a span. If `histogram` is given, the duration is also observed
+    with the histogram's labels taken from `attributes`.
+    """
+    parent = _current_span.get()
+    trace_id = parent.trace_id if parent else _trace_id.get() or uuid.uuid4().hex[:16]
+    current = Span(name, trace_id, parent.span_id if parent else None, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as error:
+        current.error = f"{type(error).__name__}: {error}"
+        raise
+    finally:
+        _current_span.reset(token)
+        current.duration = time.perf_counter() - current._start
+        if histogram is not None:
+            labels = {name: current.attributes.get(name, "") for name in histogram.labels}
+            histogram.observe(current.duration, **labels)
+        _record(current)
+
+
+def _record(finished: Span) -> None:
+    with _finished_lock:
+        _finished.append(finished)
+    if TRACE_LOG:
+        print(json.dumps(finished.to_dict(), ensure_ascii=False, default=str))
+
+
+def get_trace(trace_id: str) -> list[dict]:
+    """
+    Returns the buffered spans of a trace in start order.
+    """
+    with _finished_lock:
+        spans = [item for item in _finished if item.trace_id == trace_id]
+    return [item.to_dict() for item in sorted(spans, key=lambda item: item.started_at)]
+
+
+def get_recent_traces(limit: int = 20) -> list[dict]:
+    """
+    Summarizes the most recently finished root spans.
+    """
+    with _finished_lock:
+        roots = [item for item in _finished if item.parent_id is None]
+    return [item.to_dict() for item in roots[-limit:][::-1]]
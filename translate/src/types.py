@@ -1,5 +1,5 @@
 from typing import Literal, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from enum import Enum
 
 
@@ -43,6 +43,22 @@ class TranslationQuery(TranscriptQuery):
         return TranscriptQuery(**transcript_query)
 
 
+class ResponseOptions(BaseModel):
+    # Comma-separated top-level fields to return, e.g. "status,srt"
+    fields: Optional[str] = None
+    # Only return sentences and SRT cues overlapping [from_ms, to_ms)
+    from_ms: Optional[int] = None
+    to_ms: Optional[int] = None
+
+
+class TranscriptResponseQuery(TranscriptQuery, ResponseOptions):
+    pass
+
+
+class TranslationResponseQuery(TranslationQuery, ResponseOptions):
+    pass
+
+
 class FileUploadRequest(BaseModel):
     file_name: str
     text: str | None = None
@@ -64,8 +80,85 @@ class CreateTranslationRequest(BaseModel):
     glossary_file_id: str | None = None
     split_sentences_at: int | None = None
     ai_model: AIModelName | None = None
+    # Re-translate only sentences affected by glossary changes since the stored translation
+    incremental: bool = False
+
+
+class TranscriptTranslationOptions(BaseModel):
+    srt_file_name: str
+    glossary_file_id: str | None = None
+    split_sentences_at: int | None = None
+    ai_model: AIModelName | None = None
+
+
+class TranscriptWebhookEvent(BaseModel):
+    transcript_id: str
+    status: Literal["queued", "processing", "completed", "error"]
 
 
 class CreateTranslationResponse(BaseModel):
     srt_file_id: str
     status: Literal["processing", "completed", "error"]
+    job_id: str | None = None
+
+
+class JobRecord(BaseModel):
+    job_id: str
+    kind: str
+    provider: str | None = None
+    status: Literal["queued", "running", "completed", "error"]
+    srt_file_id: str | None = None
+    attempts: int = 0
+    error: str | None = None
+    created_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    batch_id: str | None = None
+
+
+class CreateBatchTranslationRequest(BaseModel):
+    transcript_ids: list[str] = Field(min_length=1)
+    glossary_file_id: str | None = None
+    split_sentences_at: int | None = None
+    ai_model: AIModelName | None = None
+    incremental: bool = False
+    # SRT file names by transcript id; defaults to "<transcript_id>.srt"
+    srt_file_names: dict[str, str] | None = None
+
+
+class BatchTranslationItem(BaseModel):
+    transcript_id: str
+    status: Literal["queued", "running", "completed", "error"]
+    job_id: str | None = None
+    srt_file_id: str | None = None
+    error: str | None = None
+
+
+class BatchTranslationRecord(BaseModel):
+    batch_id: str
+    status: Literal["processing", "completed", "error"]
+    total: int
+    counts: dict[str, int]
+    items: list[BatchTranslationItem]
+
+
+class IngestedAudio(BaseModel):
+    """
+    An audio file in the ingestion index, keyed by its Drive md5Checksum or its URL.
+    """
+    key: str
+    source: Literal["bulk", "drive"]
+    audio_url: str
+    status: Literal["submitting", "submitted"]
+    name: str | None = None
+    drive_file_id: str | None = None
+    transcript_id: str | None = None
+    submitted_at: float
+
+
+class BulkTranscriptResult(BaseModel):
+    audio_url: str
+    status: Literal["submitted", "duplicate", "failed"]
+    transcript_id: str | None = None
+    drive_file_id: str | None = None
+    error: str | None = None
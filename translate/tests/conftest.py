@@ -0,0 +1,11 @@
+"""
+The service reads its configuration at import time, so the data directory is
+pointed at a scratch directory before anything from `src` is imported.
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="translate-tests-")
@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+from benchmarks.fakes import FakeAssemblyAI, FakeProfile
+from src.api import transcribe
+from src.api.http_client import run_with_http_client
+from src.jobs import audio_ingest
+from src.jobs.audio_ingest import AudioFolderWatcher, AudioIndex
+
+
+@pytest.fixture
+def drive(monkeypatch, tmp_path):
+    """
+    A fake Drive folder and AssemblyAI, with a fresh index per test.
+    """
+    monkeypatch.setattr(audio_ingest, "audio_index", AudioIndex(str(tmp_path / "ingest.sqlite3")))
+    folder = {"files": [], "submitted": [], "failing": set()}
+
+    def list_audio_files(folder_id):
+        return list(folder["files"])
+
+    async def upload_audio(open_chunks):
+        chunks = [chunk async for chunk in open_chunks()]
+        file_id = chunks[0].decode("utf-8")
+        if file_id in folder["failing"]:
+            raise RuntimeError("AssemblyAI is unavailable")
+        return f"https://cdn.assemblyai/{file_id}"
+
+    async def create_transcript(params):
+        folder["submitted"].append(params.audio_url)
+        return f"transcript-{params.audio_url}"
+
+    def iter_file_chunks(file_id):
+        yield file_id.encode("utf-8")
+
+    monkeypatch.setattr(audio_ingest, "list_audio_files", list_audio_files)
+    monkeypatch.setattr(audio_ingest, "upload_audio", upload_audio)
+    monkeypatch.setattr(audio_ingest, "create_transcript", create_transcript)
+    monkeypatch.setattr(audio_ingest, "iter_file_chunks", iter_file_chunks)
+    return folder
+
+
+def _file(index: int, checksum: str | None = None) -> dict:
+    return {
+        "id": f"file-{index}",
+        "name": f"recording-{index}.mp3",
+        "md5Checksum": checksum or f"md5-{index}",
+        "webViewLink": f"https://drive/{index}",
+    }
+
+
+def test_first_poll_does_not_submit_existing_files(drive, monkeypatch):
+    monkeypatch.setattr(audio_ingest, "AUDIO_WATCH_BACKFILL", False)
+    drive["files"] = [_file(0), _file(1)]
+    watcher = AudioFolderWatcher("folder", interval=0)
+
+    assert asyncio.run(watcher.poll()) == []
+    assert drive["submitted"] == []
+
+    drive["files"].append(_file(2))
+    results = asyncio.run(watcher.poll())
+    assert [result.drive_file_id for result in results] == ["file-2"]
+
+
+def test_file_moved_into_the_folder_is_submitted(drive, monkeypatch):
+    monkeypatch.setattr(audio_ingest, "AUDIO_WATCH_BACKFILL", False)
+    drive["files"] = [_file(1)]
+    watcher = AudioFolderWatcher("folder", interval=0)
+    asyncio.run(watcher.poll())
+
+    # Listed first, as its modification time predates every file already there
+    drive["files"].insert(0, _file(0))
+    results = asyncio.run(watcher.poll())
+    assert [result.status for result in results] == ["submitted"]
+    assert drive["submitted"] == ["https://cdn.assemblyai/file-0"]
+
+
+def test_backfill_submits_each_checksum_once(drive, monkeypatch):
+    monkeypatch.setattr(audio_ingest, "AUDIO_WATCH_BACKFILL", True)
+    drive["files"] = [_file(0), _file(1), _file(2, checksum="md5-0")]
+    watcher = AudioFolderWatcher("folder", interval=0)
+
+    results = asyncio.run(watcher.poll())
+
+    assert [result.status for result in results] == ["submitted", "submitted", "duplicate"]
+    assert drive["submitted"] == [
+        "https://cdn.assemblyai/file-0", "https://cdn.assemblyai/file-1"
+    ]
+    assert asyncio.run(watcher.poll()) == []
+
+
+def test_failed_files_are_submitted_again_by_the_next_poll(drive, monkeypatch):
+    monkeypatch.setattr(audio_ingest, "AUDIO_WATCH_BACKFILL", True)
+    drive["files"] = [_file(0), _file(1), _file(2), _file(3)]
+    drive["failing"] = {"file-1", "file-3"}
+    watcher = AudioFolderWatcher("folder", interval=0)
+
+    results = asyncio.run(watcher.poll())
+    assert [result.status for result in results] == [
+        "submitted", "failed", "submitted", "failed"
+    ]
+    assert results[1].audio_url == "https://drive/1"
+
+    # Once reachable, both files are submitted on the next poll
+    drive["failing"] = set()
+    results = asyncio.run(watcher.poll())
+    assert [result.drive_file_id for result in results] == ["file-1", "file-3"]
+    assert [result.status for result in results] == ["submitted", "submitted"]
+    assert asyncio.run(watcher.poll()) == []
+
+
+def test_drive_audio_is_streamed_to_the_upload_endpoint(monkeypatch):
+    def iter_file_chunks(file_id):
+        yield from (b"ID3", b"audio-", file_id.encode("utf-8"))
+
+    monkeypatch.setattr(audio_ingest, "iter_file_chunks", iter_file_chunks)
+
+    async def run():
+        assemblyai = FakeAssemblyAI(FakeProfile(latency=0, jitter=0))
+        monkeypatch.setattr(transcribe, "ASSEMBLY_AI_BASE_URL", await assemblyai.start())
+        try:
+            upload_url = await transcribe.upload_audio(
+                lambda: audio_ingest._drive_chunks("file-0")
+            )
+        finally:
+            await assemblyai.stop()
+        return upload_url, assemblyai.uploads
+
+    upload_url, uploads = run_with_http_client(run())
+    assert list(uploads.values()) == [b"ID3audio-file-0"]
+    assert upload_url.endswith(next(iter(uploads)))
@@ -0,0 +1,9 @@
+from fastapi.testclient import TestClient
+
+from src.server import app
+
+
+def test_empty_batch_is_rejected():
+    client = TestClient(app)
+    response = client.post("/v2/translate/batch", json={"transcript_ids": []})
+    assert response.status_code == 422
@@ -0,0 +1,118 @@
+import asyncio
+
+from src.models.translator.chunking import (
+    SEGMENT_SEPARATOR,
+    ReferenceSlicer,
+    SentenceWindow,
+    _translate_window_checked,
+    build_windows,
+)
+
+
+def _window(count: int, offset: int = 0) -> SentenceWindow:
+    return SentenceWindow(offset=offset, texts=[f"s{offset + index}" for index in range(count)])
+
+
+def _translate(window: SentenceWindow, responses) -> tuple[list[str], list[list[str]]]:
+    """
+    Runs `_translate_window_checked` with a model that answers each window with
+    `responses(window, call)`, and returns the result and the windows it was sent.
+    """
+    calls: list[list[str]] = []
+
+    async def translate_window(window: SentenceWindow) -> list[str]:
+        calls.append(window.texts)
+        return responses(window, len(calls))
+
+    async def run():
+        return await _translate_window_checked(window, translate_window, asyncio.Semaphore(1))
+
+    return asyncio.run(run()), calls
+
+
+def _echo(window: SentenceWindow) -> list[str]:
+    return [f"t{text[1:]}" for text in window.texts]
+
+
+def test_matching_response_is_returned_as_is():
+    translated, calls = _translate(_window(3), lambda window, call: _echo(window))
+
+    assert translated == ["t0", "t1", "t2"]
+    assert len(calls) == 1
+
+
+def test_mismatched_response_is_retried():
+    def responses(window, call):
+        return _echo(window) + ["extra"] if call == 1 else _echo(window)
+
+    translated, calls = _translate(_window(3), responses)
+
+    assert translated == ["t0", "t1", "t2"]
+    assert len(calls) == 2
+
+
+def test_window_that_keeps_merging_sentences_is_split():
+    def responses(window, call):
+        # Windows of more than two sentences always come back one sentence short
+        return _echo(window)[:-1] if len(window.texts) > 2 else _echo(window)
+
+    translated, calls = _translate(_window(4), responses)
+
+    assert translated == ["t0", "t1", "t2", "t3"]
+    assert calls[-2:] == [["s0", "s1"], ["s2", "s3"]]
+
+
+def test_window_that_keeps_adding_sentences_is_split_down_to_single_sentences():
+    translated, _ = _translate(
+        _window(3, offset=5), lambda window, call: _echo(window) + ["extra"]
+    )
+
+    assert len(translated) == 3
+    assert translated == ["t5 extra", "t6 extra", "t7 extra"]
+
+
+def test_single_sentence_falls_back_to_joining_or_empty_text():
+    split, _ = _translate(_window(1), lambda window, call: ["first half", "second half"])
+    dropped, _ = _translate(_window(1), lambda window, call: [])
+
+    assert split == ["first half second half"]
+    assert dropped == [""]
+
+
+def _reference(texts: list[str], segment_max_tokens: int) -> str:
+    segments = build_windows(texts, max_tokens=segment_max_tokens, context_sentences=0)
+    return SEGMENT_SEPARATOR.join(
+        " ".join(text.upper() for text in segment.texts) for segment in segments
+    )
+
+
+def test_reference_is_cut_at_the_segments_overlapping_the_window():
+    texts = [f"sentence {index:03d}" for index in range(100)]
+    reference = _reference(texts, segment_max_tokens=20)
+    slicer = ReferenceSlicer(texts, reference, segment_max_tokens=20)
+
+    window_reference = slicer.slice(SentenceWindow(offset=40, texts=texts[40:45]))
+
+    assert "SENTENCE 040" in window_reference and "SENTENCE 044" in window_reference
+    assert "SENTENCE 030" not in window_reference
+    assert "SENTENCE 055" not in window_reference
+
+
+def test_reference_sent_grows_linearly_with_the_transcript():
+    def total_reference(sentences: int) -> int:
+        texts = [f"sentence {index:05d}" for index in range(sentences)]
+        slicer = ReferenceSlicer(texts, _reference(texts, segment_max_tokens=50), margin=50)
+        return sum(len(slicer.slice(window)) for window in build_windows(texts, max_tokens=50))
+
+    # Four times the sentences would send sixteen times the reference if it grew quadratically
+    assert total_reference(4000) < 5 * total_reference(1000)
+
+
+def test_unsegmented_reference_is_cut_by_position_with_a_fixed_margin():
+    texts = ["aaaa"] * 50
+    reference = "b" * 400
+    slicer = ReferenceSlicer(texts, reference, margin=10)
+
+    window_reference = slicer.slice(SentenceWindow(offset=20, texts=texts[20:25]))
+
+    assert window_reference == reference[160 - 10:200 + 10]
@@ -0,0 +1,49 @@
+import unicodedata
+
+from src.glossary.glossary import Glossary
+from src.glossary.matcher import TermMatcher
+
+
+def test_matches_must_start_at_a_word_boundary():
+    matcher = TermMatcher(["राम"])
+    assert matcher.find("श्री राम की कथा") == ["राम"]
+    assert matcher.find("आराम करो") == []
+
+
+def test_matches_may_end_inside_a_word():
+    # Inflected forms such as the oblique plural still match the stem
+    assert TermMatcher(["वस्तु"]).find("सब वस्तुओं का") == ["वस्तु"]
+
+
+def test_combining_marks_are_part_of_the_preceding_word():
+    # "ि" is a vowel sign, so "रा" inside "किराया" does not start a word
+    assert TermMatcher(["राया"]).find("किराया") == []
+
+
+def test_overlapping_and_nested_terms_are_all_found():
+    matcher = TermMatcher(["भगवान", "भगवान कृष्ण", "कृष्ण", "कृष्णा"])
+    # Terms may end inside a word, so the longer phrase matches "कृष्णा" as well
+    assert matcher.find("भगवान कृष्णा") == ["भगवान", "भगवान कृष्ण", "कृष्ण", "कृष्णा"]
+    assert matcher.find("भगवान का कृष्ण") == ["भगवान", "कृष्ण"]
+
+
+def test_terms_sharing_a_suffix_are_found_through_failure_links():
+    matcher = TermMatcher(["he", "she", "hers"])
+    assert matcher.find("she hers") == ["she", "he", "hers"]
+
+
+def test_matching_ignores_case_and_unicode_normalization():
+    decomposed = unicodedata.normalize("NFD", "क़िला")
+    assert TermMatcher(["क़िला", "Gita"]).find(f"{decomposed} and the GITA") == ["क़िला", "gita"]
+
+
+def test_each_term_is_reported_once():
+    assert TermMatcher(["ओम"]).find("ओम ओम ओम") == ["ओम"]
+
+
+def test_find_entries_returns_entries_in_match_order():
+    glossary = Glossary("file", "v1", "गीता,Gita\nअर्जुन,Arjuna\nकृष्ण,Krishna\n")
+    assert glossary.find_entries("कृष्ण ने अर्जुन से कहा") == [
+        ("कृष्ण", "Krishna"),
+        ("अर्जुन", "Arjuna"),
+    ]
@@ -0,0 +1,184 @@
+import types
+
+import pytest
+
+from src.jobs import queue as queue_module
+from src.jobs.queue import JobQueue, QueueFullError
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(queue_module, "time", types.SimpleNamespace(time=clock.time))
+    monkeypatch.setattr(queue_module, "JOB_LEASE_SECONDS", 60)
+    monkeypatch.setattr(queue_module, "JOB_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(queue_module, "JOB_RETRY_DELAY", 30)
+    monkeypatch.setattr(queue_module, "JOB_RETRY_MAX_DELAY", 600)
+    return clock
+
+
+@pytest.fixture
+def job_queue(tmp_path, clock):
+    return JobQueue(str(tmp_path / "jobs.sqlite3"), max_queued=10)
+
+
+def test_claims_jobs_in_order_and_counts_attempts(job_queue):
+    first = job_queue.enqueue("translate", {"n": 1})
+    job_queue.enqueue("translate", {"n": 2})
+
+    record, payload = job_queue.claim(set())
+
+    assert record.job_id == first.job_id
+    assert record.status == "running"
+    assert record.attempts == 1
+    assert payload == {"n": 1}
+    assert job_queue.depth() == 1
+
+
+def test_running_job_is_not_claimed_while_its_lease_holds(job_queue, clock):
+    job_queue.enqueue("translate", {})
+    job_queue.claim(set())
+
+    clock.now += 59
+    assert job_queue.claim(set()) is None
+
+
+def test_expired_lease_is_reclaimed_as_a_new_attempt(job_queue, clock):
+    job = job_queue.enqueue("translate", {})
+    job_queue.claim(set())
+
+    clock.now += 61
+    record, _ = job_queue.claim(set())
+
+    assert record.job_id == job.job_id
+    assert record.attempts == 2
+
+
+def test_renewed_lease_is_not_reclaimed(job_queue, clock):
+    job = job_queue.enqueue("translate", {})
+    job_queue.claim(set())
+
+    clock.now += 50
+    job_queue.renew_lease(job.job_id)
+    clock.now += 50
+    assert job_queue.claim(set()) is None
+
+
+def test_expired_lease_on_the_last_attempt_fails_the_job(job_queue, clock):
+    job = job_queue.enqueue("translate", {})
+    job_queue.claim(set())
+    clock.now += 61
+    job_queue.claim(set())
+
+    clock.now += 61
+    assert job_queue.claim(set()) is None
+    record = job_queue.get(job.job_id)
+    assert record.status == "error"
+    assert record.error == "Job lease expired"
+
+
+def test_failed_attempt_is_retried_then_fails(job_queue, clock):
+    job = job_queue.enqueue("translate", {})
+
+    job_queue.claim(set())
+    job_queue.fail(job.job_id, "first failure")
+    record = job_queue.get(job.job_id)
+    assert record.status == "queued"
+    assert record.finished_at is None
+
+    clock.now += 30
+    job_queue.claim(set())
+    job_queue.fail(job.job_id, "second failure")
+    record = job_queue.get(job.job_id)
+    assert record.status == "error"
+    assert record.attempts == 2
+    assert record.error == "second failure"
+    assert job_queue.claim(set()) is None
+
+
+def test_failed_attempt_backs_off_exponentially(job_queue, clock, monkeypatch):
+    monkeypatch.setattr(queue_module, "JOB_MAX_ATTEMPTS", 4)
+    job = job_queue.enqueue("translate", {})
+
+    job_queue.claim(set())
+    job_queue.fail(job.job_id, "first failure")
+    clock.now += 29
+    assert job_queue.claim(set()) is None
+    clock.now += 1
+    record, _ = job_queue.claim(set())
+    assert record.attempts == 2
+
+    job_queue.fail(job.job_id, "second failure")
+    clock.now += 59
+    assert job_queue.claim(set()) is None
+    clock.now += 1
+    assert job_queue.claim(set()) is not None
+
+
+def test_retry_delay_is_capped(job_queue, clock, monkeypatch):
+    monkeypatch.setattr(queue_module, "JOB_MAX_ATTEMPTS", 10)
+    monkeypatch.setattr(queue_module, "JOB_RETRY_MAX_DELAY", 45)
+    job = job_queue.enqueue("translate", {})
+
+    for _ in range(3):
+        job_queue.claim(set())
+        job_queue.fail(job.job_id, "failure")
+        clock.now += 45
+    record, _ = job_queue.claim(set())
+    assert record.attempts == 4
+
+
+def test_delayed_job_does_not_block_later_jobs(job_queue):
+    failed = job_queue.enqueue("translate", {"n": 1})
+    later = job_queue.enqueue("translate", {"n": 2})
+
+    job_queue.claim(set())
+    job_queue.fail(failed.job_id, "failure")
+
+    record, _ = job_queue.claim(set())
+    assert record.job_id == later.job_id
+
+
+def test_permanent_failure_is_not_retried(job_queue):
+    job = job_queue.enqueue("translate", {})
+
+    job_queue.claim(set())
+    job_queue.fail(job.job_id, "Transcript not found", permanent=True)
+
+    record = job_queue.get(job.job_id)
+    assert record.status == "error"
+    assert record.attempts == 1
+    assert record.finished_at is not None
+
+
+def test_released_job_does_not_use_up_an_attempt(job_queue):
+    job = job_queue.enqueue("translate", {})
+    job_queue.claim(set())
+    job_queue.release(job.job_id)
+
+    record, _ = job_queue.claim(set())
+    assert record.attempts == 1
+
+
+def test_busy_providers_are_skipped(job_queue):
+    job_queue.enqueue("translate", {}, provider="gemini")
+    openai_job = job_queue.enqueue("translate", {}, provider="openai")
+
+    record, _ = job_queue.claim({"gemini"})
+    assert record.job_id == openai_job.job_id
+    assert job_queue.claim({"gemini"}) is None
+
+
+def test_enqueue_many_is_all_or_nothing(job_queue):
+    job_queue.enqueue_many("translate", [({}, None, None)] * 8)
+    with pytest.raises(QueueFullError):
+        job_queue.enqueue_many("translate", [({}, None, None)] * 3)
+    assert job_queue.depth() == 8
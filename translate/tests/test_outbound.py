@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+
+from src.api.outbound import CircuitBreaker, CircuitOpenError, OutboundProvider
+
+
+def _open_breaker(provider: OutboundProvider) -> None:
+    provider.breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+    provider.breaker.record_failure()
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_half_open_allows_a_single_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+    breaker.record_failure()
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_cancelled_trial_releases_the_half_open_breaker():
+    provider = OutboundProvider("test", requests_per_minute=0, tokens_per_minute=0)
+    _open_breaker(provider)
+
+    async def scenario():
+        started = asyncio.Event()
+
+        async def slow_request():
+            started.set()
+            await asyncio.sleep(60)
+
+        trial = asyncio.create_task(provider.call(slow_request))
+        await started.wait()
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+        async def request():
+            return "ok"
+
+        return await provider.call(request)
+
+    assert asyncio.run(scenario()) == "ok"
+    assert provider.breaker.state == "closed"
+
+
+def test_cancelled_trial_keeps_the_failure_count():
+    provider = OutboundProvider("test", requests_per_minute=0, tokens_per_minute=0)
+    _open_breaker(provider)
+
+    async def scenario():
+        async def slow_request():
+            await asyncio.sleep(60)
+
+        trial = asyncio.create_task(provider.call(slow_request))
+        await asyncio.sleep(0)
+        trial.cancel()
+        await asyncio.gather(trial, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert provider.breaker.failures == 1
+    assert provider.breaker.state == "half-open"
+    assert not provider.breaker.trial_in_flight
+
+
+def test_open_circuit_rejects_without_calling():
+    provider = OutboundProvider("test", requests_per_minute=0, tokens_per_minute=0)
+    provider.breaker = CircuitBreaker(failure_threshold=1, reset_seconds=60)
+    provider.breaker.record_failure()
+    calls = []
+
+    with pytest.raises(CircuitOpenError):
+        provider.call_sync(lambda: calls.append(1))
+    assert calls == []
+
+
+class _Throttled(Exception):
+    status = 429
+
+
+def _flaky(failures: int, error: Exception):
+    calls = []
+
+    def request():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise error
+        return "ok"
+
+    return request, calls
+
+
+def test_retryable_errors_are_retried(monkeypatch):
+    monkeypatch.setattr("src.api.outbound.OUTBOUND_BASE_DELAY", 0)
+    provider = OutboundProvider("test", requests_per_minute=0, tokens_per_minute=0)
+    request, calls = _flaky(2, _Throttled())
+
+    assert provider.call_sync(request) == "ok"
+    assert len(calls) == 3
+    assert provider.metrics["retries"] == 2
+    assert provider.breaker.failures == 0
+
+
+def test_async_calls_share_the_retry_policy(monkeypatch):
+    monkeypatch.setattr("src.api.outbound.OUTBOUND_BASE_DELAY", 0)
+    provider = OutboundProvider("test", requests_per_minute=0, tokens_per_minute=0)
+    request, calls = _flaky(1, _Throttled())
+
+    async def attempt():
+        return request()
+
+    assert asyncio.run(provider.call(attempt)) == "ok"
+    assert len(calls) == 2
+
+
+def test_client_errors_are_not_retried():
+    provider = OutboundProvider("test", requests_per_minute=0, tokens_per_minute=0)
+    request, calls = _flaky(1, ValueError("bad request"))
+
+    with pytest.raises(ValueError):
+        provider.call_sync(request)
+    assert len(calls) == 1
+    assert provider.breaker.failures == 0
+
+
+def test_interrupted_sync_trial_releases_the_breaker():
+    provider = OutboundProvider("test", requests_per_minute=0, tokens_per_minute=0)
+    _open_breaker(provider)
+
+    def interrupted():
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        provider.call_sync(interrupted)
+    assert not provider.breaker.trial_in_flight
+    assert provider.call_sync(lambda: "ok") == "ok"
@@ -0,0 +1,115 @@
+import gzip
+import json
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from src import responses
+from src.responses import json_response, shape_record
+from src.types import ResponseOptions, SubtitleRecord, TranscriptRecord
+
+CONTENT = {"transcript": "नमस्ते " * 500}
+
+
+def _request(**headers) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/transcript",
+            "headers": [
+                (name.replace("_", "-").encode(), value.encode())
+                for name, value in headers.items()
+            ],
+        }
+    )
+
+
+def _record() -> TranscriptRecord:
+    return TranscriptRecord(
+        transcript="एक दो तीन",
+        sentences=[
+            SubtitleRecord(text="एक", start=0, end=1000, length=2),
+            SubtitleRecord(text="दो", start=1000, end=2000, length=2),
+            SubtitleRecord(text="तीन", start=2000, end=3000, length=3),
+        ],
+    )
+
+
+def test_etag_is_stable_and_changes_with_the_body():
+    first = json_response(_request(), CONTENT)
+    again = json_response(_request(), CONTENT)
+    changed = json_response(_request(), {"transcript": "other"})
+
+    assert first.headers["etag"] == again.headers["etag"]
+    assert first.headers["etag"] != changed.headers["etag"]
+    assert json.loads(first.body) == CONTENT
+
+
+def test_matching_if_none_match_returns_304_without_a_body():
+    etag = json_response(_request(), CONTENT).headers["etag"]
+
+    response = json_response(_request(if_none_match=etag), CONTENT)
+
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == etag
+
+
+def test_stale_if_none_match_returns_the_body():
+    response = json_response(_request(if_none_match='"stale"'), CONTENT)
+    assert response.status_code == 200
+
+
+def test_etag_of_another_encoding_of_the_same_body_matches():
+    gzip_etag = json_response(_request(accept_encoding="gzip"), CONTENT).headers["etag"]
+    assert gzip_etag.endswith('-gzip"')
+
+    response = json_response(_request(if_none_match=f"W/{gzip_etag}"), CONTENT)
+    assert response.status_code == 304
+
+
+def test_gzip_is_used_when_accepted(monkeypatch):
+    monkeypatch.setattr(responses, "brotli", None)
+
+    response = json_response(_request(accept_encoding="gzip, deflate"), CONTENT)
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert json.loads(gzip.decompress(response.body)) == CONTENT
+
+
+def test_encoding_refused_with_zero_quality_is_not_used(monkeypatch):
+    monkeypatch.setattr(responses, "brotli", None)
+
+    response = json_response(_request(accept_encoding="gzip;q=0, identity"), CONTENT)
+
+    assert "content-encoding" not in response.headers
+    assert json.loads(response.body) == CONTENT
+
+
+def test_brotli_is_preferred_when_available():
+    if responses.brotli is None:
+        pytest.skip("brotli is not installed")
+    response = json_response(_request(accept_encoding="gzip, br"), CONTENT)
+    assert response.headers["content-encoding"] == "br"
+
+
+def test_small_bodies_are_not_compressed():
+    response = json_response(_request(accept_encoding="gzip"), {"transcript": "छोटा"})
+    assert "content-encoding" not in response.headers
+
+
+def test_fields_projection_and_unknown_fields():
+    assert shape_record(_record(), ResponseOptions(fields="transcript")) == {
+        "transcript": "एक दो तीन"
+    }
+    with pytest.raises(HTTPException) as error:
+        shape_record(_record(), ResponseOptions(fields="transcript,missing"))
+    assert error.value.status_code == 400
+
+
+def test_time_window_keeps_overlapping_sentences():
+    shaped = shape_record(_record(), ResponseOptions(from_ms=1500, to_ms=2500))
+    assert [sentence["text"] for sentence in shaped["sentences"]] == ["दो", "तीन"]
@@ -0,0 +1,33 @@
+import os
+
+from src.cache.sqlite_store import SQLiteStore
+
+
+def test_evicts_least_recently_accessed_entries(tmp_path):
+    store = SQLiteStore(os.path.join(tmp_path, "store.sqlite3"), max_bytes=100)
+    store.set_many([(f"key-{index}", b"x" * 10) for index in range(10)])
+    assert store.stats()["bytes"] == 100
+
+    store.set("key-10", b"x" * 10)
+
+    stats = store.stats()
+    assert stats["bytes"] <= 90
+    assert store.get("key-0") is None
+    assert store.get("key-10") == b"x" * 10
+
+
+def test_replacing_entries_does_not_evict(tmp_path):
+    store = SQLiteStore(os.path.join(tmp_path, "store.sqlite3"), max_bytes=100)
+    store.set_many([(f"key-{index}", b"x" * 10) for index in range(9)])
+    for _ in range(20):
+        store.set("key-0", b"y" * 10)
+
+    assert store.stats()["entries"] == 9
+    assert store.evictions == 0
+
+
+def test_add_only_stores_new_keys(tmp_path):
+    store = SQLiteStore(os.path.join(tmp_path, "store.sqlite3"))
+    assert store.add("key", b"first")
+    assert not store.add("key", b"second")
+    assert store.get("key") == b"first"
@@ -0,0 +1,92 @@
+import pytest
+
+from benchmarks.fakes import FakeAssemblyAI, FakeProfile
+from src.api import transcribe
+from src.api.http_client import run_with_http_client
+from src.jobs.pending_translations import get_pending_translation, save_pending_translation
+from src.models.translator import helpers
+from src.types import TranscriptTranslationOptions, TranscriptWebhookEvent
+
+
+@pytest.fixture
+def webhook(monkeypatch):
+    """
+    Runs the webhook handler against the local fake AssemblyAI server, recording the
+    SRT placeholders and jobs it creates.
+    """
+    calls = {"placeholders": [], "jobs": [], "failing": set()}
+
+    def create_srt_placeholder(transcript_id, srt_file_name):
+        if "placeholder" in calls["failing"]:
+            raise RuntimeError("Drive is unavailable")
+        calls["placeholders"].append(srt_file_name)
+        return f"srt-{transcript_id}"
+
+    def enqueue_translation_task(params):
+        if "enqueue" in calls["failing"]:
+            raise RuntimeError("Job queue is unavailable")
+        calls["jobs"].append(params)
+        return params
+
+    monkeypatch.setattr(helpers, "create_srt_placeholder", create_srt_placeholder)
+    monkeypatch.setattr(helpers, "enqueue_translation_task", enqueue_translation_task)
+
+    def deliver(event: TranscriptWebhookEvent):
+        async def run():
+            assemblyai = FakeAssemblyAI(FakeProfile(latency=0, jitter=0))
+            monkeypatch.setattr(transcribe, "ASSEMBLY_AI_BASE_URL", await assemblyai.start())
+            try:
+                return await helpers.handle_transcript_webhook(event)
+            finally:
+                await assemblyai.stop()
+
+        return run_with_http_client(run())
+
+    calls["deliver"] = deliver
+    return calls
+
+
+def _options() -> TranscriptTranslationOptions:
+    return TranscriptTranslationOptions(srt_file_name="recording.srt")
+
+
+def test_completed_transcript_enqueues_its_translation_once(webhook):
+    save_pending_translation("synthetic-1m-1", _options())
+    event = TranscriptWebhookEvent(transcript_id="synthetic-1m-1", status="completed")
+
+    job = webhook["deliver"](event)
+
+    assert job.srt_file_id == "srt-synthetic-1m-1"
+    assert job.srt_file_name == "recording.srt"
+    assert get_pending_translation("synthetic-1m-1") is None
+    assert webhook["deliver"](event) is None
+    assert len(webhook["jobs"]) == 1
+
+
+@pytest.mark.parametrize(
+    "failing, transcript_id",
+    [("placeholder", "synthetic-1m-3"), ("enqueue", "synthetic-1m-4")],
+)
+def test_failed_delivery_keeps_the_pending_translation(webhook, failing, transcript_id):
+    save_pending_translation(transcript_id, _options())
+    event = TranscriptWebhookEvent(transcript_id=transcript_id, status="completed")
+
+    webhook["failing"] = {failing}
+    with pytest.raises(RuntimeError):
+        webhook["deliver"](event)
+    assert get_pending_translation(transcript_id) == _options()
+
+    # AssemblyAI delivers the webhook again after an error response
+    webhook["failing"] = set()
+    job = webhook["deliver"](event)
+    assert job.transcript_id == transcript_id
+    assert get_pending_translation(transcript_id) is None
+
+
+def test_failed_transcript_drops_its_pending_translation(webhook):
+    save_pending_translation("synthetic-1m-2", _options())
+
+    event = TranscriptWebhookEvent(transcript_id="synthetic-1m-2", status="error")
+    assert webhook["deliver"](event) is None
+    assert get_pending_translation("synthetic-1m-2") is None
+    assert webhook["jobs"] == []